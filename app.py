@@ -18,6 +18,7 @@ from modules import (
     renewal_vs_nonrenewal,
     summer,
 )
+from modules.frame_memory import enable_copy_on_write
 from modules.ui_components import inject_global_styles
 
 
@@ -29,6 +30,7 @@ st.set_page_config(
 )
 
 inject_global_styles()
+enable_copy_on_write()
 
 
 @st.cache_data(show_spinner=False)
@@ -0,0 +1,38 @@
+"""성능 점검 스크립트 공통 도우미."""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def quiet_streamlit() -> None:
+    """Streamlit 실행 환경 밖에서 가져올 때 나오는 캐시 경고를 숨깁니다."""
+    import streamlit  # noqa: F401
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def measure(func: Callable[[], object], rounds: int = 5) -> tuple[float, float]:
+    """첫 실행 시간과 이후 반복 실행의 중앙값을 초 단위로 반환합니다."""
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    timings = []
+    for _ in range(max(rounds - 1, 1)):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return first, statistics.median(timings)
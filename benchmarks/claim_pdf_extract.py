@@ -0,0 +1,187 @@
+"""보험금 청구 가이드의 보장분석 PDF 읽기를 모든 쪽을 세 번씩 읽던 이전 방식과 필요한 만큼만 읽는 방식으로 비교합니다.
+
+사용 예:
+    python benchmarks/claim_pdf_extract.py
+    python benchmarks/claim_pdf_extract.py --pages 60
+
+프로보장분석과 같은 열 배치의 합성 보장분석 PDF(기본 30쪽)를 만듭니다. 대부분의 쪽은 선이 있는
+담보 표이고, 일부 쪽은 선 없이 글자만 놓여 단어 위치로 읽어야 합니다. 이전 방식(쪽마다 레이아웃 글자·
+단어·표를 모두 뽑은 뒤 해석)과 `extract_pdf`(표를 먼저 읽고 담보를 못 찾은 쪽만 단어로 다시 읽으며,
+레이아웃 글자는 앞 쪽에서만 뽑고 다 읽은 쪽의 캐시는 비움)의 시간과 최대 메모리를 잽니다.
+쪽마다 PDF 내용을 해석하는 시간은 두 방식이 같으므로 시간 차이보다 메모리 차이가 큽니다.
+고객명·작성일자·담보 목록이 다르면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tracemalloc
+from dataclasses import asdict
+from io import BytesIO
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pdfplumber  # noqa: E402
+from reportlab.lib import colors  # noqa: E402
+from reportlab.lib.pagesizes import A4  # noqa: E402
+from reportlab.lib.styles import ParagraphStyle  # noqa: E402
+from reportlab.pdfbase import pdfmetrics  # noqa: E402
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont  # noqa: E402
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle  # noqa: E402
+
+from modules.coverage_pdf import (  # noqa: E402
+    CoverageRow,
+    _table_rows,
+    _word_rows,
+    extract_pdf,
+)
+
+INSURERS = ["DB손해보험", "KB손보", "현대해상", "메리츠화재", "삼성생명", "한화생명", "신한라이프"]
+COVERAGES = [
+    ("질병", "질병수술비"), ("질병", "질병입원일당"), ("질병", "암진단비(유사암제외)"),
+    ("질병", "뇌혈관질환진단비"), ("상해", "상해수술비"), ("상해", "골절진단비(치아파절제외)"),
+    ("상해", "교통상해입원일당"), ("기타", "실손의료비(급여)"),
+]
+# 프로보장분석 담보 표의 열 경계(A4 가로 595pt 기준)와 같게 둡니다.
+COLUMN_WIDTHS = [75, 55, 153, 125, 45, 55, 50]
+HEADER = ["구분", "회사", "상품명", "담보명", "가입금액", "계약일", "만기일"]
+FONT_NAME = "HYGothic-Medium"
+
+
+def coverage_rows(rng: np.random.Generator, count: int) -> list[list[str]]:
+    rows = []
+    for _ in range(count):
+        category, coverage = COVERAGES[rng.integers(len(COVERAGES))]
+        year = int(rng.integers(2005, 2025))
+        rows.append([
+            category,
+            INSURERS[rng.integers(len(INSURERS))],
+            f"무배당 건강보험 {int(rng.integers(1, 400))}형",
+            coverage,
+            f"{int(rng.integers(1, 50)) * 100:,}",
+            f"{year}-{int(rng.integers(1, 13)):02d}-{int(rng.integers(1, 29)):02d}",
+            "종신" if rng.random() < 0.2 else f"{year + 30}-01-01",
+        ])
+    return rows
+
+
+def build_pdf(pages: int, rows_per_page: int = 28, seed: int = 48) -> bytes:
+    """네 쪽마다 한 쪽은 표 선이 없어 단어 위치로만 읽히는 쪽입니다."""
+    if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(FONT_NAME))
+    font_name = FONT_NAME
+    rng = np.random.default_rng(seed)
+    title = ParagraphStyle("title", fontName=font_name, fontSize=14, leading=18)
+    body = ParagraphStyle("body", fontName=font_name, fontSize=9, leading=12)
+
+    story = [Paragraph("홍길동님을 위한 보장분석 리포트", title), Paragraph("작성일자 2026.08.14", body), Spacer(1, 8)]
+    for page_no in range(1, pages + 1):
+        grid = page_no % 4 != 0
+        table = Table([HEADER, *coverage_rows(rng, rows_per_page)], colWidths=COLUMN_WIDTHS, rowHeights=22)
+        style = [
+            ("FONTNAME", (0, 0), (-1, -1), font_name),
+            ("FONTSIZE", (0, 0), (-1, -1), 6.5),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ]
+        if grid:
+            style.append(("GRID", (0, 0), (-1, -1), 0.4, colors.grey))
+        table.setStyle(TableStyle(style))
+        story.append(table)
+        if page_no < pages:
+            story.append(PageBreak())
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, leftMargin=20, rightMargin=17, topMargin=30, bottomMargin=20).build(story)
+    return buffer.getvalue()
+
+
+def legacy_extract(pdf_bytes: bytes) -> dict:
+    """이전 `extract_pdf`: 모든 쪽에서 레이아웃 글자·단어·표를 모두 뽑아 둔 뒤 해석합니다."""
+    pages_text: list[str] = []
+    pages_words: list[tuple[float, list[dict]]] = []
+    pages_tables: list[list] = []
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages:
+            pages_text.append(page.extract_text(x_tolerance=2, y_tolerance=3, layout=True) or "")
+            pages_words.append((float(page.width), page.extract_words(x_tolerance=1, y_tolerance=2) or []))
+            pages_tables.append(page.extract_tables() or [])
+
+    first_text = "\n".join(pages_text[:2])
+    customer_match = re.search(r"([가-힣]{2,5})님을\s*위한", first_text)
+    report_match = re.search(r"작성일자\s*(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})", first_text)
+
+    rows: list[CoverageRow] = []
+    for page_no, ((page_width, words), page_tables) in enumerate(zip(pages_words, pages_tables), start=1):
+        table_rows = _table_rows(page_tables, page_no)
+        rows.extend(table_rows or _word_rows(page_width, words, page_no))
+
+    deduped, seen = [], set()
+    for row in rows:
+        key = (row.company, row.product, row.coverage, row.amount, row.contract_date, row.expiry_date)
+        if key not in seen:
+            seen.add(key)
+            deduped.append(row)
+
+    return {
+        "customer": customer_match.group(1) if customer_match else "확인 필요",
+        "report_date": (
+            f"{report_match.group(1)}.{int(report_match.group(2)):02d}.{int(report_match.group(3)):02d}"
+            if report_match else "확인 필요"
+        ),
+        "coverages": [asdict(row) for row in deduped],
+        "page_count": len(pages_text),
+    }
+
+
+def peak_mb(func) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024**2
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=30, help="합성 보장분석 PDF 쪽 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    pdf_bytes = build_pdf(args.pages)
+    print(f"합성 보장분석 PDF {args.pages}쪽 · {len(pdf_bytes) / 1024:,.0f}KB")
+
+    _, legacy_seconds = measure(lambda: legacy_extract(pdf_bytes), rounds=args.rounds)
+    _, planned_seconds = measure(lambda: extract_pdf(pdf_bytes), rounds=args.rounds)
+
+    legacy_mb = peak_mb(lambda: legacy_extract(pdf_bytes))
+    planned_mb = peak_mb(lambda: extract_pdf(pdf_bytes))
+
+    expected = legacy_extract(pdf_bytes)
+    actual = extract_pdf(pdf_bytes)
+    sources = {"표": 0, "단어": 0}
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        for page_no, page in enumerate(pdf.pages, start=1):
+            sources["표" if _table_rows(page.extract_tables() or [], page_no) else "단어"] += 1
+
+    print(f"- 모든 쪽 세 번 읽기(이전): {legacy_seconds:,.2f}s · 쪽당 {legacy_seconds / args.pages * 1000:,.0f}ms "
+          f"· 최대 {legacy_mb:,.1f}MB")
+    print(f"- 필요한 만큼 읽기:         {planned_seconds:,.2f}s · 쪽당 {planned_seconds / args.pages * 1000:,.0f}ms "
+          f"· 최대 {planned_mb:,.1f}MB ({legacy_seconds / planned_seconds:,.1f}배 빠름)")
+    print(f"- 표로 읽은 쪽 {sources['표']}개 · 단어로 읽은 쪽 {sources['단어']}개 · 담보 {len(actual['coverages']):,}건 "
+          f"· 고객 {actual['customer']} · 작성일자 {actual['report_date']}")
+
+    if expected != actual:
+        print("추출 결과가 다릅니다.")
+        return 1
+    print("추출 결과가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
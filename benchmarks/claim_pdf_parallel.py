@@ -0,0 +1,64 @@
+"""보장분석 PDF를 한 프로세스에서 차례로 읽을 때와 프로세스 풀에 쪽 범위를 나눠 읽을 때를 비교합니다.
+
+사용 예:
+    python benchmarks/claim_pdf_parallel.py
+    python benchmarks/claim_pdf_parallel.py --pages 80 --workers 4
+
+`claim_pdf_extract.py`와 같은 합성 보장분석 PDF(기본 40쪽, 가족 여러 명을 합친 분량)를 `extract_pdf`로
+`workers=1`(차례로)과 `workers=N`(쪽 범위를 작업 프로세스에 나눔)으로 읽어 시간을 잽니다. 풀 시간에는
+작업 프로세스를 띄우는 시간이 들어 있습니다. 진행 표시로 받은 쪽 수가 늘어나기만 하는지, 두 결과의
+담보 순서까지 같은지 확인하고 다르면 종료 코드 1로 끝납니다. CPU가 하나뿐인 환경에서는 빨라지지 않습니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+from claim_pdf_extract import build_pdf  # noqa: E402
+
+from modules.coverage_pdf import PDF_WORKERS, extract_pdf  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40, help="합성 보장분석 PDF 쪽 수")
+    parser.add_argument("--workers", type=int, default=max(PDF_WORKERS, 2), help="작업 프로세스 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    pdf_bytes = build_pdf(args.pages)
+    print(f"합성 보장분석 PDF {args.pages}쪽 · 작업 프로세스 {args.workers}개 · CPU {os.cpu_count()}개")
+
+    _, serial_seconds = measure(lambda: extract_pdf(pdf_bytes, workers=1), rounds=args.rounds)
+    first_parallel, parallel_seconds = measure(
+        lambda: extract_pdf(pdf_bytes, workers=args.workers), rounds=args.rounds
+    )
+
+    print(f"- 차례로 읽기:     {serial_seconds:,.2f}s")
+    print(f"- 나눠 읽기:       {parallel_seconds:,.2f}s ({serial_seconds / parallel_seconds:,.1f}배) "
+          f"· 첫 실행 {first_parallel:,.2f}s (forkserver 시작 포함)")
+
+    reported: list[tuple[int, int]] = []
+    expected = extract_pdf(pdf_bytes, workers=1)
+    actual = extract_pdf(pdf_bytes, progress=lambda done, total: reported.append((done, total)), workers=args.workers)
+    done = [count for count, _ in reported]
+    print(f"- 진행 표시 {len(reported)}번: {', '.join(map(str, done))}쪽")
+
+    if done != sorted(done) or not reported or reported[-1] != (args.pages, args.pages):
+        print("진행 표시가 쪽 수 순서대로 끝까지 가지 않았습니다.")
+        return 1
+    if expected != actual:
+        print("추출 결과가 다릅니다.")
+        return 1
+    print("추출 결과가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""수수료 계산기 자동 연결의 정확도와 속도를 정답셋으로 점검합니다.
+
+사용 예:
+    python benchmarks/commission_linker.py
+    python benchmarks/commission_linker.py --update-baseline
+
+기준값보다 정확도가 떨어지거나 계약당 처리 시간이 허용 범위를 넘으면
+종료 코드 1로 끝나므로 `_name_similarity`, `_selection_tags`,
+`_auto_candidate` 수정 전후에 바로 비교할 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from _common import DATA_DIR, measure, quiet_streamlit
+
+quiet_streamlit()
+
+from modules import commission_calculator  # noqa: E402
+
+GOLDEN_PATH = DATA_DIR / "commission_linker_golden.json"
+BASELINE_PATH = DATA_DIR / "commission_linker_baseline.json"
+ACCURACY_METRICS = ("precision", "recall", "candidate_recall")
+
+
+def load_golden() -> tuple[list[dict], list[dict], dict[str, dict]]:
+    data = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+    expectations: dict[str, dict] = {}
+    holdings: list[dict] = []
+    for item in data["holdings"]:
+        holding = dict(item)
+        expectations[holding["row_key"]] = {
+            "expected_key": holding.pop("expected_key"),
+            "expect_auto": holding.pop("expect_auto"),
+        }
+        holdings.append(holding)
+    return holdings, data["products"], expectations
+
+
+def score(decisions: dict[str, dict], expectations: dict[str, dict]) -> dict:
+    predicted_auto = 0
+    expected_auto = 0
+    correct_auto = 0
+    linkable = 0
+    linkable_found = 0
+    review_holdings = 0
+    review_keys = 0
+    misses: list[str] = []
+
+    for row_key, expected in expectations.items():
+        decision = decisions.get(row_key, {})
+        auto_key = decision.get("auto_key") or None
+        expected_key = expected["expected_key"]
+        if auto_key:
+            predicted_auto += 1
+            if auto_key == expected_key:
+                correct_auto += 1
+            else:
+                misses.append(f"{row_key}: 잘못된 자동 연결 {auto_key} (정답 {expected_key})")
+        if expected["expect_auto"]:
+            expected_auto += 1
+            if auto_key is None:
+                misses.append(f"{row_key}: 자동 연결 누락 (정답 {expected_key})")
+        if expected_key:
+            linkable += 1
+            offered = set(decision.get("candidate_keys", [])) | set(decision.get("review_keys", []))
+            if expected_key in offered or auto_key == expected_key:
+                linkable_found += 1
+            else:
+                misses.append(f"{row_key}: 추천 후보에 정답 없음 ({expected_key})")
+        if auto_key is None and decision.get("candidate_keys"):
+            review_holdings += 1
+            review_keys += len(decision.get("review_keys", []))
+
+    return {
+        "precision": correct_auto / predicted_auto if predicted_auto else 1.0,
+        "recall": correct_auto / expected_auto if expected_auto else 1.0,
+        "candidate_recall": linkable_found / linkable if linkable else 1.0,
+        "auto_links": predicted_auto,
+        "review_holdings": review_holdings,
+        "review_keys_per_holding": review_keys / review_holdings if review_holdings else 0.0,
+        "misses": misses,
+    }
+
+
+def run_benchmark(rounds: int) -> dict:
+    holdings, product_rows, expectations = load_golden()
+    # 화면에서는 st.cache_data가 결과를 재사용하므로 원래 함수를 직접 호출해 계산 비용만 잽니다.
+    analyze = commission_calculator._analyze_product_links.__wrapped__
+    decisions = analyze(holdings, product_rows)
+    first, median = measure(lambda: analyze(holdings, product_rows), rounds=rounds)
+    metrics = score(decisions, expectations)
+    metrics["holdings"] = len(holdings)
+    metrics["ms_per_holding_first"] = first * 1000 / len(holdings)
+    metrics["ms_per_holding"] = median * 1000 / len(holdings)
+    return metrics
+
+
+def regressions(metrics: dict, baseline: dict, accuracy_tolerance: float, latency_tolerance: float) -> list[str]:
+    problems: list[str] = []
+    for name in ACCURACY_METRICS:
+        if name in baseline and metrics[name] < baseline[name] - accuracy_tolerance:
+            problems.append(f"{name} {metrics[name]:.3f} < 기준 {baseline[name]:.3f}")
+    if "ms_per_holding" in baseline:
+        limit = baseline["ms_per_holding"] * (1 + latency_tolerance)
+        if metrics["ms_per_holding"] > limit:
+            problems.append(
+                f"계약당 {metrics['ms_per_holding']:.2f}ms > 허용 {limit:.2f}ms "
+                f"(기준 {baseline['ms_per_holding']:.2f}ms)"
+            )
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=15, help="반복 측정 횟수")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.0, help="허용할 정확도 하락폭")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5, help="허용할 처리 시간 증가율 (0.5 = 50%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="현재 결과를 새 기준값으로 저장")
+    args = parser.parse_args()
+
+    metrics = run_benchmark(args.rounds)
+    print(f"정답셋 계약 {metrics['holdings']}건")
+    print(f"자동 연결 정밀도 {metrics['precision']:.3f} · 재현율 {metrics['recall']:.3f} · 후보 포함률 {metrics['candidate_recall']:.3f}")
+    print(f"자동 연결 {metrics['auto_links']}건 · 확인 필요 {metrics['review_holdings']}건 (평균 추천 {metrics['review_keys_per_holding']:.1f}개)")
+    print(f"계약당 처리 시간 {metrics['ms_per_holding']:.2f}ms (첫 실행 {metrics['ms_per_holding_first']:.2f}ms)")
+    for miss in metrics["misses"]:
+        print(f"  - {miss}")
+
+    if args.update_baseline:
+        baseline = {name: metrics[name] for name in ACCURACY_METRICS}
+        baseline["ms_per_holding"] = round(metrics["ms_per_holding"], 3)
+        BASELINE_PATH.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"기준값을 저장했습니다: {BASELINE_PATH.name}")
+        return 0
+
+    if not BASELINE_PATH.is_file():
+        print("기준값 파일이 없습니다. --update-baseline으로 먼저 저장해 주세요.")
+        return 0
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    problems = regressions(metrics, baseline, args.accuracy_tolerance, args.latency_tolerance)
+    for problem in problems:
+        print(f"회귀: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""썸머·컨벤션 보유계약 업로드를 이전 전체 열 읽기와 공용 불러오기로 읽어 시간·메모리를 비교합니다.
+
+사용 예:
+    python benchmarks/contract_loader.py
+    python benchmarks/contract_loader.py --rows 50000 --extra-columns 60
+
+계산에 쓰는 10개 열 외에 쓰지 않는 열이 많은 합성 내보내기 파일로, 이전 방식(모든 열을 읽은 뒤
+열 이름 정리)과 `modules/contract_loader.py`(필요한 열만 읽고 범주형 변환, 내용 해시로 캐시)의
+읽기 시간과 DataFrame 메모리를 잽니다. 공용 불러오기는 첫 읽기와 같은 파일을 다시 읽을 때(캐시)를
+따로 보여 줍니다. 필요한 열의 값이 다르면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from io import BytesIO
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules.contract_loader import (  # noqa: E402
+    CONTRACT_COLUMNS,
+    load_contracts,
+    normalize_columns,
+    standardize_columns,
+)
+from modules.xlsx_reader import read_frame  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재"]
+
+
+def build_upload(rows: int, extra_columns: int, seed: int = 43) -> bytes:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "증권번호": [f"P{i:07d}" for i in range(rows)],
+        "수금자명": rng.choice([f"설계사{i:03d}" for i in range(120)], size=rows),
+        "계약일": pd.Timestamp("2025-06-20") + pd.to_timedelta(rng.integers(0, 80, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice(["건강보험", "치아보험", "암보험", "연금보험"], size=rows),
+        "납입기간": rng.choice([5, 10, 20], size=rows),
+        "초회보험료": rng.integers(1, 300, rows) * 1000.0,
+        "쉐어율": rng.choice([100.0, 50.0], size=rows),
+        "납입방법": rng.choice(["월납", "월납", "일시납"], size=rows),
+        "상품군2": rng.choice(["보장성", "보장성", "저축성"], size=rows),
+        "계약상태": rng.choice(["정상", "정상", "철회"], size=rows),
+    })
+    for i in range(extra_columns):
+        df[f"기타항목{i:02d}"] = rng.choice([f"코드{j}" for j in range(30)], size=rows)
+
+    output = BytesIO()
+    df.to_excel(output, index=False)
+    return output.getvalue()
+
+
+def legacy_load(data: bytes) -> pd.DataFrame:
+    return standardize_columns(normalize_columns(read_frame(data)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="합성 계약 행 수")
+    parser.add_argument("--extra-columns", type=int, default=40, help="계산에 쓰지 않는 열 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    data = build_upload(args.rows, args.extra_columns)
+    print(f"합성 파일 {args.rows:,}행 · 열 {len(CONTRACT_COLUMNS) + 1 + args.extra_columns}개 · {len(data) / 1024:,.0f}KB")
+
+    legacy_seconds, _ = measure(lambda: legacy_load(data), rounds=args.rounds)
+    loader_first, loader_cached = measure(lambda: load_contracts(data), rounds=args.rounds)
+
+    legacy = legacy_load(data)
+    loaded = load_contracts(data)
+    legacy_mb = legacy.memory_usage(deep=True).sum() / 1024**2
+    loaded_mb = loaded.memory_usage(deep=True).sum() / 1024**2
+
+    print(f"- 전체 열 읽기:       {legacy_seconds:,.2f}s · {legacy_mb:,.1f}MB")
+    print(f"- 공용 불러오기(첫 읽기): {loader_first:,.2f}s · {loaded_mb:,.1f}MB "
+          f"({legacy_seconds / loader_first:,.1f}배)")
+    print(f"- 공용 불러오기(캐시):  {loader_cached:,.3f}s")
+
+    expected = legacy[list(CONTRACT_COLUMNS)].astype(object)
+    actual = loaded[list(CONTRACT_COLUMNS)].astype(object)
+    if not expected.equals(actual):
+        print("필요한 열의 값이 다릅니다.")
+        return 1
+    print("필요한 열의 값이 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
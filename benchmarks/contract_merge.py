@@ -0,0 +1,146 @@
+"""매니저 업적 여러 파일 합치기를 파일마다 이어 붙이는 방식과 공용 합치기 도우미로 비교합니다.
+
+사용 예:
+    python benchmarks/contract_merge.py
+    python benchmarks/contract_merge.py --files 24 --rows 20000
+
+월별 내보내기처럼 앞뒤 달 계약이 겹치고 공동계약(같은 증권번호·계약일, 수금자마다 한 행)이 섞인 합성 표를
+만들고, 이전 방식(파일을 하나씩 `pd.concat`으로 이어 붙이며 새 파일에 있는 증권번호·계약일·수금자명 글자
+키의 앞 행을 지움)과 `modules/contract_merge.py`(범주를 맞춘 뒤 한 번에 이어 붙이고 64비트 해시 색인으로
+중복 확인)의 시간과 합친 표 메모리를 잽니다.
+
+이어서 공동계약 예시(김 P1 50%, 이 P1 50%, 박 P2)를 한 파일로, 팀별 두 파일로, 같은 파일 두 번으로 합쳐
+공동계약 수금자 행이 빠지지 않는지 확인합니다. 남은 계약이 다르거나 확인이 틀리면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules.contract_loader import CATEGORY_COLUMNS  # noqa: E402
+from modules.contract_merge import merge_uploads  # noqa: E402
+from modules.frame_memory import compact_frame  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재"]
+
+
+def build_files(files: int, rows: int, seed: int = 47) -> list[pd.DataFrame]:
+    """파일마다 절반은 앞 파일과 같은 계약(같은 증권번호·계약일)이고, 열 건 중 한 건은 두 수금자의 공동계약입니다."""
+    rng = np.random.default_rng(seed)
+    frames = []
+
+    for k in range(files):
+        start = k * rows // 2
+        base = np.arange(start, start + rows)
+        # 공동계약은 같은 증권번호·계약일 행을 하나 더 두고 수금자만 다르게 합니다.
+        policies = np.sort(np.concatenate([base, base[base % 10 == 0]]))
+        joint = np.r_[False, np.diff(policies) == 0]
+        size = len(policies)
+        frames.append(compact_frame(pd.DataFrame({
+            "수금자명": [f"설계사{i:03d}" for i in (policies * 7 + joint) % 60],
+            "계약일": pd.Timestamp("2025-01-01") + pd.to_timedelta(policies % 365, unit="D"),
+            "보험사": rng.choice(INSURERS, size=size),
+            "상품명": rng.choice(["건강보험", "암보험", "연금보험"], size=size),
+            "납입기간": rng.choice([5, 10, 20], size=size),
+            "초회보험료": rng.integers(1, 300, size) * 1000.0,
+            "쉐어율": np.where(np.isin(policies, policies[joint]), 50.0, 100.0),
+            "납입방법": rng.choice(["월납", "월납", "일시납"], size=size),
+            "상품군2": rng.choice(["보장성", "보장성", "저축성"], size=size),
+            "계약상태": rng.choice(["정상", "정상", "철회"], size=size),
+            "증권번호": [f"P{p:08d}" for p in policies],
+        }), categories=CATEGORY_COLUMNS))
+
+    return frames
+
+
+def legacy_keys(frame: pd.DataFrame) -> pd.Series:
+    return (
+        frame["증권번호"].astype(str).str.strip()
+        + "|" + pd.to_datetime(frame["계약일"]).dt.strftime("%Y-%m-%d")
+        + "|" + frame["수금자명"].astype(str).str.strip()
+    )
+
+
+def legacy_merge(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    merged = pd.DataFrame()
+
+    for frame in frames:
+        frame = frame.assign(_원본행번호=frame.index + 2)
+        if not merged.empty:
+            merged = merged[~legacy_keys(merged).isin(legacy_keys(frame))]
+        merged = pd.concat([merged, frame], ignore_index=True)
+
+    return merged
+
+
+def joint_contract_checks() -> list[str]:
+    """공동계약 수금자 행이 한 파일 안에서도, 팀별로 나뉜 파일 사이에서도 빠지지 않는지 확인합니다."""
+    joint = pd.DataFrame({
+        "수금자명": ["김", "이", "박"],
+        "증권번호": ["P1", "P1", "P2"],
+        "계약일": pd.to_datetime(["2025-07-01", "2025-07-01", "2025-07-03"]),
+        "쉐어율": [50.0, 50.0, 100.0],
+    })
+    team_a, team_b = joint.iloc[[0, 2]].reset_index(drop=True), joint.iloc[[1]].reset_index(drop=True)
+    cases = [
+        ("한 파일", [joint], 3, 0),
+        ("팀별 두 파일", [team_a, team_b], 3, 0),
+        ("같은 파일 두 번", [joint, joint], 3, 3),
+    ]
+
+    failures = []
+    for label, frames, kept, dropped in cases:
+        merged, duplicates = merge_uploads(frames, [f"{k + 1}.xlsx" for k in range(len(frames))])
+        print(f"- 공동계약 {label}: 남은 행 {len(merged)} · 뺀 중복 {len(duplicates)} "
+              f"({', '.join(merged['수금자명'].astype(str))})")
+        if (len(merged), len(duplicates)) != (kept, dropped):
+            failures.append(f"공동계약 {label}: 남은 행 {kept}·뺀 중복 {dropped}이어야 합니다.")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=12, help="업로드 파일 수")
+    parser.add_argument("--rows", type=int, default=20_000, help="파일 하나의 계약 행 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    frames = build_files(args.files, args.rows)
+    names = [f"{k + 1:02d}월.xlsx" for k in range(args.files)]
+    print(f"합성 파일 {args.files}개 · 파일당 {len(frames[0]):,}행 (앞 파일과 절반 겹침, 공동계약 포함)")
+
+    _, legacy_seconds = measure(lambda: legacy_merge(frames), rounds=args.rounds)
+    _, merge_seconds = measure(lambda: merge_uploads(frames, names), rounds=args.rounds)
+
+    legacy = legacy_merge(frames)
+    merged, duplicates = merge_uploads(frames, names)
+    legacy_mb = legacy.memory_usage(deep=True).sum() / 1024**2
+    merged_mb = merged.memory_usage(deep=True).sum() / 1024**2
+
+    print(f"- 하나씩 이어 붙이기:  {legacy_seconds:,.2f}s · {legacy_mb:,.1f}MB")
+    print(f"- 공용 합치기:        {merge_seconds:,.2f}s · {merged_mb:,.1f}MB ({legacy_seconds / merge_seconds:,.1f}배)")
+    print(f"- 남은 계약 {len(merged):,}건 · 뺀 중복 {len(duplicates):,}건")
+
+    failures = joint_contract_checks()
+    columns = list(frames[0].columns) + ["_원본행번호"]
+    if not legacy[columns].astype(object).equals(merged[columns].astype(object)):
+        failures.append("남은 계약이 다릅니다.")
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        return 1
+    print("남은 계약이 같고 공동계약 수금자 행이 모두 남습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""보장분석 PDF를 매번 다시 읽을 때와 디스크 캐시(`modules/coverage_cache.py`)에서 꺼낼 때를 비교합니다.
+
+사용 예:
+    python benchmarks/coverage_cache.py
+    python benchmarks/coverage_cache.py --pages 40 --files 12
+
+`claim_pdf_extract.py`와 같은 합성 보장분석 PDF를 임시 폴더 캐시로 `cached_extract`에 넘겨 첫 추출(저장 포함)과
+다시 열 때(다른 상담자, 세션 초기화 뒤)의 시간을 잽니다. 이어서 작은 크기 제한으로 여러 PDF를 저장해
+폴더 크기가 제한 안에 머무는지, 가장 최근에 쓴 결과가 남는지, 추출 규칙 버전이 바뀌면 예전 결과를
+쓰지 않는지 확인합니다. 캐시 결과가 `extract_pdf`와 다르거나 확인이 하나라도 틀리면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+from claim_pdf_extract import build_pdf  # noqa: E402
+
+from modules import coverage_cache  # noqa: E402
+from modules.coverage_cache import cached_extract, load_cached, pdf_digest, save_cached  # noqa: E402
+from modules.coverage_pdf import extract_pdf  # noqa: E402
+
+
+def folder_bytes(store: Path) -> int:
+    return sum(path.stat().st_size for path in store.rglob("*.json.gz"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=30, help="합성 보장분석 PDF 쪽 수")
+    parser.add_argument("--files", type=int, default=8, help="크기 제한 확인에 쓸 PDF 수")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    pdf_bytes = build_pdf(args.pages)
+    print(f"합성 보장분석 PDF {args.pages}쪽")
+    failures = []
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = Path(folder)
+        first_seconds, _ = measure(lambda: cached_extract(pdf_bytes, store=store), rounds=1)
+        _, hit_seconds = measure(lambda: cached_extract(pdf_bytes, store=store), rounds=args.rounds)
+        entry_kb = folder_bytes(store) / 1024
+
+        print(f"- 첫 추출(저장 포함): {first_seconds:,.2f}s")
+        print(f"- 캐시에서 꺼내기:    {hit_seconds * 1000:,.1f}ms ({first_seconds / hit_seconds:,.0f}배) · 결과 파일 {entry_kb:,.1f}KB")
+
+        if cached_extract(pdf_bytes, store=store) != extract_pdf(pdf_bytes, workers=1):
+            failures.append("캐시 결과가 extract_pdf 결과와 다릅니다.")
+
+        # 결과 세 개 남짓이 들어갈 크기로 제한하고 서로 다른 PDF 결과를 차례로 저장합니다.
+        result = load_cached(pdf_digest(pdf_bytes), store)
+        limit = int(entry_kb * 1024 * 3.5)
+        digests = [f"{index:064x}" for index in range(args.files)]
+        for digest in digests:
+            save_cached(digest, result, store, max_bytes=limit)
+        kept = [digest for digest in digests if (store / coverage_cache.CACHE_VERSION / f"{digest}.json.gz").exists()]
+        print(f"- 크기 제한 {limit / 1024:,.0f}KB: {args.files}개 저장 뒤 {len(kept)}개 · {folder_bytes(store) / 1024:,.0f}KB 남음")
+
+        if folder_bytes(store) > limit:
+            failures.append("캐시 폴더가 크기 제한을 넘었습니다.")
+        if digests[-1] not in kept:
+            failures.append("가장 최근에 저장한 결과가 지워졌습니다.")
+
+        with mock.patch.object(coverage_cache, "CACHE_VERSION", "next-version"):
+            if load_cached(digests[-1], store) is not None:
+                failures.append("추출 규칙 버전이 바뀌었는데 예전 결과를 썼습니다.")
+            save_cached(digests[-1], result, store)
+            if any(path.parent.name != "next-version" for path in store.rglob("*.json.gz")):
+                failures.append("예전 버전 결과가 지워지지 않았습니다.")
+        print("- 추출 규칙 버전이 바뀌면 예전 결과를 쓰지 않고 지웁니다.")
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        return 1
+    print("캐시 결과와 크기 제한이 맞습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""썸머·컨벤션·매니저 업적 상세 표를 글자로 바꿔 보내던 이전 화면과 숫자 그대로 보내는 화면을 비교합니다.
+
+사용 예:
+    python benchmarks/display_format.py
+    python benchmarks/display_format.py --rows 60000
+
+합성 보유계약으로 각 페이지의 계산 결과를 만든 뒤, 이전 화면 표(`to_styled`: 금액·비율·기간을
+행마다 글자로 변환)와 지금 화면 표(`display_table`: 열 이름·순서만 바꾸고 서식은
+`st.column_config`에 맡김)를 만드는 시간과 브라우저로 보내는 Arrow 데이터 크기를 출력합니다.
+`to_styled`는 이제 엑셀 다운로드를 만들 때만 씁니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes  # noqa: E402
+
+from modules import convention, manager_results, summer  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재", "라이나생명"]
+
+
+def build_upload(rows: int, seed: int = 45) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "수금자명": rng.choice([f"설계사{i:03d}" for i in range(150)], size=rows),
+        "계약일": pd.Timestamp("2025-06-20") + pd.to_timedelta(rng.integers(0, 80, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice([f"무배당 건강보험 {i}형" for i in range(40)], size=rows),
+        "납입기간": rng.choice([5, 10, 20], size=rows),
+        "초회보험료": rng.integers(1, 300, rows) * 1000,
+        "쉐어율": rng.choice([100.0, 50.0, np.nan], size=rows),
+        "납입방법": rng.choice(["월납", "월납", "일시납"], size=rows),
+        "상품군2": rng.choice(["보장성", "보장성", "저축성"], size=rows),
+        "계약상태": rng.choice(["정상", "정상", "철회"], size=rows),
+    })
+
+
+def computed(module, upload: pd.DataFrame, compute) -> pd.DataFrame:
+    valid, _, _ = module.exclude_contracts(upload)
+    return compute(valid)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30_000, help="합성 계약 행 수")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    upload = build_upload(args.rows)
+    standard = convention.standardize_columns(upload)
+    pages = {
+        "썸머": (summer, computed(summer, standard, summer.compute_summer)),
+        "컨벤션": (convention, computed(convention, standard, convention.compute_convention)),
+        "매니저 업적": (
+            manager_results,
+            computed(
+                manager_results,
+                upload,
+                getattr(manager_results.compute_manager_score, "__wrapped__", manager_results.compute_manager_score),
+            ),
+        ),
+    }
+
+    print(f"합성 계약 {args.rows:,}행")
+    for page, (module, df) in pages.items():
+        _, styled_seconds = measure(lambda: module.to_styled(df), rounds=args.rounds)
+        _, display_seconds = measure(lambda: module.display_table(df), rounds=args.rounds)
+        styled_kb = len(convert_pandas_df_to_arrow_bytes(module.to_styled(df))) / 1024
+        display_kb = len(convert_pandas_df_to_arrow_bytes(module.display_table(df))) / 1024
+
+        print(f"\n[{page}] 상세 표 {len(df):,}행")
+        print(f"- 글자 변환(이전 화면): {styled_seconds * 1000:,.1f}ms · 전송 {styled_kb:,.0f}KB")
+        print(f"- 숫자 그대로(지금 화면): {display_seconds * 1000:,.1f}ms · 전송 {display_kb:,.0f}KB "
+              f"({styled_seconds / display_seconds:,.1f}배)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""엑셀 표 쓰기를 이전 셀 단위 방식과 공용 쓰기 도우미로 비교해 초당 기록 셀 수를 출력합니다.
+
+사용 예:
+    python benchmarks/excel_writer.py
+    python benchmarks/excel_writer.py --rows 50000 --sheets 20
+
+수금자 시트 여러 장에 계약 표를 나눠 쓰는 합성 데이터로,
+이전 방식(셀마다 `ws.cell` + 새 `Alignment`, 표마다 전체 셀을 다시 훑는 열 너비 조정)과
+`modules/excel_writer.py`(쓰기 전용 통합문서, 공유 서식, DataFrame 문자열 길이로 정한 열 너비)의
+저장까지 걸린 시간을 잽니다. 두 파일을 다시 읽어 셀 값이 다르면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from io import BytesIO
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook, load_workbook  # noqa: E402
+from openpyxl.styles import Alignment  # noqa: E402
+from openpyxl.utils.dataframe import dataframe_to_rows  # noqa: E402
+from openpyxl.worksheet.table import Table, TableStyleInfo  # noqa: E402
+
+from modules.excel_writer import WorkbookWriter, column_widths, split_rows  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재"]
+
+
+def build_rows(rows: int, sheets: int, seed: int = 23) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "수금자명": rng.choice([f"설계사{i:03d}" for i in range(sheets)], size=rows),
+        "계약일자": (pd.Timestamp("2025-07-01") + pd.to_timedelta(rng.integers(0, 62, rows), unit="D")).strftime("%Y-%m-%d"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice(["건강보험", "치아보험", "암보험", "종신보험"], size=rows),
+        "납입기간": rng.choice(["5년", "10년", "20년"], size=rows),
+        "보험료": [f"{x:,.0f} 원" for x in rng.integers(10, 300, rows) * 1000],
+        "쉐어율": rng.choice(["100 %", "50 %"], size=rows),
+        "환산율": rng.integers(50, 300, rows),
+        "환산금액": [f"{x:,.0f} 원" for x in rng.integers(10, 900, rows) * 1000],
+    })
+
+
+def legacy_workbook(df: pd.DataFrame) -> bytes:
+    wb = Workbook()
+    wb.remove(wb.active)
+    seq = 0
+
+    for collector in sorted(df["수금자명"].astype(str).unique()):
+        sub = df[df["수금자명"].astype(str) == collector]
+        ws = wb.create_sheet(collector)
+        r_idx = 1
+        for r_idx, row in enumerate(dataframe_to_rows(sub, index=False, header=True), 1):
+            for c_idx, value in enumerate(row, 1):
+                cell = ws.cell(row=r_idx, column=c_idx, value=value)
+                cell.alignment = Alignment(horizontal="center", vertical="center")
+
+        seq += 1
+        end = ws.cell(row=1, column=sub.shape[1]).column_letter
+        table = Table(displayName=f"tbl_{seq}", ref=f"A1:{end}{r_idx}")
+        table.tableStyleInfo = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
+        ws.add_table(table)
+
+        for column_cells in ws.columns:
+            width = max(len(str(cell.value)) if cell.value is not None else 0 for cell in column_cells)
+            ws.column_dimensions[column_cells[0].column_letter].width = width + 5
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def shared_workbook(df: pd.DataFrame) -> bytes:
+    writer = WorkbookWriter()
+
+    for collector, (body, lengths) in split_rows(df, df["수금자명"].astype(str)).items():
+        sheet = writer.sheet(collector, column_widths(df.columns, lengths))
+        sheet.table(df.columns, body)
+
+    output = BytesIO()
+    writer.wb.save(output)
+    return output.getvalue()
+
+
+def sheet_values(data: bytes) -> dict[str, list[tuple]]:
+    wb = load_workbook(BytesIO(data), read_only=True)
+    return {ws.title: list(ws.iter_rows(values_only=True)) for ws in wb.worksheets}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="합성 계약 행 수")
+    parser.add_argument("--sheets", type=int, default=100, help="수금자(시트) 수")
+    parser.add_argument("--rounds", type=int, default=2, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    df = build_rows(args.rows, args.sheets)
+    cells = (len(df) + df["수금자명"].nunique()) * df.shape[1]
+    print(f"합성 계약 {args.rows:,}행 · 시트 {df['수금자명'].nunique():,}장 · 셀 {cells:,}개")
+
+    _, legacy_seconds = measure(lambda: legacy_workbook(df), rounds=args.rounds)
+    _, shared_seconds = measure(lambda: shared_workbook(df), rounds=args.rounds)
+
+    print(f"- 셀 단위 쓰기:   {legacy_seconds:,.2f}s ({cells / legacy_seconds:,.0f} 셀/초)")
+    print(f"- 공용 쓰기 도우미: {shared_seconds:,.2f}s ({cells / shared_seconds:,.0f} 셀/초, "
+          f"{legacy_seconds / shared_seconds:,.1f}배)")
+
+    if sheet_values(legacy_workbook(df)) != sheet_values(shared_workbook(df)):
+        print("두 방식의 셀 값이 다릅니다.")
+        return 1
+    print("두 방식의 셀 값이 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
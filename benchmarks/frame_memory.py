@@ -0,0 +1,88 @@
+"""썸머·컨벤션·매니저 업적 계산 단계별 표의 메모리를 범주형·정수 축소 전과 비교합니다.
+
+사용 예:
+    python benchmarks/frame_memory.py
+    python benchmarks/frame_memory.py --rows 60000
+
+합성 보유계약으로 세 페이지가 세션에 들고 있는 표(업로드 계약, 계산 결과, 제외 계약)를 만들고
+`modules/frame_memory.py`의 `memory_report`로 현재 크기와 축소 전 형식일 때의 크기를 출력합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from _common import quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules import convention, manager_results, summer  # noqa: E402
+from modules.contract_loader import apply_dtypes  # noqa: E402
+from modules.frame_memory import memory_report  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재", "라이나생명"]
+
+
+def build_upload(rows: int, seed: int = 44) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "수금자명": rng.choice([f"설계사{i:03d}" for i in range(150)], size=rows),
+        "계약일": pd.Timestamp("2025-06-20") + pd.to_timedelta(rng.integers(0, 80, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice([f"무배당 건강보험 {i}형" for i in range(40)], size=rows),
+        "납입기간": rng.choice([5, 10, 20], size=rows),
+        "초회보험료": rng.integers(1, 300, rows) * 1000,
+        "쉐어율": rng.choice([100.0, 50.0, np.nan], size=rows),
+        "납입방법": rng.choice(["월납", "월납", "일시납"], size=rows),
+        "상품군2": rng.choice(["보장성", "보장성", "저축성"], size=rows),
+        "계약상태": rng.choice(["정상", "정상", "철회"], size=rows),
+    })
+
+
+def page_frames(module, upload: pd.DataFrame, compute, excluded_display) -> dict[str, pd.DataFrame]:
+    raw = apply_dtypes(upload)
+    raw["_원본행번호"] = raw.index + 2
+    valid, excluded, masks = module.exclude_contracts(raw)
+    return {
+        "업로드 계약": raw,
+        "계산 결과": compute(valid),
+        "제외 계약": excluded_display(excluded, masks),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30_000, help="합성 계약 행 수")
+    args = parser.parse_args()
+
+    upload = build_upload(args.rows)
+    standard = convention.standardize_columns(upload)
+    pages = {
+        "썸머": page_frames(summer, standard, summer.compute_summer, summer.build_excluded_with_reason),
+        "컨벤션": page_frames(
+            convention, standard, convention.compute_convention, convention.build_excluded_with_reason
+        ),
+        "매니저 업적": page_frames(
+            manager_results,
+            upload,
+            getattr(manager_results.compute_manager_score, "__wrapped__", manager_results.compute_manager_score),
+            manager_results.build_excluded_with_reason,
+        ),
+    }
+
+    print(f"합성 계약 {args.rows:,}행")
+    with pd.option_context("display.width", 120, "display.unicode.east_asian_width", True):
+        for page, frames in pages.items():
+            report = memory_report(frames)
+            current, expanded = report["현재(KB)"].sum(), report["축소 전(KB)"].sum()
+            print(f"\n[{page}] {current / 1024:,.2f}MB (축소 전 {expanded / 1024:,.2f}MB)")
+            print(report.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""환산율 규칙 엔진을 이전 `np.select` 구현과 10만 행 합성 데이터로 비교합니다.
+
+사용 예:
+    python benchmarks/rate_engine.py
+    python benchmarks/rate_engine.py --rows 300000
+
+컨벤션·썸머·매니저 업적 세 환산율 모두 이전 방식과 결과가 같은지 확인하고,
+보험사 구분(한 번 계산해 세 캠페인이 공유)과 규칙 평가 시간을 나눠 출력합니다.
+결과가 다르면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules.convention import CONVENTION_RATE_TABLE  # noqa: E402
+from modules.manager_results import (  # noqa: E402
+    MANAGER_RATE_TABLE,
+    RATE_LIFE_10P,
+    RATE_LT10,
+    RATE_LT10_HANWHA,
+    RATE_NONLIFE_10P,
+)
+from modules.rate_engine import classify_insurers  # noqa: E402
+from modules.summer import SUMMER_RATE_TABLE  # noqa: E402
+
+INSURERS = [
+    "한화생명", "삼성생명", "교보생명", "신한라이프", "KB라이프생명", "메트라이프생명",
+    "DB손해보험", "KB손해보험", "한화손해보험", "흥국화재", "삼성화재", "현대해상",
+    "메리츠화재", "롯데손해보험", "DB생명", "흥국생명", "AIG손보", "라이나생명",
+]
+
+
+def build_rows(rows: int, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "보험사": rng.choice(INSURERS, size=rows),
+        "납입기간_num": rng.choice([5, 7, 10, 12, 15, 20, 30], size=rows),
+        "치아보험예외적용": rng.random(rows) < 0.03,
+    })
+
+
+# ── 이전 구현 (비교 기준) ─────────────────────────────────────
+def _legacy_masks(ins: pd.Series) -> dict[str, pd.Series]:
+    ins = ins.astype(str).str.strip()
+    hint = ins.str.contains("손", na=False) | ins.str.contains("화재", na=False) | ins.str.contains("손해", na=False)
+    hanwha_life = ins.str.contains("한화", na=False) & ins.str.contains("생명", na=False)
+    special = (
+        (ins.str.contains("DB", case=False, na=False) & hint)
+        | (ins.str.contains("KB", case=False, na=False) & hint)
+        | (ins.str.contains("한화", na=False) & hint & ~hanwha_life)
+        | (ins.str.contains("흥국", na=False) & hint)
+    )
+    nonlife = ins.str.contains("손해|손보|화재|해상", regex=True, na=False) | special
+    life = ins.str.contains("생명", na=False) | ins.str.contains("라이프", na=False)
+    return {
+        "hanwha_life": hanwha_life,
+        "special": special,
+        "other_nonlife": nonlife & ~special,
+        "other_life": life & ~hanwha_life,
+    }
+
+
+def legacy_summer(df: pd.DataFrame) -> np.ndarray:
+    m = _legacy_masks(df["보험사"])
+    long_term = (df["납입기간_num"] > 10) | df["치아보험예외적용"]
+    return np.select(
+        [
+            m["special"] & long_term, m["special"] & ~long_term,
+            m["other_nonlife"] & long_term, m["other_nonlife"] & ~long_term,
+            m["hanwha_life"] & long_term, m["hanwha_life"] & ~long_term,
+            m["other_life"] & long_term, m["other_life"] & ~long_term,
+        ],
+        [250, 100, 100, 50, 150, 100, 100, 50],
+        default=0,
+    ).astype(int)
+
+
+def legacy_convention(df: pd.DataFrame) -> np.ndarray:
+    m = _legacy_masks(df["보험사"])
+    term = df["납입기간_num"]
+    return np.select(
+        [
+            m["hanwha_life"], m["special"], m["other_nonlife"],
+            m["other_life"] & (term < 10), m["other_life"] & (term >= 10),
+        ],
+        [150, 300, 200, 50, 100],
+        default=0,
+    ).astype(int)
+
+
+def legacy_manager(df: pd.DataFrame) -> np.ndarray:
+    ins = df["보험사"].astype(str).str.strip()
+    nonlife = ins.str.contains(r"손해|손보|화재|해상", regex=True, na=False)
+    hanwha_life = df["보험사"].astype(str).str.contains("한화생명", na=False)
+    term = df["납입기간_num"]
+    return np.select(
+        [
+            (term < 10) & hanwha_life, (term < 10) & ~hanwha_life,
+            (term >= 10) & ~nonlife, (term >= 10) & nonlife,
+        ],
+        [RATE_LT10_HANWHA, RATE_LT10, RATE_LIFE_10P, RATE_NONLIFE_10P],
+        default=0,
+    ).astype(int)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="합성 계약 행 수")
+    parser.add_argument("--rounds", type=int, default=5, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    df = build_rows(args.rows)
+    cases = [
+        ("썸머", SUMMER_RATE_TABLE, legacy_summer, df),
+        ("컨벤션", CONVENTION_RATE_TABLE, legacy_convention, None),
+        ("매니저업적", MANAGER_RATE_TABLE, legacy_manager, None),
+    ]
+    failed = False
+    print(f"합성 계약 {args.rows:,}행")
+    _, classify_seconds = measure(lambda: classify_insurers(df["보험사"]), rounds=args.rounds)
+    insurer_class = classify_insurers(df["보험사"])
+    _, legacy_classify_seconds = measure(lambda: _legacy_masks(df["보험사"]), rounds=args.rounds)
+    print(
+        f"보험사 구분(세 캠페인 공용): {classify_seconds * 1000:,.1f}ms "
+        f"(행별 str.contains {legacy_classify_seconds * 1000:,.1f}ms)"
+    )
+    for name, table, legacy, flags in cases:
+        expected = legacy(df)
+        actual = table.apply(insurer_class, df["납입기간_num"], flags)
+        mismatches = int((expected != actual).sum())
+        _, legacy_seconds = measure(lambda: legacy(df), rounds=args.rounds)
+        _, engine_seconds = measure(
+            lambda: table.apply(insurer_class, df["납입기간_num"], flags),
+            rounds=args.rounds,
+        )
+        status = "일치" if mismatches == 0 else f"불일치 {mismatches:,}행"
+        print(
+            f"- {name}: 이전 {legacy_seconds * 1000:,.1f}ms · "
+            f"규칙 평가 {engine_seconds * 1000:,.1f}ms · 결과 {status}"
+        )
+        failed = failed or mismatches > 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""매니저 업적 월별 순위 추이를 예전 엑셀을 다시 읽어 계산할 때와 저장된 스냅샷에서 읽을 때를 비교합니다.
+
+사용 예:
+    python benchmarks/score_history.py
+    python benchmarks/score_history.py --months 12 --rows 20000
+
+월마다 합성 보유계약 엑셀을 만들고, 이전 방식(달마다 엑셀을 읽고 `compute_manager_score`와
+순위 계산을 다시 함)과 `modules/score_history.py` 스냅샷(임시 폴더에 저장해 둔 순위 파일만 읽음)으로
+수금자별 순위 이력을 만드는 시간을 잽니다. 스냅샷 읽기는 첫 읽기와 캐시 재사용을 따로 보여 줍니다.
+
+이어서 수금자가 다른 팀 자료를 같은 기준일로 저장해 두 스냅샷이 모두 남는지, `scope_history`가
+지금 올린 자료의 팀 범위를 고르는지 확인합니다. 두 방식의 순위 이력이 다르거나 확인이 틀리면
+종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules import manager_results  # noqa: E402
+from modules.download_cache import frame_digest  # noqa: E402
+from modules.score_history import (  # noqa: E402
+    _read_ranks,
+    load_rank_history,
+    rank_history,
+    save_snapshot,
+    scope_history,
+    snapshot_scope,
+)
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재"]
+
+compute_manager_score = getattr(
+    manager_results.compute_manager_score, "__wrapped__", manager_results.compute_manager_score
+)
+
+
+def build_month(rows: int, month_end: pd.Timestamp, seed: int, team: str = "설계사") -> bytes:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "수금자명": rng.choice([f"{team}{i:03d}" for i in range(80)], size=rows),
+        "계약일": month_end - pd.to_timedelta(rng.integers(0, 28, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice(["건강보험", "암보험", "연금보험"], size=rows),
+        "납입기간": rng.choice([5, 10, 20], size=rows),
+        "초회보험료": rng.integers(1, 300, rows) * 1000.0,
+        "쉐어율": rng.choice([100.0, 50.0], size=rows),
+        "납입방법": rng.choice(["월납", "월납", "일시납"], size=rows),
+        "상품군2": rng.choice(["보장성", "보장성", "저축성"], size=rows),
+        "계약상태": rng.choice(["정상", "정상", "철회"], size=rows),
+    })
+    df.loc[0, "계약일"] = month_end
+
+    output = BytesIO()
+    df.to_excel(output, index=False)
+    return output.getvalue()
+
+
+def scored(data: bytes) -> pd.DataFrame:
+    valid, _, _ = manager_results.exclude_contracts(manager_results.load_df_from_bytes.__wrapped__(data))
+    return compute_manager_score(valid)
+
+
+def legacy_history(files: list[bytes]) -> pd.DataFrame:
+    """달마다 엑셀을 다시 읽고 계산해 순위를 모읍니다."""
+    frames = []
+
+    for data in files:
+        df = scored(data)
+        group = manager_results.make_group_with_ranks(df)
+        frames.append(group.assign(
+            기준일=df["계약일자_raw"].max().normalize(),
+            범위=snapshot_scope(df),
+            수금자명=group["수금자명"].astype(str),
+        ))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months", type=int, default=6, help="월별 업로드 파일 수")
+    parser.add_argument("--rows", type=int, default=10_000, help="파일 하나의 계약 행 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    month_ends = pd.date_range("2025-01-31", periods=args.months, freq="ME")
+    files = [build_month(args.rows, end, seed) for seed, end in enumerate(month_ends)]
+    print(f"월별 합성 파일 {args.months}개 · 파일당 {args.rows:,}행")
+
+    with tempfile.TemporaryDirectory() as folder:
+        store = Path(folder)
+        for data in files:
+            df = scored(data)
+            save_snapshot(df, manager_results.make_group_with_ranks(df), frame_digest(df), store)
+
+        stored_kb = sum(path.stat().st_size for path in store.rglob("*.parquet")) / 1024
+        print(f"스냅샷 저장소 {stored_kb:,.0f}KB (순위·계약 parquet, zstd)")
+
+        legacy_seconds, _ = measure(lambda: legacy_history(files), rounds=args.rounds)
+
+        def snapshot_first():
+            _read_ranks.clear()
+            return load_rank_history(store)
+
+        snapshot_seconds, _ = measure(snapshot_first, rounds=args.rounds)
+        _, cached_seconds = measure(lambda: load_rank_history(store), rounds=args.rounds)
+
+        print(f"- 엑셀 다시 읽어 계산:   {legacy_seconds:,.2f}s")
+        print(f"- 스냅샷 읽기(첫 읽기): {snapshot_seconds * 1000:,.1f}ms ({legacy_seconds / snapshot_seconds:,.0f}배)")
+        print(f"- 스냅샷 읽기(캐시):    {cached_seconds * 1000:,.2f}ms")
+
+        expected = rank_history(legacy_history(files))
+        actual = rank_history(load_rank_history(store))
+
+        # 다른 팀이 마지막 달과 같은 기준일 자료를 올려도 두 스냅샷이 모두 남아야 합니다.
+        other = scored(build_month(args.rows // 4, month_ends[-1], seed=99, team="다른팀"))
+        save_snapshot(other, manager_results.make_group_with_ranks(other), frame_digest(other), store)
+        history = load_rank_history(store)
+        last_day = history["기준일"].max()
+        scopes = history.loc[history["기준일"].eq(last_day), "범위"].nunique()
+        team = rank_history(scope_history(history, expected.columns))
+        print(f"- 같은 기준일 {last_day:%Y-%m-%d} 다른 팀 저장 뒤 범위 {scopes}개")
+
+    failures = []
+    if not expected.equals(actual):
+        failures.append("순위 이력이 다릅니다.")
+    if scopes != 2:
+        failures.append("다른 팀 스냅샷이 같은 기준일 스냅샷을 덮어썼습니다.")
+    if not expected.equals(team):
+        failures.append("지금 올린 자료의 범위로 고른 순위 이력이 다릅니다.")
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        return 1
+    print("순위 이력이 같고 범위가 다른 스냅샷을 덮어쓰지 않습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
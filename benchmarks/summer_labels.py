@@ -0,0 +1,93 @@
+"""썸머 `적용 구분` 문구를 이전 행별 apply와 열 단위 조립으로 10만 행에서 비교합니다.
+
+사용 예:
+    python benchmarks/summer_labels.py
+    python benchmarks/summer_labels.py --rows 300000
+
+쉐어율 공란·50%·조정·치아보험 예외가 섞인 합성 계약으로 두 방식의 결과가 같은지
+확인하고, 문구 조립과 `compute_summer` 전체 처리 시간을 출력합니다.
+결과가 다르면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules.summer import application_labels, compute_summer  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재", "라이나생명"]
+PRODUCTS = ["건강보험", "치아보험", "암보험", "종신보험", "어린이보험"]
+
+
+def build_rows(rows: int, seed: int = 17) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    share = rng.choice(np.array([100, 100, 50, 30, 70, np.nan], dtype=object), size=rows)
+    return pd.DataFrame({
+        "수금자명": rng.choice([f"설계사{i:02d}" for i in range(60)], size=rows),
+        "계약일자": pd.Timestamp("2025-07-01") + pd.to_timedelta(rng.integers(0, 62, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice(PRODUCTS, size=rows),
+        "상품군2": "보장성",
+        "납입기간": rng.choice([5, 10, 15, 20], size=rows),
+        "보험료": rng.integers(10, 300, rows) * 1000.0,
+        "쉐어율": share,
+        "_공란적용쉐어율": rng.choice([100.0, 100.0, 50.0], size=rows),
+    })
+
+
+def legacy_labels(df: pd.DataFrame) -> pd.Series:
+    def application_label(row):
+        labels = []
+        if pd.isna(row["쉐어율"]):
+            labels.append(f"쉐어율 공란 → {row['적용쉐어율']:.0f}% {'기본' if row['적용쉐어율'] == 100 else '수동'} 적용")
+        elif row["쉐어율"] < 100:
+            if row["쉐어율"] == 50:
+                labels.append("쉐어 50% 적용")
+            else:
+                labels.append(f"쉐어 조정 적용 {row['쉐어율']:g}% → 50%")
+        if row["치아보험예외적용"]:
+            labels.append("치아보험 예외 적용")
+        return " · ".join(labels)
+
+    return df.apply(application_label, axis=1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="합성 계약 행 수")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    computed = compute_summer(rows)
+    print(f"합성 계약 {args.rows:,}행")
+
+    expected = legacy_labels(computed)
+    actual = application_labels(computed)
+    mismatches = int((expected.astype(str) != actual).sum())
+
+    _, legacy_seconds = measure(lambda: legacy_labels(computed), rounds=args.rounds)
+    _, vector_seconds = measure(lambda: application_labels(computed), rounds=args.rounds)
+    _, compute_seconds = measure(lambda: compute_summer(rows), rounds=args.rounds)
+
+    print(f"- 행별 apply:      {legacy_seconds * 1000:,.1f}ms")
+    print(f"- 열 단위 조립:    {vector_seconds * 1000:,.1f}ms ({legacy_seconds / vector_seconds:,.0f}배)")
+    print(f"- compute_summer 전체: {compute_seconds * 1000:,.1f}ms "
+          f"(이전 방식이면 약 {(compute_seconds - vector_seconds + legacy_seconds) * 1000:,.1f}ms)")
+    if mismatches:
+        print(f"결과 불일치 {mismatches:,}행")
+        return 1
+    print("두 방식의 결과가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
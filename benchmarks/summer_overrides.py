@@ -0,0 +1,148 @@
+"""썸머 쉐어율·치아보험 수정 뒤 전체를 다시 계산할 때와 바뀐 행만 다시 계산할 때를 비교합니다.
+
+사용 예:
+    python benchmarks/summer_overrides.py
+    python benchmarks/summer_overrides.py --rows 60000 --edits 20
+
+합성 보유계약을 `compute_summer`로 계산해 둔 뒤, 쉐어율 공란 행 몇 개를 50%로 바꾸고 한화생명 10년납
+치아보험 행 몇 개에 치아보험 예외를 켭니다. 전체 재계산(`compute_summer` + 수금자 × 월 집계)과
+`patch_summer_results`의 시간을 재고(이전 결과 복사 포함), 두 결과와 집계가 같은지 확인합니다.
+
+이어서 썸머율이 모두 100이라 int8로 줄어든 작은 결과에서 치아보험 예외를 켜 한 행이 150이 되는 경우도
+전체 재계산과 같은지 확인합니다. 하나라도 다르면 종료 코드 1로 끝납니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from modules import convention, summer  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재", "라이나생명"]
+PRODUCTS = ["무배당 건강보험", "무배당 치아보험", "무배당 암보험", "무배당 어린이보험"]
+
+
+def build_valid(rows: int, seed: int = 36) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    upload = pd.DataFrame({
+        "수금자명": rng.choice([f"설계사{i:03d}" for i in range(150)], size=rows),
+        "계약일": pd.Timestamp("2025-07-01") + pd.to_timedelta(rng.integers(0, 62, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice(PRODUCTS, size=rows),
+        "납입기간": rng.choice([5, 10, 20], size=rows),
+        "초회보험료": rng.integers(1, 300, rows) * 1000,
+        "쉐어율": rng.choice([100.0, 50.0, np.nan], size=rows),
+        "납입방법": "월납",
+        "상품군2": "보장성",
+        "계약상태": "정상",
+    })
+    valid, _, _ = summer.exclude_contracts(convention.standardize_columns(upload))
+    return valid.assign(_공란적용쉐어율=100.0, _치아보험예외적용=False)
+
+
+def edit_overrides(valid: pd.DataFrame, edits: int, seed: int = 36) -> pd.DataFrame:
+    """쉐어율 공란 행 `edits`개는 50%로, 한화생명 10년납 치아보험 행 `edits`개는 치아보험 예외로 바꿉니다."""
+    rng = np.random.default_rng(seed)
+    edited = valid.copy()
+    blank = edited.index[edited["쉐어율"].isna()]
+    dental = edited.index[
+        edited["보험사"].eq("한화생명") & edited["납입기간"].eq(10) & edited["상품명"].str.contains("치아")
+    ]
+    edited.loc[rng.choice(blank, size=min(edits, len(blank)), replace=False), "_공란적용쉐어율"] = 50.0
+    edited.loc[rng.choice(dental, size=min(edits, len(dental)), replace=False), "_치아보험예외적용"] = True
+    return edited
+
+
+def patch_matches(valid: pd.DataFrame, edited: pd.DataFrame) -> tuple[bool, pd.DataFrame]:
+    """(`patch_summer_results` 결과와 집계가 전체 재계산과 같은지, 패치한 결과)."""
+    df = summer.compute_summer(valid)
+    totals = summer.SUMMER_CAMPAIGN.month_totals(df)
+    patched, patched_totals = summer.patch_summer_results(df, totals, valid[summer.OVERRIDE_COLUMNS], edited)
+
+    expected = summer.compute_summer(edited)
+    expected_totals = summer.SUMMER_CAMPAIGN.month_totals(expected)
+    try:
+        # 일부 행만 덮어쓰면 작은 정수형 열이 넓어질 수 있어 값만 비교합니다.
+        pd.testing.assert_frame_equal(patched, expected, check_dtype=False, check_categorical=False)
+        pd.testing.assert_frame_equal(patched_totals, expected_totals, check_dtype=False, check_categorical=False)
+    except AssertionError:
+        return False, patched
+    return True, patched
+
+
+def dental_toggle_valid() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """한화생명 10년납 치아보험 행과 다른 10년납 행. 치아보험 예외를 켜면 첫 행 썸머율이 100 → 150입니다."""
+    upload = pd.DataFrame({
+        "수금자명": ["설계사001", "설계사002"],
+        "계약일": pd.to_datetime(["2025-07-01", "2025-07-02"]),
+        "보험사": ["한화생명", "한화생명"],
+        "상품명": ["무배당 치아보험", "무배당 건강보험"],
+        "납입기간": [10, 10],
+        "초회보험료": [30_000, 40_000],
+        "쉐어율": [100.0, 100.0],
+        "납입방법": ["월납", "월납"],
+        "상품군2": ["보장성", "보장성"],
+        "계약상태": ["정상", "정상"],
+    })
+    valid, _, _ = summer.exclude_contracts(convention.standardize_columns(upload))
+    valid = valid.assign(_공란적용쉐어율=100.0, _치아보험예외적용=False)
+    toggled = valid.copy()
+    toggled.loc[toggled.index[0], "_치아보험예외적용"] = True
+    return valid, toggled
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30_000, help="합성 계약 행 수")
+    parser.add_argument("--edits", type=int, default=10, help="쉐어율·치아보험 수정 행 수(각각)")
+    parser.add_argument("--rounds", type=int, default=3, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    valid = build_valid(args.rows)
+    edited = edit_overrides(valid, args.edits)
+    df = summer.compute_summer(valid)
+    totals = summer.SUMMER_CAMPAIGN.month_totals(df)
+    overrides = valid[summer.OVERRIDE_COLUMNS]
+    print(f"합성 계약 {len(valid):,}행 · 수정 {int(edited[summer.OVERRIDE_COLUMNS].ne(overrides).any(axis=1).sum())}행")
+
+    def full():
+        result = summer.compute_summer(edited)
+        return summer.SUMMER_CAMPAIGN.month_totals(result)
+
+    _, full_seconds = measure(full, rounds=args.rounds)
+    _, patch_seconds = measure(
+        lambda: summer.patch_summer_results(df.copy(), totals, overrides, edited), rounds=args.rounds
+    )
+    print(f"- 전체 다시 계산:     {full_seconds * 1000:,.1f}ms")
+    print(f"- 바뀐 행만 다시 계산: {patch_seconds * 1000:,.1f}ms ({full_seconds / patch_seconds:,.1f}배)")
+
+    failures = []
+    if not patch_matches(valid, edited)[0]:
+        failures.append("쉐어율·치아보험 수정 뒤 일부 행 다시 계산 결과가 전체 재계산과 다릅니다.")
+
+    small, toggled = dental_toggle_valid()
+    before = summer.compute_summer(small)["썸머율"]
+    matches, patched = patch_matches(small, toggled)
+    print(f"- 치아보험 예외 토글: 썸머율 {before.dtype} {before.tolist()} "
+          f"→ {patched['썸머율'].dtype} {patched['썸머율'].tolist()}")
+    if not matches:
+        failures.append("작은 정수형 썸머율에 치아보험 예외를 켠 결과가 전체 재계산과 다릅니다.")
+
+    for failure in failures:
+        print(failure)
+    if failures:
+        return 1
+    print("일부 행 다시 계산 결과가 전체 재계산과 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
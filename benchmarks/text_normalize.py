@@ -0,0 +1,72 @@
+"""공용 문자열 정규화 캐시의 효과를 자동 연결 정답셋으로 비교합니다.
+
+사용 예:
+    python benchmarks/text_normalize.py
+
+캐시를 끈 원래 함수(`uncached`)와 캐시를 켠 함수로 같은 정답셋을 처리해
+계약당 처리 시간과 정규화 종류별 캐시 적중률을 출력합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from contextlib import contextmanager
+
+from _common import measure, quiet_streamlit
+
+quiet_streamlit()
+
+from modules import commission_calculator, text_normalize  # noqa: E402
+from commission_linker import load_golden  # noqa: E402
+
+# 자동 연결 경로에서 캐시로 감싼 함수들입니다.
+CACHED_NAMES = ("_normalize", "_clean_text", "_holding_product_name", "_smart_product_name")
+
+
+@contextmanager
+def caches_disabled():
+    originals = {name: getattr(commission_calculator, name) for name in CACHED_NAMES}
+    try:
+        for name, func in originals.items():
+            setattr(commission_calculator, name, func.uncached)
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(commission_calculator, name, func)
+
+
+def time_linker(rounds: int) -> tuple[float, float]:
+    holdings, product_rows, _ = load_golden()
+    analyze = commission_calculator._analyze_product_links.__wrapped__
+    first, median = measure(lambda: analyze(holdings, product_rows), rounds=rounds)
+    return first * 1000 / len(holdings), median * 1000 / len(holdings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=15, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    with caches_disabled():
+        plain_first, plain = time_linker(args.rounds)
+    text_normalize.clear_caches()
+    cached_first, cached = time_linker(args.rounds)
+
+    print(f"캐시 미사용: 계약당 {plain:.2f}ms (첫 실행 {plain_first:.2f}ms)")
+    print(f"캐시 사용:   계약당 {cached:.2f}ms (첫 실행 {cached_first:.2f}ms)")
+    if cached:
+        print(f"속도 향상 {plain / cached:.1f}배")
+    print("정규화 종류별 캐시 적중률")
+    for row in text_normalize.cache_stats():
+        if row["hits"] + row["misses"] == 0:
+            continue
+        print(
+            f"  - {row['name']}: {row['hit_rate']:.1%} "
+            f"(적중 {row['hits']:,} · 계산 {row['misses']:,} · 보관 {row['size']:,})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""여러 엑셀 다운로드 파일을 작업 스레드에서 동시에 만들어도 결과가 같은지 확인합니다.
+
+사용 예:
+    python benchmarks/workbook_threads.py
+    python benchmarks/workbook_threads.py --jobs 16 --workers 8
+
+컨벤션·매니저 업적 통합문서를 수금자 묶음별로 여러 개 만들면서, 한 번은 차례로,
+한 번은 `ThreadPoolExecutor`로 동시에 만듭니다. 두 결과의 시트 이름·셀 값·엑셀 표 이름과
+범위를 비교하고, 하나라도 다르거나 한 통합문서 안에 표 이름이 겹치면 종료 코드 1로 끝납니다.
+표 이름 번호는 통합문서마다 따로 매기므로 만드는 순서나 동시 실행 여부와 상관없이 같아야 합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from _common import quiet_streamlit
+
+quiet_streamlit()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from openpyxl import load_workbook  # noqa: E402
+
+from modules import convention, manager_results  # noqa: E402
+
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재"]
+
+
+def build_upload(rows: int, collectors: int, seed: int = 29) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "수금자명": rng.choice([f"설계사{i:03d}" for i in range(collectors)], size=rows),
+        "계약일": pd.Timestamp("2025-06-20") + pd.to_timedelta(rng.integers(0, 80, rows), unit="D"),
+        "보험사": rng.choice(INSURERS, size=rows),
+        "상품명": rng.choice(["건강보험", "암보험", "연금보험"], size=rows),
+        "납입기간": rng.choice([5, 10, 20], size=rows),
+        "초회보험료": rng.integers(1, 300, rows) * 1000.0,
+        "쉐어율": rng.choice([100.0, 50.0], size=rows),
+        "납입방법": rng.choice(["월납", "월납", "일시납"], size=rows),
+        "상품군2": rng.choice(["보장성", "보장성", "저축성"], size=rows),
+        "계약상태": rng.choice(["정상", "정상", "철회"], size=rows),
+    })
+
+
+def manager_job(upload: pd.DataFrame):
+    valid, excluded, masks = manager_results.exclude_contracts(upload)
+    scored = manager_results.compute_manager_score(valid)
+    group = manager_results.make_group_with_ranks(scored)
+    top_amt, top_cnt = manager_results.top3_tables(group)
+    excluded_disp = manager_results.build_excluded_with_reason(excluded, masks)
+    return lambda: manager_results.build_workbook(scored, group, excluded_disp, top_amt, top_cnt)
+
+
+def convention_job(upload: pd.DataFrame):
+    valid, excluded, masks = convention.exclude_contracts(convention.standardize_columns(upload))
+    result = convention.compute_convention(valid)
+    group = convention.make_group(result)
+    excluded_disp = convention.build_excluded_with_reason(excluded, masks)
+    return lambda: convention.build_workbook(result, group, excluded_disp)
+
+
+def save(build) -> bytes:
+    output = BytesIO()
+    build().save(output)
+    return output.getvalue()
+
+
+def snapshot(data: bytes) -> dict:
+    """시트별 셀 값과 표 (이름, 범위). 저장 시각이 들어가는 문서 속성은 비교하지 않습니다."""
+    wb = load_workbook(BytesIO(data))
+    return {
+        ws.title: (
+            list(ws.iter_rows(values_only=True)),
+            sorted((table.displayName, table.ref) for table in ws.tables.values()),
+        )
+        for ws in wb.worksheets
+    }
+
+
+def duplicate_table_names(snap: dict) -> set[str]:
+    names = [name for _, tables in snap.values() for name, _ in tables]
+    return {name for name in names if names.count(name) > 1}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=6_000, help="합성 계약 행 수")
+    parser.add_argument("--collectors", type=int, default=40, help="수금자 수")
+    parser.add_argument("--jobs", type=int, default=8, help="만들 통합문서 수")
+    parser.add_argument("--workers", type=int, default=4, help="작업 스레드 수")
+    args = parser.parse_args()
+
+    upload = build_upload(args.rows, args.collectors)
+    names = sorted(upload["수금자명"].unique())
+
+    # 작업마다 수금자 묶음과 페이지를 달리해 통합문서 구성이 서로 다르게 합니다.
+    jobs = []
+    for i in range(args.jobs):
+        subset = upload[upload["수금자명"].isin(names[i % 4::4])]
+        jobs.append((manager_job if i % 2 == 0 else convention_job)(subset))
+
+    start = time.perf_counter()
+    serial = [save(build) for build in jobs]
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        threaded = list(pool.map(save, jobs))
+    threaded_seconds = time.perf_counter() - start
+
+    print(f"통합문서 {args.jobs}개 · 작업 스레드 {args.workers}개")
+    print(f"- 차례로 만들기: {serial_seconds:,.2f}s")
+    print(f"- 동시에 만들기: {threaded_seconds:,.2f}s")
+
+    failures = 0
+    for i, (expected, actual) in enumerate(zip(serial, threaded)):
+        expected_snap, actual_snap = snapshot(expected), snapshot(actual)
+        if expected_snap != actual_snap:
+            print(f"{i}번 통합문서: 차례로 만든 결과와 다릅니다.")
+            failures += 1
+        duplicates = duplicate_table_names(actual_snap)
+        if duplicates:
+            print(f"{i}번 통합문서: 겹치는 표 이름 {sorted(duplicates)[:3]}")
+            failures += 1
+
+    if failures:
+        return 1
+    print("모든 통합문서가 차례로 만든 결과와 같고 표 이름이 겹치지 않습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""xlsx 빠른 읽기 경로와 pandas/openpyxl 읽기를 같은 합성 업로드 파일로 비교합니다.
+
+사용 예:
+    python benchmarks/xlsx_reader.py
+    python benchmarks/xlsx_reader.py --rows 50000 --styled-cols 200
+
+실적 업로드와 같은 열 구성의 파일을 만들고, 일부 행의 서식을 오른쪽 끝까지
+늘려 서식만 남은 넓은 시트를 흉내 냅니다. 두 경로의 결과가 같은지도 확인합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from _common import quiet_streamlit
+
+quiet_streamlit()
+
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook, load_workbook  # noqa: E402
+from openpyxl.styles import Font  # noqa: E402
+
+from modules.xlsx_reader import read_frame, read_workbook  # noqa: E402
+
+HEADERS = [
+    "수금자명", "계약일", "보험사", "상품명", "납입기간",
+    "초회보험료", "쉐어율", "납입방법", "상품군2", "계약상태",
+]
+INSURERS = ["한화생명", "삼성생명", "DB손해보험", "KB손해보험", "흥국화재", "메리츠화재", "한화손해보험"]
+
+
+def build_upload(rows: int, styled_cols: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADERS)
+    start = datetime(2025, 7, 1)
+    for index in range(rows):
+        sheet.append([
+            f"설계사{rng.randint(1, 60):02d}",
+            start + timedelta(days=rng.randint(0, 61)),
+            rng.choice(INSURERS),
+            f"무배당 건강보험 {rng.randint(1, 40)}종",
+            rng.choice([5, 10, 15, 20, 30]),
+            rng.randint(10, 300) * 1000,
+            rng.choice([None, 50, 100]),
+            rng.choice(["월납", "월납", "일시납"]),
+            rng.choice(["보장성", "보장성", "저축성"]),
+            rng.choice(["정상", "정상", "철회"]),
+        ])
+    bold = Font(bold=True)
+    # 서식만 있는 셀: openpyxl은 이 범위까지 셀 객체를 만듭니다.
+    for row in range(1, rows + 2, max(rows // 200, 1)):
+        sheet.cell(row, len(HEADERS) + styled_cols).font = bold
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def timed(func) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000, help="합성 계약 행 수")
+    parser.add_argument("--styled-cols", type=int, default=100, help="서식만 있는 오른쪽 열 수")
+    args = parser.parse_args()
+
+    data = build_upload(args.rows, args.styled_cols)
+    print(f"합성 파일 {args.rows:,}행 · {len(data) / 1024:,.0f}KB")
+
+    pandas_seconds, expected = timed(lambda: pd.read_excel(BytesIO(data), usecols=HEADERS))
+    fast_seconds, actual = timed(lambda: read_frame(data, usecols=HEADERS))
+    print(f"pd.read_excel(openpyxl): {pandas_seconds:.2f}s")
+    print(f"xlsx_reader.read_frame:  {fast_seconds:.2f}s ({pandas_seconds / fast_seconds:.1f}배)")
+
+    # 수수료 계산기·보장분석은 셀 위치로 읽으므로 openpyxl 전체 모드와 비교합니다.
+    book_seconds, _ = timed(lambda: load_workbook(BytesIO(data), data_only=True))
+    grid_seconds, _ = timed(lambda: read_workbook(data))
+    print(f"load_workbook(data_only): {book_seconds:.2f}s")
+    print(f"xlsx_reader.read_workbook: {grid_seconds:.2f}s ({book_seconds / grid_seconds:.1f}배)")
+
+    try:
+        pd.testing.assert_frame_equal(expected, actual)
+    except AssertionError as exc:
+        print(f"결과 불일치: {exc}")
+        return 1
+    print("두 경로의 결과가 같습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
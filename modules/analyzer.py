@@ -12,7 +12,9 @@ from openpyxl.drawing.image import Image as XLImage
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 
+from .text_normalize import normalize_label
 from .ui_components import page_header
+from .xlsx_reader import XlsxReadError, read_workbook
 
 
 DEFAULT_COVERAGES = [
@@ -243,7 +245,7 @@ THIN_BORDER = Border(left=THIN_SIDE, right=THIN_SIDE, top=THIN_SIDE, bottom=THIN
 
 
 def _normalize_label(value: object) -> str:
-    return re.sub(r"\s+", "", str(value or ""))
+    return normalize_label(value)
 
 
 def _to_number(value: object) -> int | float:
@@ -295,17 +297,25 @@ def _extract_age(value: object) -> str:
     return match.group(1) if match else ""
 
 
+def _load_source_sheets(main_bytes: bytes, names: list[str]) -> dict:
+    try:
+        return read_workbook(main_bytes, sheets=names)
+    except XlsxReadError:
+        workbook = openpyxl.load_workbook(BytesIO(main_bytes), data_only=True)
+        return {name: workbook[name] for name in names if name in workbook.sheetnames}
+
+
 def parse_source_file(main_bytes: bytes) -> dict:
-    workbook = openpyxl.load_workbook(BytesIO(main_bytes), data_only=True)
     required = ["계약사항", "상품별보장내용"]
-    missing = [name for name in required if name not in workbook.sheetnames]
+    sheets = _load_source_sheets(main_bytes, required)
+    missing = [name for name in required if name not in sheets]
     if missing:
         raise ValueError("필수 시트 없음:" + ",".join(missing))
 
-    contracts_ws = workbook["계약사항"]
-    coverage_ws = workbook["상품별보장내용"]
-    customer_name = _extract_customer_name(contracts_ws["B2"].value)
-    age = _extract_age(contracts_ws["D2"].value)
+    contracts_ws = sheets["계약사항"]
+    coverage_ws = sheets["상품별보장내용"]
+    customer_name = _extract_customer_name(contracts_ws.cell(2, 2).value)
+    age = _extract_age(contracts_ws.cell(2, 4).value)
 
     contract_columns = []
     for col in range(6, coverage_ws.max_column + 1):
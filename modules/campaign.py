@@ -0,0 +1,381 @@
+"""여러 달에 걸친 시즌 캠페인(썸머 등)의 월별 필수조건·등급·보너스 계산 엔진.
+
+계약 행을 먼저 수금자 × 월 집계표(`Campaign.month_totals`)로 한 번 줄이고, 캠페인 정의
+(대상 월, 월별 필수조건, 등급표, 보너스율)를 이 집계표에 numpy로 적용합니다.
+새 캠페인은 모듈을 복사하지 않고 `Campaign(...)` 정의만 추가하면 됩니다.
+
+집계표 열은 `{월}{지표}` 형식입니다(예: `7월환산`, `8월한화환산`).
+- 건수: 인정 건수 합계(해당 월 계약이 없으면 공란)
+- 쉐어미입력: 쉐어율 공란 계약 수
+- 환산: 환산금액 합계
+- 한화환산: 한화생명 계약의 환산금액 합계
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+from .rate_engine import (
+    HANWHA_LIFE,
+    OTHER_LIFE,
+    OTHER_NONLIFE,
+    SPECIAL_NONLIFE,
+    RateTable,
+    insurer_class_masks,
+)
+
+CUBE_METRICS = ("건수", "쉐어미입력", "환산", "한화환산")
+
+
+# 다음 등급 계산에서 추가 계약을 제안하는 보험사 구분. 여러 구분이면 환산율이 높은 쪽을 씁니다.
+OPPORTUNITY_GROUPS = (
+    ("한화생명", (HANWHA_LIFE,)),
+    ("우대손보", (SPECIAL_NONLIFE,)),
+    ("기타", (OTHER_NONLIFE, OTHER_LIFE)),
+)
+
+
+def opportunity_rates(rate_table: RateTable, term: int) -> dict[str, int]:
+    """`OPPORTUNITY_GROUPS`별로 `term`년납 신규 계약에 적용되는 환산율(%)."""
+    return {
+        group: max(rate_table.rate_for(insurer_class, term) for insurer_class in classes)
+        for group, classes in OPPORTUNITY_GROUPS
+    }
+
+
+def cheapest_premiums(hanwha_amount, other_amount, rates: Mapping[str, int]) -> pd.DataFrame:
+    """환산금액 부족분을 채우는 보험사 구분별 최소 추가 보험료.
+
+    hanwha_amount는 한화생명 계약으로만 채울 수 있는 환산금액(한화생명 필수조건),
+    other_amount는 어느 보험사로든 채울 수 있는 환산금액입니다. 추가 보험료는
+    원 단위로 올림합니다.
+    """
+    hanwha_amount = np.asarray(hanwha_amount, dtype=float)
+    other_amount = np.asarray(other_amount, dtype=float)
+    hanwha_premium = np.ceil(hanwha_amount * 100 / rates["한화생명"])
+
+    plans = pd.DataFrame({"한화생명필수보험료": hanwha_premium})
+    for group, rate in rates.items():
+        plans[f"{group} 추가보험료"] = hanwha_premium + np.ceil(other_amount * 100 / rate)
+
+    premium_columns = [f"{group} 추가보험료" for group in rates]
+    premiums = plans[premium_columns].to_numpy()
+    plans["최소추가보험료"] = premiums.min(axis=1)
+    plans["추천구분"] = np.asarray(list(rates), dtype=object)[premiums.argmin(axis=1)]
+    return plans
+
+
+def next_target_positions(positions, conditions_ok, grade_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """(다음 목표 등급 위치, 목표가 있는지) 배열. `positions`는 낮은 등급부터 정렬한 기준금액에서
+    현재 금액의 `searchsorted(side="right")` 위치(0이면 미달성, 등급 수와 같으면 최고 등급)입니다.
+
+    조건을 모두 채운 수금자는 금액 기준 등급의 바로 위 등급이 목표이고, 이미 최고 등급이면 목표가 없습니다.
+    조건을 못 채운 수금자는 인정 등급이 없으므로, 조건만 채우면 인정되는 금액 기준 등급(미달성이면
+    가장 낮은 등급)이 목표입니다. 금액으로는 최고 등급이어도 조건 부족분이 비용으로 남습니다.
+    """
+    positions = np.asarray(positions)
+    conditions_ok = np.asarray(conditions_ok, dtype=bool)
+    next_index = np.where(conditions_ok, positions, np.maximum(positions - 1, 0))
+    return np.minimum(next_index, grade_count - 1), ~conditions_ok | (positions < grade_count)
+
+
+def rank_opportunities(table: pd.DataFrame) -> pd.DataFrame:
+    """최소 추가 보험료가 적은 수금자부터 순위를 붙입니다."""
+    ranked = table.sort_values(
+        ["최소추가보험료", "수금자명"], na_position="last", kind="stable"
+    ).reset_index(drop=True)
+    ranked.insert(0, "순위", np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def _mark_array(ok) -> np.ndarray:
+    return np.where(np.asarray(ok, dtype=bool), "✅", "❌").astype(object)
+
+
+@dataclass(frozen=True)
+class MonthlyRequirement:
+    """매월 `metric` 합계가 `minimum` 이상이어야 하는 조건.
+
+    - key: 결과 딕셔너리 키 (예: "한화생명5만")
+    - label: 요약표 열 이름 뒷부분 (예: "한화5만" → "7월한화5만")
+    """
+
+    key: str
+    label: str
+    metric: str
+    minimum: float
+
+    def __post_init__(self) -> None:
+        if self.metric not in CUBE_METRICS:
+            raise ValueError(f"알 수 없는 집계 지표: {self.metric}")
+
+
+@dataclass(frozen=True)
+class Campaign:
+    name: str
+    months: tuple[int, ...]
+    requirements: tuple[MonthlyRequirement, ...]
+    grades: tuple[tuple[str, int], ...]  # 높은 등급부터
+    bonus_rates: tuple[int, ...] = (0,)
+    bonus_name: str = ""
+    amount_column: str = "환산금액"
+    count_column: str = "쉐어건수"
+
+    # ── 집계 ──────────────────────────────────────────────
+    @property
+    def month_labels(self) -> list[str]:
+        return [f"{month}월" for month in self.months]
+
+    @property
+    def totals_columns(self) -> list[str]:
+        return ["수금자명"] + [
+            f"{label}{metric}" for label in self.month_labels for metric in CUBE_METRICS
+        ]
+
+    @property
+    def summary_columns(self) -> list[str]:
+        columns = ["수금자명"]
+        for label in self.month_labels:
+            columns += [f"{label}건수", f"{label}쉐어미입력", f"{label}환산"]
+            columns += [f"{label}{requirement.label}" for requirement in self.requirements]
+            columns.append(f"{label}달성")
+        return columns + ["기본합산환산", "월별필수조건", "기본금액등급"]
+
+    def row_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """계약 행별 집계 지표 값."""
+        amount = pd.to_numeric(df[self.amount_column], errors="coerce")
+        return pd.DataFrame({
+            "건수": df[self.count_column],
+            "쉐어미입력": df["쉐어율"].isna(),
+            "환산": amount,
+            "한화환산": amount.where(insurer_class_masks(df["보험사"])[HANWHA_LIFE]),
+        }, index=df.index)
+
+    def month_totals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """수금자 × 캠페인 월 집계표. 캠페인 월이 아닌 계약은 무시합니다."""
+        in_campaign = df[df["계약월"].isin(self.months)] if not df.empty else df
+        if in_campaign.empty:
+            return pd.DataFrame(columns=self.totals_columns)
+
+        frame = self.row_metrics(in_campaign)
+        frame["수금자명"] = in_campaign["수금자명"]
+        frame["계약월"] = in_campaign["계약월"]
+        grouped = frame.groupby(["수금자명", "계약월"], dropna=False, observed=True)
+        cube = pd.DataFrame({
+            "건수": grouped["건수"].sum(min_count=1),
+            "쉐어미입력": grouped["쉐어미입력"].sum(),
+            "환산": grouped["환산"].sum(),
+            "한화환산": grouped["한화환산"].sum(),
+        }).unstack("계약월")
+
+        totals = pd.DataFrame({"수금자명": cube.index})
+        for month, label in zip(self.months, self.month_labels):
+            for metric in CUBE_METRICS:
+                if (metric, month) in cube.columns:
+                    values = cube[(metric, month)]
+                else:
+                    values = pd.Series(np.nan, index=cube.index)
+                if metric == "건수":
+                    totals[f"{label}{metric}"] = values.to_numpy(dtype=float)
+                elif metric == "쉐어미입력":
+                    totals[f"{label}{metric}"] = values.fillna(0).to_numpy(dtype=int)
+                else:
+                    totals[f"{label}{metric}"] = values.fillna(0.0).to_numpy(dtype=float)
+        return totals[self.totals_columns]
+
+    def patch_totals(self, totals: pd.DataFrame, df: pd.DataFrame, collectors) -> pd.DataFrame:
+        """지정 수금자 행만 `df`에서 다시 집계해 `totals`에 바꿔 넣습니다."""
+        recomputed = self.month_totals(df[df["수금자명"].isin(collectors)])
+        kept = totals[~totals["수금자명"].isin(collectors)]
+        patched = pd.concat([kept, recomputed], ignore_index=True)
+        # groupby와 같은 순서(수금자명 오름차순, 공란은 마지막)를 유지합니다.
+        return patched.sort_values("수금자명", na_position="last", kind="stable").reset_index(drop=True)
+
+    # ── 등급 ──────────────────────────────────────────────
+    def grade(self, total_amount: float) -> tuple[str, int]:
+        """높은 등급부터 확인해 (등급, 기준금액)을 반환합니다."""
+        for grade, target in self.grades:
+            if total_amount >= target:
+                return grade, target
+        return "미달성", 0
+
+    def grade_array(self, total_amounts) -> np.ndarray:
+        """`grade`의 등급명을 금액 배열 전체에 한 번에 적용합니다."""
+        names = ["미달성"] + [grade for grade, _ in reversed(self.grades)]
+        targets = [target for _, target in reversed(self.grades)]
+        positions = np.searchsorted(targets, np.asarray(total_amounts, dtype=float), side="right")
+        return np.asarray(names, dtype=object)[positions]
+
+    def next_grade_gap(self, total_amount: float):
+        for grade, target in reversed(self.grades):
+            if total_amount < target:
+                return grade, target, target - total_amount
+        return None, None, 0
+
+    # ── 월별 조건 ─────────────────────────────────────────
+    def monthly_result(self, metrics: Mapping[str, float]) -> dict:
+        """한 달 지표 합계로 월별 필수조건 결과를 만듭니다."""
+        result = {"환산금액": metrics["환산"]}
+        for requirement in self.requirements:
+            result[requirement.key] = bool(metrics[requirement.metric] >= requirement.minimum)
+        result["월달성"] = all(result[requirement.key] for requirement in self.requirements)
+        return result
+
+    def _month_ok(self, totals: pd.DataFrame, label: str) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        flags = {
+            requirement.label: totals[f"{label}{requirement.metric}"].to_numpy(dtype=float) >= requirement.minimum
+            for requirement in self.requirements
+        }
+        ok = np.logical_and.reduce(list(flags.values())) if flags else np.ones(len(totals), dtype=bool)
+        return flags, ok
+
+    def base_totals(self, totals: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """(보너스 전 합산 환산금액, 월별 필수조건 충족 여부) 배열."""
+        base_total = np.zeros(len(totals), dtype=float)
+        monthly_ok = np.ones(len(totals), dtype=bool)
+        for label in self.month_labels:
+            base_total += totals[f"{label}환산"].to_numpy(dtype=float)
+            monthly_ok &= self._month_ok(totals, label)[1]
+        return base_total, monthly_ok
+
+    # ── 결과표 ────────────────────────────────────────────
+    def summary(self, totals: pd.DataFrame) -> pd.DataFrame:
+        """수금자별 월별 조건·합산·금액 기준 등급 요약."""
+        if totals.empty:
+            return pd.DataFrame(columns=self.summary_columns)
+
+        summary = pd.DataFrame({"수금자명": totals["수금자명"].to_numpy()})
+        for label in self.month_labels:
+            flags, ok = self._month_ok(totals, label)
+            for metric in ["건수", "쉐어미입력", "환산"]:
+                summary[f"{label}{metric}"] = totals[f"{label}{metric}"].to_numpy()
+            for requirement_label, values in flags.items():
+                summary[f"{label}{requirement_label}"] = _mark_array(values)
+            summary[f"{label}달성"] = _mark_array(ok)
+
+        base_total, monthly_ok = self.base_totals(totals)
+        summary["기본합산환산"] = base_total
+        summary["월별필수조건"] = _mark_array(monthly_ok)
+        summary["기본금액등급"] = self.grade_array(base_total)
+        return summary[self.summary_columns]
+
+    def apply_bonus(self, monthly: Mapping[str, dict], bonus_rate: float = 0) -> dict:
+        """월별 필수조건 결과에 보너스율을 반영해 최종 등급을 정합니다.
+
+        월별 필수조건은 보너스 전 금액, 등급은 보너스 반영 후 금액 기준입니다.
+        """
+        base_total_amount = sum(monthly[label]["환산금액"] for label in self.month_labels)
+        bonus_amount = base_total_amount * bonus_rate / 100
+        final_total_amount = base_total_amount + bonus_amount
+
+        amount_grade, grade_target = self.grade(final_total_amount)
+        next_grade, next_target, next_gap = self.next_grade_gap(final_total_amount)
+        monthly_all_ok = all(monthly[label]["월달성"] for label in self.month_labels)
+
+        result = {label: monthly[label] for label in self.month_labels}
+        result.update({
+            "기본합산환산금액": base_total_amount,
+            f"{self.bonus_name}보너스율": bonus_rate,
+            f"{self.bonus_name}보너스금액": bonus_amount,
+            "합산환산금액": final_total_amount,
+            "월별필수조건": monthly_all_ok,
+            "금액기준등급": amount_grade,
+            # 금액 기준 등급과 최종 인정 등급을 분리
+            "최종인정등급": amount_grade if monthly_all_ok else "필수조건 미충족",
+            "달성기준금액": grade_target,
+            "다음등급": next_grade,
+            "다음등급기준": next_target,
+            "다음등급부족금액": next_gap,
+        })
+        return result
+
+    def result(self, totals: pd.DataFrame, bonus_rate: float = 0) -> dict:
+        """집계표 행(여러 행이면 합계)으로 최종 결과를 만듭니다."""
+        monthly = {
+            label: self.monthly_result({
+                metric: float(totals[f"{label}{metric}"].sum()) for metric in CUBE_METRICS
+            })
+            for label in self.month_labels
+        }
+        return self.apply_bonus(monthly, bonus_rate)
+
+    def bonus_matrix(self, totals: pd.DataFrame) -> pd.DataFrame:
+        """수금자 × 보너스율별 최종 인정 등급표."""
+        rate_columns = [f"보너스 {rate}%" for rate in self.bonus_rates]
+        if totals.empty:
+            return pd.DataFrame(columns=["수금자명", "기본합산환산", "월별필수조건"] + rate_columns)
+
+        base_total, monthly_ok = self.base_totals(totals)
+        matrix = pd.DataFrame({
+            "수금자명": totals["수금자명"].to_numpy(),
+            "기본합산환산": base_total,
+            "월별필수조건": _mark_array(monthly_ok),
+        })
+        for rate, column in zip(self.bonus_rates, rate_columns):
+            final_total = base_total + base_total * rate / 100
+            matrix[column] = np.where(
+                monthly_ok, self.grade_array(final_total), "필수조건 미충족"
+            ).astype(object)
+        return matrix
+
+    def next_grade_opportunities(
+        self,
+        totals: pd.DataFrame,
+        rate_table: RateTable,
+        term: int = 20,
+        bonus_rate: float = 0,
+    ) -> pd.DataFrame:
+        """모든 수금자의 다음 인정 등급까지 필요한 최소 추가 보험료를 한 번에 계산합니다.
+
+        추가 계약은 `term`년납이라고 보고 `rate_table`의 환산율을 씁니다. 한화생명 월 조건처럼
+        특정 보험사로만 채울 수 있는 부족분은 그 보험사 보험료로, 나머지 월 조건과 등급
+        부족분은 보험사 구분별로 계산합니다. 월별 필수조건을 못 채운 수금자는 조건만 채우면
+        인정되는 금액 기준 등급이 목표입니다(`next_target_positions`). 금액으로 최고 등급이어도
+        조건 부족분을 비용으로 남기고, 최고 등급이면서 조건도 모두 채운 수금자만 빠집니다.
+        """
+        rates = opportunity_rates(rate_table, term)
+        multiplier = 1 + bonus_rate / 100
+        base_total, monthly_ok = self.base_totals(totals)
+        final_total = base_total * multiplier
+
+        targets = np.asarray([target for _, target in reversed(self.grades)], dtype=float)
+        names = np.asarray([grade for grade, _ in reversed(self.grades)], dtype=object)
+        positions = np.searchsorted(targets, final_total, side="right")
+        next_index, has_next = next_target_positions(positions, monthly_ok, len(targets))
+
+        hanwha_amount = np.zeros(len(totals), dtype=float)
+        monthly_amount = np.zeros(len(totals), dtype=float)
+        for label in self.month_labels:
+            month_hanwha = np.zeros(len(totals), dtype=float)
+            for requirement in self.requirements:
+                if requirement.metric == "한화환산":
+                    current = totals[f"{label}한화환산"].to_numpy(dtype=float)
+                    month_hanwha = np.maximum(month_hanwha, requirement.minimum - current)
+            month_hanwha = np.maximum(month_hanwha, 0)
+            # 한화생명 추가분도 해당 월 환산금액에 더해집니다.
+            month_amount = totals[f"{label}환산"].to_numpy(dtype=float) + month_hanwha
+            month_other = np.zeros(len(totals), dtype=float)
+            for requirement in self.requirements:
+                if requirement.metric == "환산":
+                    month_other = np.maximum(month_other, requirement.minimum - month_amount)
+            hanwha_amount += month_hanwha
+            monthly_amount += np.maximum(month_other, 0)
+
+        grade_gap = np.maximum(targets[next_index] / multiplier - base_total, 0)
+        other_amount = np.maximum(grade_gap - hanwha_amount - monthly_amount, 0) + monthly_amount
+
+        table = pd.DataFrame({
+            "수금자명": totals["수금자명"].to_numpy(),
+            "현재환산": final_total,
+            "월별필수조건": _mark_array(monthly_ok),
+            "금액기준등급": self.grade_array(final_total),
+            "다음등급": names[next_index],
+            "다음등급기준": targets[next_index],
+            "부족환산": np.maximum(targets[next_index] - final_total, 0),
+        })
+        table = pd.concat([table, cheapest_premiums(hanwha_amount, other_amount, rates)], axis=1)
+        return rank_opportunities(table[has_next])
@@ -12,7 +12,9 @@ from difflib import SequenceMatcher
 from typing import Any
 
 import streamlit as st
+from .text_normalize import collapse_spaces, memoized_text, normalize_commission_text
 from .ui_components import page_header, section_intro
+from .xlsx_reader import XlsxReadError, read_rows, read_workbook
 import streamlit.components.v1 as components
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Alignment, Font, PatternFill
@@ -63,17 +65,9 @@ class HoldingContract:
     share_rate: float
 
 
-def _normalize(value: Any) -> str:
-    if value is None:
-        return ""
-    text = str(value).replace("計", "계")
-    return re.sub(r"[\s\n\r\t:()\[\]·ㆍ_-]+", "", text).lower()
-
-
-def _clean_text(value: Any) -> str:
-    if value is None:
-        return ""
-    return re.sub(r"\s+", " ", str(value)).strip()
+# 같은 상품명·조건 문구가 계약마다 반복되므로 공용 캐시 정규화를 사용합니다.
+_normalize = normalize_commission_text
+_clean_text = collapse_spaces
 
 
 def _number(value: Any) -> float | None:
@@ -256,8 +250,11 @@ def _extract_sheet(
         return results, warnings
 
     for table_index, (data_start, product_col, first_col, total_col) in enumerate(tables):
-        next_start = tables[table_index + 1][0] if table_index + 1 < len(tables) else formula_ws.max_row + 1
-        end_row = next_start - 2
+        if table_index + 1 < len(tables):
+            # 다음 표의 제목 행 바로 앞까지가 현재 표입니다.
+            end_row = tables[table_index + 1][0] - 2
+        else:
+            end_row = formula_ws.max_row
         current_product = ""
         inherited_conditions: dict[int, Any] = {}
         header_row = data_start - 1
@@ -318,25 +315,39 @@ def _extract_sheet(
     return results, warnings
 
 
+def _load_rate_sheets(file_bytes: bytes) -> tuple[dict[str, Any], dict[str, Any]]:
+    """수식 표와 저장된 계산값 표를 시트 이름별로 읽습니다.
+
+    서식만 넓게 남은 예시표도 빠르게 읽도록 xlsx XML을 직접 읽고,
+    구조를 해석하지 못한 파일만 openpyxl로 다시 읽습니다.
+    """
+    try:
+        return read_workbook(file_bytes, formulas=True), read_workbook(file_bytes)
+    except XlsxReadError:
+        formula_book = load_workbook(io.BytesIO(file_bytes), data_only=False, read_only=False)
+        value_book = load_workbook(io.BytesIO(file_bytes), data_only=True, read_only=False)
+        return (
+            {name: formula_book[name] for name in formula_book.sheetnames},
+            {name: value_book[name] for name in value_book.sheetnames},
+        )
+
+
 @st.cache_data(show_spinner=False)
 def parse_commission_workbook(file_bytes: bytes, source_type: str) -> tuple[list[dict], list[str]]:
     """예시표의 저장된 계산 결과를 읽습니다. 원본 파일은 변경하지 않습니다."""
-    formula_book = load_workbook(io.BytesIO(file_bytes), data_only=False, read_only=False)
-    value_book = load_workbook(io.BytesIO(file_bytes), data_only=True, read_only=False)
+    formula_sheets, value_sheets = _load_rate_sheets(file_bytes)
     products: list[dict] = []
     warnings: list[str] = []
 
-    for sheet_name in formula_book.sheetnames:
-        if "변경" in sheet_name or sheet_name not in value_book.sheetnames:
+    for sheet_name, formula_ws in formula_sheets.items():
+        if "변경" in sheet_name or sheet_name not in value_sheets:
             continue
         extracted, sheet_warnings = _extract_sheet(
-            formula_book[sheet_name], value_book[sheet_name], source_type
+            formula_ws, value_sheets[sheet_name], source_type
         )
         products.extend(item.__dict__ for item in extracted)
         warnings.extend(sheet_warnings)
 
-    formula_book.close()
-    value_book.close()
     return products, warnings
 
 
@@ -645,50 +656,60 @@ def _date_text(value: Any) -> str:
     return f"{year:04d}-{month:02d}-{day:02d}"
 
 
+# 보험회사는 별도 항목에서 먼저 일치시키므로 상품명 앞의 브랜드 표기는 비교에서 제외합니다.
+_BRAND_PREFIXES = tuple(sorted(
+    (
+        re.sub(r"[^0-9a-z가-힣]", "", token.lower())
+        for token in (
+            "kb라이프생명", "kb라이프", "kb손해보험", "kb손보", "kb",
+            "db손해보험", "db손보", "db생명", "db",
+            "nh농협생명", "nh농협손해보험", "농협생명", "농협손보", "nh",
+            "신한라이프", "신한", "한화생명", "한화손해보험", "한화손보", "한화",
+            "삼성생명", "삼성화재", "삼성", "흥국생명", "흥국화재", "흥국",
+            "미래에셋생명", "미래에셋", "메트라이프생명", "메트라이프",
+            "abl생명", "abl", "ibk연금", "ibk", "kdb생명", "kdb",
+            "교보생명", "교보", "라이나생명", "라이나", "카디프생명", "카디프",
+            "현대해상", "현대", "메리츠화재", "메리츠", "롯데손보", "롯데",
+            "하나손보", "하나생명", "하나", "aig손보", "aig", "mg손보", "mg",
+        )
+    ),
+    key=len,
+    reverse=True,
+))
+# 한 셀에 보험사명이 두 번 반복된 원본도 있어, 명확한 회사명만 추가 제거합니다.
+_REPEATED_BRANDS = (
+    "한화생명", "한화손해보험", "신한라이프", "미래에셋생명",
+    "메트라이프생명", "kb라이프생명", "db손해보험", "kb손해보험",
+)
+_NUMBERED_PAREN = re.compile(r"\(\s*\d+\s*\)")
+_REVISION_DATE = re.compile(r"\(?(?:20\d{2}|2\d)[.\-](?:0?[1-9]|1[0-2])\)?")
+_FORM_NUMBER = re.compile(r"(?<!\d)\d{1,2}형(?!\d)")
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]")
+
+
+@memoized_text("commission_product")
 def _holding_product_name(value: Any) -> str:
     text = _clean_text(value).lower()
-    text = re.sub(r"\(\s*\d+\s*\)", "", text)
+    text = _NUMBERED_PAREN.sub("", text)
     replacements = (
         "무배당", "(무)", "_무", "상품개정",
         "해약환급금", "해지환급금", "미지급형", "납입면제형",
     )
     for token in replacements:
         text = text.replace(token, "")
-    text = re.sub(r"\(?(?:20\d{2}|2\d)[.\-](?:0?[1-9]|1[0-2])\)?", "", text)
+    text = _REVISION_DATE.sub("", text)
     for token in (
         "간편가입", "간편심사형", "일반심사형", "보험가입금액형", "보험료형",
         "일부지급형", "저해약환급금형", "보증비용부과형", "간편",
     ):
         text = text.replace(token, "")
-    text = re.sub(r"(?<!\d)\d{1,2}형(?!\d)", "", text)
-    # 보험회사는 별도 항목에서 먼저 일치시키므로 상품명 앞의 브랜드 표기는 비교에서 제외합니다.
-    brand_prefixes = (
-        "kb라이프생명", "kb라이프", "kb손해보험", "kb손보", "kb",
-        "db손해보험", "db손보", "db생명", "db",
-        "nh농협생명", "nh농협손해보험", "농협생명", "농협손보", "nh",
-        "신한라이프", "신한", "한화생명", "한화손해보험", "한화손보", "한화",
-        "삼성생명", "삼성화재", "삼성", "흥국생명", "흥국화재", "흥국",
-        "미래에셋생명", "미래에셋", "메트라이프생명", "메트라이프",
-        "abl생명", "abl", "ibk연금", "ibk", "kdb생명", "kdb",
-        "교보생명", "교보", "라이나생명", "라이나", "카디프생명", "카디프",
-        "현대해상", "현대", "메리츠화재", "메리츠", "롯데손보", "롯데",
-        "하나손보", "하나생명", "하나", "aig손보", "aig", "mg손보", "mg",
-    )
-    normalized_prefixes = sorted(
-        (re.sub(r"[^0-9a-z가-힣]", "", token.lower()) for token in brand_prefixes),
-        key=len,
-        reverse=True,
-    )
-    compact = re.sub(r"[^0-9a-z가-힣]", "", text)
-    for prefix in normalized_prefixes:
+    text = _FORM_NUMBER.sub("", text)
+    compact = _NON_WORD.sub("", text)
+    for prefix in _BRAND_PREFIXES:
         if compact.startswith(prefix):
             compact = compact[len(prefix):]
             break
-    # 한 셀에 보험사명이 두 번 반복된 원본도 있어, 명확한 회사명만 추가 제거합니다.
-    for brand in (
-        "한화생명", "한화손해보험", "신한라이프", "미래에셋생명",
-        "메트라이프생명", "kb라이프생명", "db손해보험", "kb손해보험",
-    ):
+    for brand in _REPEATED_BRANDS:
         compact = compact.replace(brand, "")
     return compact
 
@@ -797,22 +818,39 @@ def _condition_option_label(
     )
 
 
+def _holding_rows(file_bytes: bytes) -> list[tuple]:
+    """첫 시트의 값을 행 튜플로 읽습니다. 튜플 순번이 엑셀 행 번호 - 1입니다."""
+    try:
+        return read_rows(file_bytes)
+    except XlsxReadError:
+        wb = load_workbook(io.BytesIO(file_bytes), data_only=True, read_only=False)
+        rows = list(wb[wb.sheetnames[0]].iter_rows(values_only=True))
+        wb.close()
+        return rows
+
+
 @st.cache_data(show_spinner=False)
 def parse_holding_workbook(file_bytes: bytes) -> list[dict]:
     """보유계약 장기 파일을 읽습니다. 잘못된 dimension=A1 파일도 처리합니다."""
-    wb = load_workbook(io.BytesIO(file_bytes), data_only=True, read_only=False)
-    ws = wb[wb.sheetnames[0]]
-    headers = {_normalize(cell.value): cell.column for cell in ws[1] if cell.value not in (None, "")}
+    rows = _holding_rows(file_bytes)
+    if not rows:
+        return []
+    headers = {
+        _normalize(cell): index
+        for index, cell in enumerate(rows[0])
+        if cell not in (None, "")
+    }
 
     def value(row: int, *names: str) -> Any:
+        values = rows[row - 1]
         for name in names:
-            col = headers.get(_normalize(name))
-            if col:
-                return ws.cell(row, col).value
+            index = headers.get(_normalize(name))
+            if index is not None:
+                return values[index] if index < len(values) else None
         return None
 
     results: list[dict] = []
-    for row in range(2, ws.max_row + 1):
+    for row in range(2, len(rows) + 1):
         policy_number = _clean_text(value(row, "증권번호"))
         product = _clean_text(value(row, "상품명"))
         insurer_raw = _clean_text(value(row, "보험사"))
@@ -846,7 +884,6 @@ def parse_holding_workbook(file_bytes: bytes) -> list[dict]:
             share_rate=share_rate,
         )
         results.append(holding.__dict__)
-    wb.close()
     return results
 
 
@@ -1066,23 +1103,24 @@ def _product_categories(value: Any) -> set[str]:
     }
 
 
+# 괄호 속 YY.MM, YYYY.MM, YYMM.회차 형태는 대부분 개정 표기입니다.
+_PAREN_REVISION = re.compile(r"\(\s*(?:20)?\d{2}[.\-/](?:0?[1-9]|1[0-2])(?:[.\-/]\d+)?\s*\)")
+# 상품명 끝 또는 보험/plus 바로 뒤의 2404·2607 형식만 개정월로 봅니다.
+_SUFFIX_REVISION = re.compile(
+    r"(보험|plus)\s*(?:20)?(?:2[4-9]|3\d)(?:0[1-9]|1[0-2])(?=\s|_|$|\()", re.I
+)
+_TRAILING_REVISION = re.compile(r"(?<!\d)(?:20)?(?:2[4-9]|3\d)(?:0[1-9]|1[0-2])(?=\s|_|$)")
+
+
 def _strip_revision_markers(value: Any) -> str:
     """상품 개정월은 약하게 처리하고 3.10.5·3N5·0545 같은 핵심 숫자는 보존합니다."""
     text = _clean_text(value).lower()
-    # 괄호 속 YY.MM, YYYY.MM, YYMM.회차 형태는 대부분 개정 표기입니다.
-    text = re.sub(r"\(\s*(?:20)?\d{2}[.\-/](?:0?[1-9]|1[0-2])(?:[.\-/]\d+)?\s*\)", " ", text)
-    # 상품명 끝 또는 보험/plus 바로 뒤의 2404·2607 형식만 개정월로 봅니다.
-    text = re.sub(
-        r"(보험|plus)\s*(?:20)?(?:2[4-9]|3\d)(?:0[1-9]|1[0-2])(?=\s|_|$|\()",
-        r"\1 ", text, flags=re.I,
-    )
-    text = re.sub(
-        r"(?<!\d)(?:20)?(?:2[4-9]|3\d)(?:0[1-9]|1[0-2])(?=\s|_|$)",
-        " ", text,
-    )
-    return text
+    text = _PAREN_REVISION.sub(" ", text)
+    text = _SUFFIX_REVISION.sub(r"\1 ", text)
+    return _TRAILING_REVISION.sub(" ", text)
 
 
+@memoized_text("commission_smart_product")
 def _smart_product_name(value: Any) -> str:
     return _holding_product_name(_strip_revision_markers(value))
 
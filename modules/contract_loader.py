@@ -0,0 +1,134 @@
+"""썸머·컨벤션 계산이 함께 쓰는 보유계약 엑셀 불러오기.
+
+보유계약 장기 내보내기 파일에는 계산에 쓰지 않는 열이 수십 개 있으므로 열 제목만 먼저 읽고,
+`COLUMN_ALIASES`로 필요한 열의 원본 제목을 찾은 뒤 그 열만 읽습니다.
+수금자명·보험사·상품군2·계약상태처럼 값 종류가 적은 열은 범주형으로 바꿔 메모리와
+묶음 계산 비용을 줄이고, 읽은 결과는 파일 내용 해시를 키로 보관해 화면을 다시 그릴 때
+같은 파일을 다시 읽지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from .frame_memory import compact_frame
+from .xlsx_reader import XlsxReadError, read_frame, read_header
+
+CONTRACT_COLUMNS = (
+    "수금자명",
+    "계약일자",
+    "보험사",
+    "상품명",
+    "납입기간",
+    "보험료",
+    "쉐어율",
+    "납입방법",
+    "상품군2",
+    "계약상태",
+)
+
+# 표준 열 이름 → 같은 뜻으로 쓰는 원본 열 이름. 표준 이름이 없을 때만 별칭을 씁니다.
+COLUMN_ALIASES = {
+    "계약일자": ("계약일",),
+    "보험료": ("초회보험료",),
+}
+
+# 값 종류가 적은 열. 나머지 열은 검토 표에 원본 값을 그대로 보여 주도록 읽은 형식을 유지합니다.
+CATEGORY_COLUMNS = ("수금자명", "보험사", "상품군2", "계약상태")
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """별칭 열 이름을 표준 이름으로 바꾼 새 DataFrame. 값은 복사하지 않습니다(copy-on-write)."""
+    renames = {}
+
+    for canonical, aliases in COLUMN_ALIASES.items():
+        if canonical in df.columns:
+            continue
+
+        for alias in aliases:
+            if alias in df.columns:
+                renames[alias] = canonical
+                break
+
+    return df.rename(columns=renames)
+
+
+def resolve_columns(header) -> dict[str, str]:
+    """
+    원본 열 제목 → 표준 열 이름. `CONTRACT_COLUMNS` 중 파일에 있는 열만 담습니다.
+    제목 앞뒤 공백은 무시하고, 같은 제목이 여러 번 있으면 앞 열을 씁니다.
+    """
+    stripped = {}
+
+    for value in header:
+        if value is None:
+            continue
+        stripped.setdefault(str(value).strip(), str(value))
+
+    resolved = {}
+
+    for canonical in CONTRACT_COLUMNS:
+        for name in (canonical, *COLUMN_ALIASES.get(canonical, ())):
+            if name in stripped:
+                resolved[stripped[name]] = canonical
+                break
+
+    return resolved
+
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    return compact_frame(df, categories=CATEGORY_COLUMNS)
+
+
+def plain_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """범주형 열을 일반 열로 바꾼 복사본. 직접 고치는 표에 넘길 때 씁니다."""
+    df = df.copy()
+
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+
+    return df
+
+
+def _read_projected(file_bytes: bytes) -> pd.DataFrame:
+    try:
+        resolved = resolve_columns(read_header(file_bytes))
+        fast = True
+    except XlsxReadError:
+        resolved = resolve_columns(pd.read_excel(BytesIO(file_bytes), nrows=0).columns)
+        fast = False
+
+    if not resolved:
+        return pd.DataFrame()
+
+    if fast:
+        df = read_frame(file_bytes, usecols=list(resolved))
+    else:
+        df = pd.read_excel(BytesIO(file_bytes), usecols=list(resolved))
+
+    return df.rename(columns=resolved)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_contracts(digest: str, _file_bytes: bytes) -> pd.DataFrame:
+    return apply_dtypes(_read_projected(_file_bytes))
+
+
+def load_contracts(file_bytes: bytes) -> pd.DataFrame:
+    """
+    업로드한 보유계약 엑셀에서 `CONTRACT_COLUMNS`만 표준 이름으로 읽습니다.
+    없는 열은 빠진 채로 돌려주므로 필수 항목 확인은 호출하는 쪽에서 합니다.
+    """
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return _load_contracts(digest, file_bytes)
@@ -0,0 +1,158 @@
+"""여러 계약 엑셀 업로드를 하나로 합치고 같은 계약을 한 번만 남기는 도우미.
+
+- 파일별로 읽은 표(범주형 열 포함)를 `pd.concat` 한 번으로 이어 붙입니다. 범주형 열은 먼저
+  파일들의 범주를 합쳐 맞춰 두므로 글자 열로 풀리지 않고 범주형 그대로 붙습니다.
+- 같은 계약 행은 증권번호·계약일·수금자명 값을 64비트 해시로 바꾼 색인으로 찾습니다. 공동계약은
+  같은 증권번호·계약일로 수금자마다 한 행씩 있으므로 수금자명까지 같아야 같은 행입니다.
+- 한 파일 안의 행은 지우지 않습니다. 월별·팀별 내보내기가 겹쳐 여러 파일에 같은 행이 있으면
+  나중에 올린 파일의 행을 남깁니다(계약상태 등이 더 최근 값).
+  증권번호나 계약일이 비어 있는 행은 같은 계약인지 알 수 없으므로 모두 남깁니다.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+SOURCE_COLUMN = "_파일"
+ROW_COLUMN = "_원본행번호"
+DEDUPE_KEYS = ("증권번호", "계약일", "수금자명")
+
+
+def unique_labels(names: Sequence[str]) -> list[str]:
+    """파일 이름이 겹치면 뒤에 (2), (3)…을 붙입니다."""
+    seen: dict[str, int] = {}
+    labels = []
+
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        labels.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+
+    return labels
+
+
+def _aligned_categories(frames: Sequence[pd.DataFrame]) -> list[pd.DataFrame]:
+    """모든 파일에서 범주형인 열은 범주 목록을 합친 같은 범주로 맞춥니다."""
+    columns = [
+        column
+        for column in frames[0].columns
+        if all(
+            column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype)
+            for frame in frames
+        )
+    ]
+
+    if len(frames) < 2 or not columns:
+        return list(frames)
+
+    merged = {}
+    for column in columns:
+        categories = frames[0][column].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[column].cat.categories)
+        merged[column] = categories
+
+    return [
+        frame.assign(**{column: frame[column].cat.set_categories(merged[column]) for column in columns})
+        for frame in frames
+    ]
+
+
+def concat_uploads(frames: Sequence[pd.DataFrame], names: Sequence[str]) -> pd.DataFrame:
+    """
+    파일별 표를 이어 붙이고 `_파일`(파일 이름, 범주형)과 `_원본행번호`(그 파일의 엑셀 행 번호) 열을 더합니다.
+    """
+    labels = unique_labels(names)
+    tagged = [
+        frame.assign(**{ROW_COLUMN: frame.index + 2})
+        for frame in _aligned_categories(frames)
+    ]
+
+    merged = pd.concat(tagged, ignore_index=True)
+    merged[SOURCE_COLUMN] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(frames)), [len(frame) for frame in frames]),
+        categories=labels,
+    )
+    return merged
+
+
+def dedupe_keys(df: pd.DataFrame, keys: Sequence[str] = DEDUPE_KEYS) -> pd.Series:
+    """
+    계약 행 식별 해시(uint64). 증권번호는 앞뒤 공백과 숫자로 읽힌 끝의 '.0'을 지우고,
+    계약일은 날짜만 비교합니다. 세 번째 키부터(수금자명)는 앞뒤 공백만 지워 비교합니다.
+    증권번호나 계약일이 비어 있으면 NA입니다.
+
+    글자 열은 `pd.factorize` 해시 테이블로 한 번만 정수 번호로 바꾸고, 그 번호와 날짜를
+    묶어 해시합니다. 글자를 행마다 다시 해시하는 것보다 빠릅니다.
+    """
+    policy = df[keys[0]].astype("string").str.strip().str.removesuffix(".0")
+    codes, _ = pd.factorize(policy.mask(policy.eq("")))
+    day = pd.to_datetime(df[keys[1]], errors="coerce").dt.normalize()
+    parts = {"policy": codes, "day": day}
+
+    for column in keys[2:]:
+        parts[column], _ = pd.factorize(df[column].astype("string").str.strip())
+
+    hashed = pd.util.hash_pandas_object(pd.DataFrame(parts), index=False)
+    return hashed.astype("UInt64").mask((codes < 0) | day.isna().to_numpy())
+
+
+def duplicate_mask(df: pd.DataFrame, keys: Sequence[str] = DEDUPE_KEYS) -> pd.Series:
+    """
+    같은 계약 행이 뒤에 올린 파일에 다시 나오는 앞쪽 파일의 행이 True입니다. 같은 파일 안에서
+    겹치는 행은 지우지 않습니다. 키 열이 없으면 모두 False입니다.
+    """
+    if not set(keys).issubset(df.columns):
+        return pd.Series(False, index=df.index)
+
+    hashed = dedupe_keys(df, keys)
+    if SOURCE_COLUMN in df.columns:
+        source = pd.Series(df[SOURCE_COLUMN].cat.codes, index=df.index)
+    else:
+        source = pd.Series(0, index=df.index)
+
+    # 키마다 그 키가 나오는 마지막 파일 번호. 키가 NA인 행은 NaN이라 비교가 False입니다.
+    last_source = source.groupby(hashed, dropna=True).transform("max")
+    return source.lt(last_source)
+
+
+def merge_uploads(
+    frames: Sequence[pd.DataFrame],
+    names: Sequence[str],
+    keys: Sequence[str] = DEDUPE_KEYS,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(중복을 뺀 합친 표, 빠진 중복 행). 합친 표의 행 순서는 파일 순서·파일 안 행 순서입니다."""
+    merged = concat_uploads(frames, names)
+    duplicated = duplicate_mask(merged, keys)
+
+    if not duplicated.any():
+        return merged, merged.iloc[:0]
+
+    return merged[~duplicated].reset_index(drop=True), merged[duplicated]
+
+
+def upload_scope(merged: pd.DataFrame, duplicates: pd.DataFrame, date_column: str = "계약일") -> pd.DataFrame:
+    """파일별 남은 계약 수·뺀 중복 수·계약일 범위·수금자 수와 합계 행."""
+    dates = pd.to_datetime(merged[date_column], errors="coerce")
+    by_source = merged.groupby(SOURCE_COLUMN, observed=False)
+
+    scope = pd.DataFrame({
+        "계약 수": by_source.size(),
+        "중복 제외": duplicates[SOURCE_COLUMN].value_counts().reindex(merged[SOURCE_COLUMN].cat.categories, fill_value=0),
+        "계약일 시작": dates.groupby(merged[SOURCE_COLUMN], observed=False).min(),
+        "계약일 끝": dates.groupby(merged[SOURCE_COLUMN], observed=False).max(),
+        "수금자 수": by_source["수금자명"].nunique(),
+    })
+    scope.index = scope.index.astype(str)
+
+    total = pd.DataFrame({
+        "계약 수": [len(merged)],
+        "중복 제외": [len(duplicates)],
+        "계약일 시작": [dates.min()],
+        "계약일 끝": [dates.max()],
+        "수금자 수": [merged["수금자명"].nunique()],
+    }, index=["합계"])
+
+    return pd.concat([scope, total]).rename_axis("파일").reset_index()
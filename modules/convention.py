@@ -2,15 +2,41 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
-import re
 import hashlib
-from io import BytesIO
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.worksheet.table import Table, TableStyleInfo
 from .ui_components import page_header, section_intro
+from .rate_engine import (
+    HANWHA_LIFE,
+    OTHER_LIFE,
+    OTHER_NONLIFE,
+    SPECIAL_NONLIFE,
+    RateTable,
+    classify_insurers,
+    insurer_class_masks,
+)
+from .campaign import cheapest_premiums, next_target_positions, opportunity_rates, rank_opportunities
+from .issue_flags import IssueFlags
+from .contract_loader import CONTRACT_COLUMNS, load_contracts, plain_columns, standardize_columns
+from .frame_memory import assign_values, compact_frame, render_memory_report
+from .exclusion import exclusion_masks, exclusion_reasons, split_excluded
+from .download_cache import XLSX_MIME, deferred_workbook, frame_digest
+from .excel_writer import (
+    WorkbookWriter,
+    column_widths,
+    merge_widths,
+    rows_widths,
+    split_rows,
+    table_widths,
+)
+from .table_format import (
+    PERCENT,
+    PLAIN_COUNT,
+    WON,
+    YEARS,
+    date_column,
+    number_column,
+    opportunity_column_config,
+)
 
 
 # ── 컨벤션 기준 ──────────────────────────────────────────────
@@ -30,7 +56,14 @@ CONVENTION_LEVELS = [
     ("일반 달성", CONVENTION_GENERAL_TARGET),
 ]
 
-TABLE_SEQ = 0
+# 컨벤션 환산율(%) — 위에서부터 처음 맞는 규칙을 적용합니다.
+CONVENTION_RATE_TABLE = RateTable.from_records("컨벤션", [
+    {"insurers": [HANWHA_LIFE], "rate": 150},
+    {"insurers": [SPECIAL_NONLIFE], "rate": 300},
+    {"insurers": [OTHER_NONLIFE], "rate": 200},
+    {"insurers": [OTHER_LIFE], "rate": 50, "max_term": 10},
+    {"insurers": [OTHER_LIFE], "rate": 100, "min_term": 10},
+])
 
 
 # ── 기본 유틸 ────────────────────────────────────────────────
@@ -38,6 +71,10 @@ def mark(ok: bool) -> str:
     return "✅" if ok else "❌"
 
 
+def mark_array(ok) -> np.ndarray:
+    return np.where(np.asarray(ok, dtype=bool), mark(True), mark(False)).astype(object)
+
+
 def won(x) -> str:
     try:
         return f"{float(x):,.0f} 원"
@@ -52,208 +89,49 @@ def pct(x) -> str:
         return ""
 
 
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = [str(c).strip() for c in df.columns]
-    return df
-
-
-def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
-    if "계약일" in df.columns and "계약일자" not in df.columns:
-        df.rename(columns={"계약일": "계약일자"}, inplace=True)
-
-    if "초회보험료" in df.columns and "보험료" not in df.columns:
-        df.rename(columns={"초회보험료": "보험료"}, inplace=True)
-
-    return df
-
-
-def safe_table_name(base: str) -> str:
-    name = re.sub(r"[^A-Za-z0-9_]", "_", str(base))
-
-    if not re.match(r"^[A-Za-z_]", name):
-        name = f"tbl_{name}"
-
-    return name[:254]
-
-
-def unique_sheet_name(wb, base, limit=31):
-    name = str(base)[:limit] if base else "Sheet"
-
-    if name not in wb.sheetnames:
-        return name
-
-    i = 2
-    while True:
-        suffix = f"_{i}"
-        trunc = limit - len(suffix)
-        cand = f"{name[:trunc]}{suffix}"
-
-        if cand not in wb.sheetnames:
-            return cand
-
-        i += 1
-
-
-def autosize_columns_full(ws, padding=5):
-    for column_cells in ws.columns:
-        max_len = max(
-            len(str(cell.value)) if cell.value is not None else 0
-            for cell in column_cells
-        )
-        ws.column_dimensions[column_cells[0].column_letter].width = max_len + padding
-
-
 # ── 보험사 분류 ───────────────────────────────────────────────
+# 분류 기준은 rate_engine.insurer_class_masks 한 곳에서 관리합니다.
 def is_hanwha_life_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("한화", na=False)
-        & ins.str.contains("생명", na=False)
-    )
-
-
-def is_db_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("DB", case=False, na=False)
-        & (
-            ins.str.contains("손", na=False)
-            | ins.str.contains("화재", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-    )
-
-
-def is_kb_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("KB", case=False, na=False)
-        & (
-            ins.str.contains("손", na=False)
-            | ins.str.contains("화재", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-    )
-
-
-def is_hanwha_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("한화", na=False)
-        & (
-            ins.str.contains("손", na=False)
-            | ins.str.contains("화재", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-        & ~is_hanwha_life_series(ins)
-    )
-
-
-def is_heungkuk_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("흥국", na=False)
-        & (
-            ins.str.contains("화재", na=False)
-            | ins.str.contains("손", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-    )
+    return insurer_class_masks(ins)[HANWHA_LIFE]
 
 
 def is_special_nonlife_series(ins: pd.Series) -> pd.Series:
     """
-    컨벤션 우대 손해보험사:
+    우대 손해보험사:
     흥국화재, KB손해, 한화손해, DB손해
     """
-    return (
-        is_db_nonlife_series(ins)
-        | is_kb_nonlife_series(ins)
-        | is_hanwha_nonlife_series(ins)
-        | is_heungkuk_nonlife_series(ins)
-    )
+    return insurer_class_masks(ins)[SPECIAL_NONLIFE]
 
 
 def is_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("손해|손보|화재|해상", regex=True, na=False)
-        | is_special_nonlife_series(ins)
-    )
-
-
-def is_life_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("생명", na=False)
-        | ins.str.contains("라이프", na=False)
-    )
+    masks = insurer_class_masks(ins)
+    return masks[SPECIAL_NONLIFE] | masks[OTHER_NONLIFE]
 
 
 def is_other_life_series(ins: pd.Series) -> pd.Series:
-    return is_life_series(ins) & ~is_hanwha_life_series(ins)
+    return insurer_class_masks(ins)[OTHER_LIFE]
 
 
 # ── 데이터 준비 ──────────────────────────────────────────────
-def load_df(uploaded_file) -> pd.DataFrame:
-    df = pd.read_excel(uploaded_file)
-    df = normalize_columns(df)
-    df = standardize_columns(df)
-    return df
-
-
 def exclude_contracts(df: pd.DataFrame):
     """
     제외 조건:
     - 일시납
     - 연금성 / 저축성
     - 철회 / 해약 / 실효
-    """
-    excluded_df = pd.DataFrame()
-
-    needed = {"납입방법", "상품군2", "계약상태"}
-
-    if needed.issubset(df.columns):
-        tmp = df.copy()
-
-        tmp["납입방법"] = tmp["납입방법"].astype(str).str.strip()
-        tmp["상품군2"] = tmp["상품군2"].astype(str).str.strip()
-        tmp["계약상태"] = tmp["계약상태"].astype(str).str.strip()
-
-        is_lumpsum = tmp["납입방법"].str.contains("일시납", na=False)
-        is_savings = tmp["상품군2"].str.contains("연금성|저축성", regex=True, na=False)
-        is_cancelled = tmp["계약상태"].str.contains("철회|해약|실효", regex=True, na=False)
-
-        is_excluded = is_lumpsum | is_savings | is_cancelled
-
-        excluded_df = tmp[is_excluded].copy()
-        df_valid = tmp[~is_excluded].copy()
-
-        return df_valid, excluded_df
 
-    return df.copy(), excluded_df
+    (유효 계약, 제외 계약, 제외 계약의 사유별 마스크)를 반환합니다.
+    """
+    return split_excluded(df)
 
 
 def find_data_issues(df: pd.DataFrame, require_valid_date: bool = False):
     """환산 계산 보류 사유와 쉐어율 조건 확인 사유를 행별로 반환합니다."""
-    blocking = pd.Series("", index=df.index, dtype="object")
-    condition = pd.Series("", index=df.index, dtype="object")
+    blocking = IssueFlags(df.index)
+    condition = IssueFlags(df.index)
 
     def add_issue(target, mask, message):
-        mask = pd.Series(mask, index=df.index).fillna(False)
-        target.loc[mask] = target.loc[mask].apply(
-            lambda current: f"{current} / {message}" if current else message
-        )
+        target.add(mask, message)
 
     def blank_mask(column):
         text = df[column].astype("string").str.strip().str.lower()
@@ -282,7 +160,7 @@ def find_data_issues(df: pd.DataFrame, require_valid_date: bool = False):
         "쉐어율 확인 필요",
     )
 
-    return blocking, condition, share_numeric
+    return blocking.reasons(), condition.reasons(), share_numeric
 
 
 def build_review_display(review_df: pd.DataFrame) -> pd.DataFrame:
@@ -309,7 +187,9 @@ def build_review_display(review_df: pd.DataFrame) -> pd.DataFrame:
     return out[columns]
 
 
-def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
+def build_excluded_with_reason(
+    exdf: pd.DataFrame, reason_masks: pd.DataFrame | None = None
+) -> pd.DataFrame:
     base_cols = [
         "수금자명",
         "계약일자",
@@ -327,27 +207,9 @@ def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
 
     tmp = standardize_columns(exdf.copy())
 
-    def reason_row(row):
-        reasons = []
-
-        if "일시납" in str(row.get("납입방법", "")):
-            reasons.append("일시납")
-
-        product_group = str(row.get("상품군2", ""))
-        if "연금성" in product_group or "저축성" in product_group:
-            reasons.append("연금/저축성")
-
-        status = str(row.get("계약상태", ""))
-        if "철회" in status:
-            reasons.append("철회")
-        if "해약" in status:
-            reasons.append("해약")
-        if "실효" in status:
-            reasons.append("실효")
-
-        return " / ".join(reasons) if reasons else "제외 조건 미상"
-
-    tmp["제외사유"] = tmp.apply(reason_row, axis=1)
+    if reason_masks is None:
+        reason_masks = exclusion_masks(tmp)
+    tmp["제외사유"] = exclusion_reasons(reason_masks.reindex(tmp.index, fill_value=False))
 
     for col in base_cols:
         if col not in tmp.columns:
@@ -367,25 +229,17 @@ def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
 
 
 def check_required_columns(df: pd.DataFrame):
-    required_columns = {
-        "수금자명",
-        "계약일자",
-        "보험사",
-        "상품명",
-        "납입기간",
-        "보험료",
-        "쉐어율",
-        "납입방법",
-        "상품군2",
-        "계약상태",
-    }
-
-    return required_columns - set(df.columns)
+    return set(CONTRACT_COLUMNS) - set(df.columns)
 
 
 # ── 컨벤션 계산 ──────────────────────────────────────────────
+# 계산 결과를 범주형·작은 정수형으로 줄일 열 (frame_memory)
+COMPACT_CATEGORIES = ("수금자명", "보험사", "상품명", "납입방법", "상품군2", "계약상태")
+COMPACT_INTEGERS = ("_원본행번호", "납입기간_num", "컨벤션율")
+
+
 def compute_convention(df: pd.DataFrame) -> pd.DataFrame:
-    df = standardize_columns(df.copy())
+    df = standardize_columns(df)
 
     df["계약일자_raw"] = pd.to_datetime(df["계약일자"], errors="coerce")
     df["보험료"] = pd.to_numeric(df["보험료"], errors="coerce").fillna(0)
@@ -409,44 +263,21 @@ def compute_convention(df: pd.DataFrame) -> pd.DataFrame:
     df["쉐어율미입력"] = df["쉐어율"].isna()
     df["쉐어건수"] = (df["쉐어율"].clip(lower=0, upper=100) / 100).fillna(0)
 
-    ins = df["보험사"].astype(str).str.strip()
-    term = df["납입기간_num"]
-
-    is_hanwha_life = is_hanwha_life_series(ins)
-    is_special_nonlife = is_special_nonlife_series(ins)
-    is_nonlife = is_nonlife_series(ins)
-    is_other_nonlife = is_nonlife & ~is_special_nonlife
-    is_other_life = is_other_life_series(ins)
-
     # ✅ 컨벤션 환산율
     # 1. 한화생명: 납입기간 상관없이 150%
     # 2. 흥국화재, KB손해, 한화손해, DB손해: 300%
     # 3. 그 외 손해보험: 200%
     # 4. 그 외 생명보험 10년납 미만: 50%
     # 5. 그 외 생명보험 10년납 이상: 100%
-    df["컨벤션율"] = np.select(
-        [
-            is_hanwha_life,
-            is_special_nonlife,
-            is_other_nonlife,
-            is_other_life & (term < 10),
-            is_other_life & (term >= 10),
-        ],
-        [
-            150,
-            300,
-            200,
-            50,
-            100,
-        ],
-        default=0,
-    ).astype(int)
+    df["컨벤션율"] = CONVENTION_RATE_TABLE.apply(
+        classify_insurers(df["보험사"]), df["납입기간_num"]
+    )
 
     # 현재 기준: 보험료가 이미 쉐어율 반영된 값이라고 보고 그대로 사용
     df["실적보험료"] = df["보험료"]
     df["컨벤션환산금액"] = df["실적보험료"] * df["컨벤션율"] / 100
 
-    return df
+    return compact_frame(df, categories=COMPACT_CATEGORIES, integers=COMPACT_INTEGERS)
 
 
 def get_amount_level(conv_sum: float) -> str:
@@ -461,6 +292,14 @@ def get_amount_level(conv_sum: float) -> str:
     return "미달성"
 
 
+def convention_level_array(conv_sums) -> np.ndarray:
+    """`get_amount_level`을 금액 배열 전체에 한 번에 적용합니다."""
+    names = ["미달성"] + [level_name for level_name, _ in reversed(CONVENTION_LEVELS)]
+    targets = [target for _, target in reversed(CONVENTION_LEVELS)]
+    positions = np.searchsorted(targets, np.asarray(conv_sums, dtype=float), side="right")
+    return np.asarray(names, dtype=object)[positions]
+
+
 def get_final_level(conv_sum: float, count_ok: bool, hanwha_ok: bool) -> str:
     """
     최종 달성등급.
@@ -547,12 +386,50 @@ def check_convention_requirements(dfin: pd.DataFrame):
 
 
 # ── 화면 표시 ────────────────────────────────────────────────
+DETAIL_COLUMNS = [
+    "수금자명",
+    "계약일자",
+    "보험사",
+    "상품명",
+    "납입기간",
+    "보험료",
+    "쉐어율",
+    "쉐어건수",
+    "실적보험료",
+    "컨벤션율",
+    "컨벤션환산금액",
+]
+
+# 상세 표 숫자 열 서식. 화면은 숫자 그대로 두고 브라우저에서 단위를 붙입니다.
+DETAIL_COLUMN_CONFIG = {
+    "계약일자": date_column(),
+    "납입기간": number_column(YEARS),
+    "보험료": number_column(WON),
+    "쉐어율": number_column(PERCENT, help="빈 칸은 쉐어율 미입력 계약입니다."),
+    "쉐어건수": number_column(PLAIN_COUNT),
+    "실적보험료": number_column(WON),
+    "컨벤션율": number_column(PERCENT),
+    "컨벤션환산금액": number_column(WON),
+}
+
+
+def display_table(dfin: pd.DataFrame) -> pd.DataFrame:
+    """상세 표. 열 순서만 화면용으로 맞추고 값은 숫자·날짜 그대로 둡니다."""
+    df = dfin.copy(deep=False)
+
+    df["계약일자"] = pd.to_datetime(df["계약일자"], errors="coerce")
+    df["납입기간"] = pd.to_numeric(df["납입기간"], errors="coerce")
+
+    return df[[c for c in DETAIL_COLUMNS if c in df.columns]]
+
+
 def to_styled(dfin: pd.DataFrame) -> pd.DataFrame:
-    df = dfin.copy()
+    """엑셀 다운로드용 상세 표. `display_table` 값을 원·%·년 글자로 바꿉니다."""
+    df = display_table(dfin)
 
-    df["계약일자"] = pd.to_datetime(df["계약일자"], errors="coerce").dt.strftime("%Y-%m-%d")
+    df["계약일자"] = df["계약일자"].dt.strftime("%Y-%m-%d")
 
-    df["납입기간"] = pd.to_numeric(df["납입기간"], errors="coerce").apply(
+    df["납입기간"] = df["납입기간"].apply(
         lambda x: f"{int(x)}년" if pd.notnull(x) else ""
     )
 
@@ -567,21 +444,7 @@ def to_styled(dfin: pd.DataFrame) -> pd.DataFrame:
     df["컨벤션율"] = df["컨벤션율"].map(pct)
     df["컨벤션환산금액"] = df["컨벤션환산금액"].map(won)
 
-    cols = [
-        "수금자명",
-        "계약일자",
-        "보험사",
-        "상품명",
-        "납입기간",
-        "보험료",
-        "쉐어율",
-        "쉐어건수",
-        "실적보험료",
-        "컨벤션율",
-        "컨벤션환산금액",
-    ]
-
-    return df[[c for c in cols if c in df.columns]]
+    return df
 
 
 def money_box(title, value, color="#1f77b4"):
@@ -657,29 +520,7 @@ def req_box(title, ok):
 
 
 def make_group(df: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-
-    for collector, sub in df.groupby("수금자명", dropna=False):
-        req = check_convention_requirements(sub)
-
-        rows.append({
-            "수금자명": collector,
-            "건수": req["인정건수"],
-            "쉐어율미입력": req["쉐어율미입력건수"],
-            "실적보험료합계": sub["실적보험료"].sum(),
-            "컨벤션환산합계": sub["컨벤션환산금액"].sum(),
-            "달성등급": req["달성등급"],
-            "필수조건": mark(req["필수조건"]),
-            "일반": mark(req["일반달성"]),
-            "더블": mark(req["더블달성"]),
-            "트리플": mark(req["트리플달성"]),
-            "5건": mark(req["건수5건"]),
-            "한화생명5만": mark(req["한화생명5만"]),
-        })
-
-    group = pd.DataFrame(rows)
-
-    if group.empty:
+    if df.empty:
         return pd.DataFrame(columns=[
             "수금자명",
             "건수",
@@ -695,9 +536,97 @@ def make_group(df: pd.DataFrame) -> pd.DataFrame:
             "한화생명5만",
         ])
 
+    # 수금자별 한 번의 집계로 `check_convention_requirements`와 같은 값을 구합니다.
+    share_count = pd.to_numeric(df["쉐어건수"], errors="coerce").fillna(0).astype(float)
+    hanwha_mask = (
+        is_hanwha_life_series(df["보험사"])
+        & (
+            pd.to_numeric(df["보험료"], errors="coerce").fillna(0)
+            >= CONVENTION_HANWHA_MIN_PREMIUM
+        )
+    )
+    frame = pd.DataFrame({
+        "수금자명": df["수금자명"],
+        "건수": share_count,
+        "쉐어율미입력": df["쉐어율미입력"].astype(bool),
+        "실적보험료합계": df["실적보험료"],
+        "컨벤션환산합계": df["컨벤션환산금액"],
+        "한화생명건수": share_count.where(hanwha_mask, 0.0),
+    })
+    group = frame.groupby("수금자명", dropna=False, observed=True).sum().reset_index()
+    group["쉐어율미입력"] = group["쉐어율미입력"].astype(int)
+
+    conv_sum = group["컨벤션환산합계"].to_numpy(dtype=float)
+    count_ok = group["건수"].to_numpy(dtype=float) >= CONVENTION_MIN_COUNT
+    hanwha_ok = group.pop("한화생명건수").to_numpy(dtype=float) >= 1.0
+    required_ok = count_ok & hanwha_ok
+
+    group["달성등급"] = np.where(
+        required_ok,
+        convention_level_array(conv_sum),
+        np.where(conv_sum >= CONVENTION_GENERAL_TARGET, "필수조건 미충족", "미달성"),
+    ).astype(object)
+    group["필수조건"] = mark_array(required_ok)
+    group["일반"] = mark_array(required_ok & (conv_sum >= CONVENTION_GENERAL_TARGET))
+    group["더블"] = mark_array(required_ok & (conv_sum >= CONVENTION_DOUBLE_TARGET))
+    group["트리플"] = mark_array(required_ok & (conv_sum >= CONVENTION_TRIPLE_TARGET))
+    group["5건"] = mark_array(count_ok)
+    group["한화생명5만"] = mark_array(hanwha_ok)
+
     return group
 
 
+def make_level_opportunities(group: pd.DataFrame, term: int = 20) -> pd.DataFrame:
+    """모든 수금자의 다음 달성 단계까지 필요한 최소 추가 보험료(`make_group` 결과 기준).
+
+    한화생명 5만 원 이상 계약이 없으면 한화생명 5만 원을 먼저 더하고, 남은 환산금액
+    부족분은 `term`년납 신규 계약의 보험사 구분별 환산율로 나눠 계산합니다.
+    5건 조건은 보험료로 채울 수 없으므로 추가필요건수로 따로 보여 줍니다.
+    필수조건을 못 채운 수금자는 조건만 채우면 인정되는 금액 기준 단계가 목표이므로, 금액으로
+    최고 단계여도 한화생명·건수 부족분이 남은 행으로 남고, 최고 단계이면서 필수조건도 채운 수금자만 빠집니다.
+    """
+    if group.empty:
+        return rank_opportunities(pd.DataFrame(columns=["수금자명", "최소추가보험료"]))
+
+    rates = opportunity_rates(CONVENTION_RATE_TABLE, term)
+    conv_sum = group["컨벤션환산합계"].to_numpy(dtype=float)
+    hanwha_ok = group["한화생명5만"].eq(mark(True)).to_numpy()
+    counts = group["건수"].to_numpy(dtype=float)
+
+    targets = np.asarray([target for _, target in reversed(CONVENTION_LEVELS)], dtype=float)
+    names = np.asarray([level_name for level_name, _ in reversed(CONVENTION_LEVELS)], dtype=object)
+    positions = np.searchsorted(targets, conv_sum, side="right")
+    required_ok = hanwha_ok & (counts >= CONVENTION_MIN_COUNT)
+    next_index, has_next = next_target_positions(positions, required_ok, len(targets))
+
+    hanwha_amount = np.where(
+        hanwha_ok, 0.0, CONVENTION_HANWHA_MIN_PREMIUM * rates["한화생명"] / 100
+    )
+    level_gap = np.maximum(targets[next_index] - conv_sum, 0)
+    extra_counts = np.maximum(np.ceil(CONVENTION_MIN_COUNT - counts - (~hanwha_ok)), 0)
+
+    table = pd.DataFrame({
+        "수금자명": group["수금자명"].to_numpy(),
+        "현재환산": conv_sum,
+        "달성등급": group["달성등급"].to_numpy(),
+        "다음등급": names[next_index],
+        "다음등급기준": targets[next_index],
+        "부족환산": level_gap,
+        "추가필요건수": extra_counts.astype(int),
+    })
+    plans = cheapest_premiums(hanwha_amount, np.maximum(level_gap - hanwha_amount, 0), rates)
+    return rank_opportunities(pd.concat([table, plans], axis=1)[has_next])
+
+
+# 수금자별 요약 화면 서식. 엑셀은 `format_group_for_display` 글자 표를 씁니다.
+GROUP_COLUMN_CONFIG = {
+    "건수": number_column(PLAIN_COUNT),
+    "쉐어율미입력": number_column("%d건", help="쉐어율이 비어 있는 계약 수"),
+    "실적보험료합계": number_column(WON),
+    "컨벤션환산합계": number_column(WON),
+}
+
+
 def format_group_for_display(group: pd.DataFrame) -> pd.DataFrame:
     df = group.copy()
 
@@ -719,41 +648,8 @@ def format_group_for_display(group: pd.DataFrame) -> pd.DataFrame:
 
 
 # ── 엑셀 출력 ────────────────────────────────────────────────
-def write_table(ws, df_for_sheet: pd.DataFrame, start_row: int = 1, name_suffix: str = "A"):
-    global TABLE_SEQ
-
-    r_idx = start_row
-
-    for r_idx, row in enumerate(dataframe_to_rows(df_for_sheet, index=False, header=True), start_row):
-        for c_idx, value in enumerate(row, 1):
-            cell = ws.cell(row=r_idx, column=c_idx, value=value)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    end_col_letter = ws.cell(row=start_row, column=max(df_for_sheet.shape[1], 1)).column_letter
-    last_row = r_idx if df_for_sheet.shape[0] > 0 else start_row
-
-    TABLE_SEQ += 1
-    display_name = safe_table_name(f"tbl_{ws.title}_{name_suffix}_{TABLE_SEQ}")
-
-    table = Table(displayName=display_name, ref=f"A{start_row}:{end_col_letter}{last_row}")
-    table.tableStyleInfo = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
-    ws.add_table(table)
-
-    autosize_columns_full(ws, padding=5)
-
-    return last_row
-
-
-def write_title(ws, row, title):
-    cell = ws.cell(row=row, column=1, value=title)
-    cell.font = Font(bold=True, size=13)
-    cell.alignment = Alignment(horizontal="left", vertical="center")
-
-
-def write_requirements_line(ws, row, dfin: pd.DataFrame):
-    req = check_convention_requirements(dfin)
-
-    line = (
+def requirements_line(req: dict) -> str:
+    return (
         f"컨벤션 조건: "
         f"달성등급 [{req['달성등급']}]  |  "
         f"일반 {CONVENTION_GENERAL_TARGET:,.0f}원 {mark(req['일반달성'])}  |  "
@@ -764,26 +660,12 @@ def write_requirements_line(ws, row, dfin: pd.DataFrame):
         f"필수조건 {mark(req['필수조건'])}"
     )
 
-    cell = ws.cell(row=row, column=1, value=line)
-    cell.font = Font(bold=True)
-    cell.alignment = Alignment(horizontal="left", vertical="center")
-
-
-def write_totals_block(ws, dfin: pd.DataFrame, start_row: int):
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-
-    fill = PatternFill("solid", fgColor="F2F2F2")
 
+def totals_rows(dfin: pd.DataFrame, req: dict) -> list[list]:
     perf = dfin["실적보험료"].sum()
     conv = dfin["컨벤션환산금액"].sum()
-    req = check_convention_requirements(dfin)
 
-    rows = [
+    return [
         ["실적보험료 합계", won(perf)],
         ["컨벤션 환산 합계", won(conv)],
         ["현재 달성등급", req["달성등급"]],
@@ -797,20 +679,6 @@ def write_totals_block(ws, dfin: pd.DataFrame, start_row: int):
         ["필수조건", mark(req["필수조건"])],
     ]
 
-    for i, row_data in enumerate(rows, start=start_row):
-        for j, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=i, column=j, value=value)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-
-            if j == 1:
-                cell.fill = fill
-                cell.font = Font(bold=True)
-
-    autosize_columns_full(ws, padding=5)
-
-    return start_row + len(rows)
-
 
 def build_workbook(
     df: pd.DataFrame,
@@ -818,48 +686,67 @@ def build_workbook(
     excluded_disp_all: pd.DataFrame,
     review_disp_all: pd.DataFrame | None = None,
 ):
-    wb = Workbook()
-
-    ws_summary = wb.active
-    ws_summary.title = "요약"
+    writer = WorkbookWriter()
 
-    write_title(ws_summary, 1, "컨벤션 수금자별 요약")
-    next_row = write_table(ws_summary, format_group_for_display(group), start_row=2, name_suffix="SUMMARY")
-
-    write_requirements_line(ws_summary, next_row + 2, df)
-    total_next = write_totals_block(ws_summary, df, next_row + 4)
+    summary_table = format_group_for_display(group)
+    req = check_convention_requirements(df)
+    totals = totals_rows(df, req)
 
+    summary_widths = [table_widths(summary_table), rows_widths(totals)]
     if not excluded_disp_all.empty:
-        write_title(ws_summary, total_next + 2, "제외 계약 목록")
-        write_table(ws_summary, excluded_disp_all, start_row=total_next + 3, name_suffix="EXCLUDED")
-
-    collectors = sorted(df["수금자명"].astype(str).unique().tolist())
+        summary_widths.append(table_widths(excluded_disp_all))
 
-    for collector in collectors:
-        sub = df[df["수금자명"].astype(str) == collector].copy()
-        sheet_title = unique_sheet_name(wb, collector)
-        ws = wb.create_sheet(title=sheet_title)
+    ws_summary = writer.sheet("요약", merge_widths(*summary_widths))
+    ws_summary.text("컨벤션 수금자별 요약")
+    ws_summary.frame(summary_table, name_suffix="SUMMARY")
+    ws_summary.blank()
+    ws_summary.text(requirements_line(req), "bold_left")
+    ws_summary.blank()
+    ws_summary.block(totals)
 
-        write_title(ws, 1, f"{collector} 컨벤션 환산 결과")
-        table_last_row = write_table(ws, to_styled(sub), start_row=2, name_suffix="DETAIL")
+    if not excluded_disp_all.empty:
+        ws_summary.blank(2)
+        ws_summary.text("제외 계약 목록")
+        ws_summary.frame(excluded_disp_all, name_suffix="EXCLUDED")
 
-        next_row = write_totals_block(ws, sub, table_last_row + 2)
-        write_requirements_line(ws, next_row + 1, sub)
+    # 수금자별 시트: 서식 변환과 분할은 수금자마다 다시 거르지 않고 전체에서 한 번씩만 합니다.
+    keys = df["수금자명"].astype(str)
+    styled = to_styled(df)
+    details = split_rows(styled, keys)
 
-        ex_sub = excluded_disp_all[
-            excluded_disp_all["수금자명"].astype(str) == str(collector)
-        ]
+    excluded = {}
+    if not excluded_disp_all.empty:
+        excluded = split_rows(excluded_disp_all, excluded_disp_all["수금자명"].astype(str))
 
-        if not ex_sub.empty:
-            write_title(ws, next_row + 3, "제외 계약")
-            write_table(ws, ex_sub, start_row=next_row + 4, name_suffix="EXCLUDED")
+    for collector, sub in df.groupby(keys, sort=True):
+        body, lengths = details[collector]
+        req = check_convention_requirements(sub)
+        totals = totals_rows(sub, req)
+
+        widths = merge_widths(column_widths(styled.columns, lengths), rows_widths(totals))
+        ex_body, ex_lengths = excluded.get(collector, (None, None))
+        if ex_body is not None:
+            widths = merge_widths(widths, column_widths(excluded_disp_all.columns, ex_lengths))
+
+        ws = writer.sheet(collector, widths)
+        ws.text(f"{collector} 컨벤션 환산 결과")
+        ws.table(styled.columns, body, name_suffix="DETAIL")
+        ws.blank()
+        ws.block(totals)
+        ws.blank()
+        ws.text(requirements_line(req), "bold_left")
+
+        if ex_body is not None:
+            ws.blank()
+            ws.text("제외 계약")
+            ws.table(excluded_disp_all.columns, ex_body, name_suffix="EXCLUDED")
 
     if review_disp_all is not None and not review_disp_all.empty:
-        ws_review = wb.create_sheet(title="확인필요계약")
-        write_title(ws_review, 1, "입력값 확인이 필요한 계약")
-        write_table(ws_review, review_disp_all, start_row=2, name_suffix="REVIEW")
+        ws_review = writer.sheet("확인필요계약", table_widths(review_disp_all))
+        ws_review.text("입력값 확인이 필요한 계약")
+        ws_review.frame(review_disp_all, name_suffix="REVIEW")
 
-    return wb
+    return writer.wb
 
 
 # ── 메인 실행 ────────────────────────────────────────────────
@@ -929,7 +816,7 @@ def run():
     file_bytes = uploaded_file.getvalue()
 
     try:
-        raw = load_df(BytesIO(file_bytes)).copy()
+        raw = load_contracts(file_bytes)
     except Exception as e:
         st.error(f"❌ 엑셀 파일을 읽는 중 오류가 발생했습니다: {e}")
         return
@@ -944,7 +831,7 @@ def run():
         return
 
     raw["_원본행번호"] = raw.index + 2
-    candidate_df, excluded_df = exclude_contracts(raw)
+    candidate_df, excluded_df, excluded_reasons = exclude_contracts(raw)
     blocking_issues, condition_issues, _ = find_data_issues(candidate_df)
     initial_review_mask = blocking_issues.ne("") | condition_issues.ne("")
     initial_review = candidate_df[initial_review_mask].copy()
@@ -971,7 +858,7 @@ def run():
         with st.expander("📝 확인 필요 계약 수정", expanded=True):
             with st.form("convention_review_editor_form"):
                 edited_review = st.data_editor(
-                    initial_review[editor_columns].reset_index(drop=True),
+                    plain_columns(initial_review[editor_columns]).reset_index(drop=True),
                     use_container_width=True,
                     hide_index=True,
                     disabled=["_원본행번호", "상품명", "확인사항"],
@@ -988,14 +875,15 @@ def run():
         for _, edited_row in edited_review.iterrows():
             row_mask = candidate_df["_원본행번호"] == edited_row["_원본행번호"]
             for column in editable_columns:
-                candidate_df.loc[row_mask, column] = edited_row[column]
+                assign_values(candidate_df, row_mask, column, edited_row[column])
 
         if corrections_submitted:
             st.success("입력한 수정값을 다시 검증하여 반영했습니다.")
 
-    candidate_df, newly_excluded_df = exclude_contracts(candidate_df)
+    candidate_df, newly_excluded_df, newly_excluded_reasons = exclude_contracts(candidate_df)
     if not newly_excluded_df.empty:
         excluded_df = pd.concat([excluded_df, newly_excluded_df]).sort_index()
+        excluded_reasons = pd.concat([excluded_reasons, newly_excluded_reasons]).sort_index()
 
     blocking_issues, condition_issues, share_numeric = find_data_issues(candidate_df)
     blocked_df = candidate_df[blocking_issues.ne("")].copy()
@@ -1014,7 +902,7 @@ def run():
 
     df_valid = candidate_df[blocking_issues.eq("")].copy()
     df_valid.loc[:, "쉐어율"] = share_numeric.loc[df_valid.index]
-    excluded_disp_all = build_excluded_with_reason(excluded_df)
+    excluded_disp_all = build_excluded_with_reason(excluded_df, excluded_reasons)
 
     if not blocked_df.empty:
         st.warning(
@@ -1058,11 +946,11 @@ def run():
     show_df = (
         df
         if selected_collector == "전체"
-        else df[df["수금자명"].astype(str) == selected_collector].copy()
+        else df[df["수금자명"].astype(str) == selected_collector]
     )
 
     section_intro("환산 결과", f"{'전체' if selected_collector == '전체' else selected_collector} 컨벤션 환산 결과", "선택한 계약자료에 컨벤션 환산 기준을 적용한 결과입니다.")
-    st.dataframe(to_styled(show_df), use_container_width=True)
+    st.dataframe(display_table(show_df), use_container_width=True, column_config=DETAIL_COLUMN_CONFIG)
 
     req = check_convention_requirements(show_df)
     conv_sum = req["컨벤션환산금액"]
@@ -1150,17 +1038,39 @@ def run():
     section_intro("상세 결과", "수금자별 요약", "수금자별 환산금액과 달성 현황을 비교합니다.")
 
     group = make_group(df)
-    st.dataframe(format_group_for_display(group), use_container_width=True)
+    st.dataframe(group, use_container_width=True, column_config=GROUP_COLUMN_CONFIG)
 
-    wb = build_workbook(df, group, excluded_disp_all, review_disp_all)
+    with st.expander("📈 전체 수금자 다음 단계까지 필요한 추가 보험료"):
+        st.caption(
+            "20년납 신규 계약 기준 환산율로 계산했습니다. 한화생명 5만 원 이상 계약이 없으면 "
+            "한화생명 보험료를 먼저 더하고, 추가 보험료가 적은 수금자부터 보여 줍니다. "
+            "필수조건을 못 채운 수금자는 조건만 채우면 인정되는 단계를 목표로 보여 줍니다."
+        )
+        opportunities = make_level_opportunities(group)
+        st.dataframe(
+            opportunities,
+            use_container_width=True,
+            hide_index=True,
+            column_config=opportunity_column_config(opportunities),
+        )
 
-    excel_output = BytesIO()
-    wb.save(excel_output)
-    excel_output.seek(0)
+    # 엑셀은 다운로드 버튼을 누를 때만 만들고, 같은 데이터면 만들어 둔 파일을 씁니다.
+    excel_data = deferred_workbook(
+        lambda: build_workbook(df, group, excluded_disp_all, review_disp_all),
+        "convention",
+        frame_digest(df, excluded_disp_all, review_disp_all),
+    )
 
     st.download_button(
         label="📥 컨벤션 환산 결과 엑셀 다운로드",
-        data=excel_output,
+        data=excel_data,
         file_name=download_filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore",
+        mime=XLSX_MIME,
     )
+
+    render_memory_report({
+        "업로드 계약": raw,
+        "계산 결과": df,
+        "제외 계약": excluded_disp_all,
+    })
@@ -0,0 +1,123 @@
+"""보장분석 PDF 추출 결과를 PDF 내용 해시로 디스크에 보관하는 캐시.
+
+같은 고객 PDF를 다른 상담자가 열거나 `처음부터 다시`로 세션을 비운 뒤 다시 올려도
+`extract_pdf`를 다시 돌리지 않고 저장된 결과를 씁니다.
+
+    cache/coverage_pdf/
+        <추출 규칙 버전>/<PDF sha256>.json.gz
+
+추출 규칙 버전(`CACHE_VERSION`)은 `coverage_pdf.PARSER_VERSION`과 pdfplumber 버전을 합친 값이라
+추출 코드나 라이브러리가 바뀌면 새 폴더를 쓰고, 예전 버전 폴더는 다음 저장 때 지웁니다.
+폴더 전체 크기가 `MAX_CACHE_BYTES`를 넘으면 가장 오래 쓰지 않은 결과부터 지웁니다(읽을 때 수정 시각을 갱신).
+캐시를 읽거나 쓸 수 없으면 그냥 다시 추출합니다.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pdfplumber
+
+try:
+    from .coverage_pdf import PARSER_VERSION, ProgressCallback, extract_pdf
+except ImportError:  # 단독 파일 점검용
+    from coverage_pdf import PARSER_VERSION, ProgressCallback, extract_pdf
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = PROJECT_ROOT / "cache" / "coverage_pdf"
+CACHE_VERSION = f"{PARSER_VERSION}-pdfplumber{pdfplumber.__version__}"
+MAX_CACHE_BYTES = 64 * 1024**2
+
+
+def pdf_digest(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def _entry_path(digest: str, store: Path) -> Path:
+    return store / CACHE_VERSION / f"{digest}.json.gz"
+
+
+def load_cached(digest: str, store: Path = CACHE_DIR) -> dict | None:
+    """저장된 추출 결과. 없거나 읽을 수 없으면 None입니다."""
+    path = _entry_path(digest, store)
+
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            result = json.load(file)
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError):
+        path.unlink(missing_ok=True)
+        return None
+
+    return result
+
+
+def evict(store: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES) -> None:
+    """예전 버전 폴더를 지우고, 남은 결과가 `max_bytes`를 넘으면 오래 쓰지 않은 것부터 지웁니다."""
+    if not store.is_dir():
+        return
+
+    for folder in store.iterdir():
+        if folder.is_dir() and folder.name != CACHE_VERSION:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    entries = []
+    for path in (store / CACHE_VERSION).glob("*.json.gz"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # 다른 세션이 먼저 지운 경우
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def save_cached(digest: str, result: dict, store: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES) -> None:
+    """임시 파일에 쓴 뒤 바꿔 넣어, 다른 세션이 반쯤 쓴 결과를 읽지 않게 합니다."""
+    path = _entry_path(digest, store)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 세션은 같은 프로세스의 스레드라 pid로는 임시 파일이 갈리지 않으므로 매번 새 이름을 받습니다.
+    handle, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(handle)
+    try:
+        with gzip.open(tmp, "wt", encoding="utf-8") as file:
+            json.dump(result, file, ensure_ascii=False)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    evict(store, max_bytes)
+
+
+def cached_extract(
+    pdf_bytes: bytes,
+    digest: str | None = None,
+    progress: ProgressCallback | None = None,
+    store: Path = CACHE_DIR,
+) -> dict:
+    """저장된 결과가 있으면 그것을, 없으면 `extract_pdf` 결과를 저장하고 반환합니다."""
+    digest = digest or pdf_digest(pdf_bytes)
+    cached = load_cached(digest, store)
+
+    if cached is not None:
+        return cached
+
+    result = extract_pdf(pdf_bytes, progress=progress)
+    try:
+        save_cached(digest, result, store)
+    except OSError:
+        pass
+    return result
@@ -0,0 +1,353 @@
+"""프로보장분석 PDF에서 고객명·작성일자와 가입 담보 목록을 읽는 도우미.
+
+쪽마다 필요한 만큼만 뽑습니다.
+- 고객명·작성일자는 앞 HEADER_PAGES쪽의 레이아웃 글자에서만 찾으므로 그 뒤 쪽은 글자를 뽑지 않습니다.
+- 표를 먼저 읽고, 그 쪽에서 담보 행을 하나도 얻지 못했을 때만 단어 위치로 다시 읽습니다.
+- 쪽을 다 읽으면 pdfplumber의 쪽별 캐시를 비워, 쪽 수가 많아도 메모리가 쌓이지 않습니다.
+
+쪽들은 마지막 중복 정리 전까지 서로 독립이므로, 쪽 수가 많으면 프로세스 풀에 쪽 범위를 나눠 맡깁니다.
+작업 프로세스는 PDF 바이트를 받아 자기 범위만 열어 읽고, 결과는 쪽 번호 순으로 합치므로
+나눠 읽어도 한 번에 읽은 결과와 같습니다. 이 모듈은 Streamlit을 가져오지 않아 작업 프로세스가 가볍게 뜹니다.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from typing import Callable, Iterable
+
+import pdfplumber
+
+try:
+    from .text_normalize import normalize_claim_text as normalize_text
+except ImportError:  # 단독 파일 점검용
+    from text_normalize import normalize_claim_text as normalize_text
+
+
+# 추출 결과가 달라지는 수정(열 경계, 행 판정, 중복 기준 등)을 하면 올립니다. 디스크 캐시가 이 값으로 나뉩니다.
+PARSER_VERSION = "1"
+
+HEADER_PAGES = 2
+TEXT_SETTINGS = {"x_tolerance": 2, "y_tolerance": 3, "layout": True}
+WORD_SETTINGS = {"x_tolerance": 1, "y_tolerance": 2}
+
+# 프로세스 풀은 쪽이 이보다 많을 때만 씁니다. 작업 프로세스를 띄우는 시간이 쪽 몇 개를 읽는 시간과 비슷합니다.
+PARALLEL_MIN_PAGES = 8
+PDF_WORKERS = max(1, min(4, os.cpu_count() or 1))
+# 작업 프로세스마다 범위를 몇 개씩 맡길지. 범위가 작을수록 진행 표시가 자주 바뀝니다.
+RANGES_PER_WORKER = 4
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class CoverageRow:
+    company: str
+    product: str
+    category: str
+    coverage: str
+    amount: str
+    contract_date: str
+    expiry_date: str
+    source_page: int
+    extraction_status: str = "정상 추출"
+
+
+INSURER_ALIASES = {
+    "DB손보": "DB손해보험", "KB손보": "KB손해보험", "NH손보": "NH농협손해보험",
+    "농협손해보험": "NH농협손해보험", "하나손보": "하나손해보험",
+    "신한생명": "신한라이프", "우체국": "우체국보험",
+}
+
+
+INSURER_PATTERN = re.compile(
+    r"DB손해보험|DB손보|KB손해보험|KB손보|현대해상|메리츠화재|한화손해보험|흥국화재|"
+    r"삼성화재|롯데손해보험|MG손해보험|NH농협손해보험|농협손해보험|NH손보|캐롯손해보험|하나손해보험|하나손보|"
+    r"신한라이프|신한생명|한화생명|교보생명|삼성생명|라이나생명|ABL생명|AIA생명|동양생명|"
+    r"흥국생명|NH농협생명|미래에셋생명|KDB생명|하나생명|IBK연금보험|처브라이프|"
+    r"우체국보험|우체국|새마을금고|수협"
+)
+
+
+def normalize_company(value: str) -> str:
+    value = str(value or "").strip()
+    return INSURER_ALIASES.get(value, value)
+
+
+def parse_amount(value: str) -> str:
+    raw = str(value or "").strip()
+    if raw in {"", "-", "-원"}:
+        return "확인 필요"
+    match = re.search(r"[\d,]+(?:\.\d+)?", raw)
+    return f"{match.group(0)}만원" if match else raw
+
+
+def infer_coverage_category(category: str, coverage: str) -> str:
+    """담보명에 원인이 명시된 경우 PDF의 병합셀 위치보다 담보명을 우선한다."""
+    category = str(category or "").strip()
+    text = normalize_text(coverage)
+    surgery_rules = [
+        (("교통", "수술"), "교통상해수술"), (("자동차", "수술"), "교통상해수술"),
+        (("질병", "수술"), "질병수술"), (("상해", "수술"), "상해수술"), (("재해", "수술"), "상해수술"),
+        (("장기이식", "수술"), "기타수술"),
+        (("각막이식", "수술"), "기타수술"), (("조혈모세포", "수술"), "기타수술"),
+    ]
+    for terms, inferred in surgery_rules:
+        if all(normalize_text(term) in text for term in terms):
+            return inferred
+    return category
+
+
+@dataclass(frozen=True)
+class PageExtract:
+    page_no: int
+    header_text: str
+    rows: tuple[CoverageRow, ...]
+
+
+def _table_rows(page_tables: list[list[list[str | None]]], page_no: int) -> list[CoverageRow]:
+    rows: list[CoverageRow] = []
+    for table in page_tables:
+        if not table:
+            continue
+        header_index = next(
+            (
+                idx for idx, row in enumerate(table)
+                if len(row) >= 7
+                and "구분" in normalize_text(row[0] or "")
+                and "회사" in normalize_text(row[1] or "")
+                and "담보" in normalize_text(row[3] or "")
+            ),
+            None,
+        )
+        if header_index is None:
+            continue
+        current_category = ""
+        for cells in table[header_index + 1:]:
+            if len(cells) < 7:
+                continue
+            category_cell = str(cells[0] or "").replace("\n", " ").strip()
+            if category_cell:
+                current_category = category_cell
+            company_cell = str(cells[1] or "").replace("\n", " ").strip()
+            insurer_match = INSURER_PATTERN.search(company_cell)
+            if not insurer_match:
+                continue
+            product = str(cells[2] or "").replace("\n", " ").strip()
+            coverage = str(cells[3] or "").replace("\n", " ").strip()
+            if coverage.startswith(")") and product.count("(") > product.count(")"):
+                product += ")"
+                coverage = coverage[1:].lstrip()
+            amount_raw = str(cells[4] or "").replace("\n", " ").strip()
+            contract_date = str(cells[5] or "").replace("\n", " ").strip()
+            expiry_date = str(cells[6] or "").replace("\n", " ").strip()
+            if not product or not coverage or not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?", contract_date):
+                continue
+            if not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?|종신", expiry_date):
+                expiry_date = "확인 필요"
+            category = infer_coverage_category(current_category, coverage)
+            rows.append(CoverageRow(
+                company=normalize_company(insurer_match.group(0)), product=product, category=category,
+                coverage=coverage, amount=parse_amount(amount_raw), contract_date=contract_date,
+                expiry_date=expiry_date, source_page=page_no,
+                extraction_status="담보명 잘림 가능성" if coverage.endswith(("(", "제", "갱", "지", "수")) else "정상 추출",
+            ))
+    return rows
+
+
+def _word_rows(page_width: float, words: list[dict], page_no: int) -> list[CoverageRow]:
+    if not words:
+        return []
+    scale = 595.28 / page_width if page_width else 1.0
+    line_groups: list[list[dict]] = []
+    for word in sorted(words, key=lambda item: (float(item["top"]), float(item["x0"]))):
+        if not line_groups or abs(float(word["top"]) - float(line_groups[-1][0]["top"])) > 2.2:
+            line_groups.append([word])
+        else:
+            line_groups[-1].append(word)
+
+    # 보장분류 셀은 여러 담보 행의 세로 중앙에 놓이는 경우가 있어
+    # 단순히 '이전 분류'를 물려주면 질병/상해 분류가 뒤바뀔 수 있다.
+    category_markers: list[tuple[float, str]] = []
+    for marker_words in line_groups:
+        marker_text = " ".join(
+            str(word["text"]).strip()
+            for word in sorted(marker_words, key=lambda item: float(item["x0"]))
+            if float(word["x0"]) * scale < 95
+        ).strip()
+        if marker_text and len(marker_text) <= 35:
+            category_markers.append((float(marker_words[0]["top"]), marker_text))
+
+    rows: list[CoverageRow] = []
+    for line_words in line_groups:
+        fields = {"category": [], "company": [], "product": [], "coverage": [], "amount": [], "contract": [], "expiry": []}
+        for word in sorted(line_words, key=lambda item: float(item["x0"])):
+            x = float(word["x0"]) * scale
+            text = str(word["text"]).strip()
+            if x < 95:
+                fields["category"].append(text)
+            elif x < 150:
+                fields["company"].append(text)
+            elif x < 303:
+                fields["product"].append(text)
+            elif x < 428:
+                fields["coverage"].append(text)
+            elif x < 473:
+                fields["amount"].append(text)
+            elif x < 528:
+                fields["contract"].append(text)
+            else:
+                fields["expiry"].append(text)
+
+        category_text = " ".join(fields["category"]).strip()
+        company_text = " ".join(fields["company"]).strip()
+        insurer_match = INSURER_PATTERN.search(company_text)
+        if not insurer_match:
+            continue
+        product = " ".join(fields["product"]).strip()
+        coverage = " ".join(fields["coverage"]).strip()
+        amount_raw = " ".join(fields["amount"]).strip()
+        contract_date = " ".join(fields["contract"]).strip()
+        expiry_date = " ".join(fields["expiry"]).strip()
+        if not product or not coverage or not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?", contract_date):
+            continue
+        if not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?|종신", expiry_date):
+            expiry_date = "확인 필요"
+        if not category_text and category_markers:
+            row_top = float(line_words[0]["top"])
+            category_text = min(category_markers, key=lambda item: abs(item[0] - row_top))[1]
+        category_text = infer_coverage_category(category_text, coverage)
+        status = "담보명 잘림 가능성" if coverage.endswith(("(", "제", "갱", "지", "수")) else "정상 추출"
+        rows.append(
+            CoverageRow(
+                company=normalize_company(insurer_match.group(0)),
+                product=product,
+                category=category_text,
+                coverage=coverage,
+                amount=parse_amount(amount_raw),
+                contract_date=contract_date,
+                expiry_date=expiry_date,
+                source_page=page_no,
+                extraction_status=status,
+            )
+        )
+    return rows
+
+
+def extract_page(page, page_no: int) -> PageExtract:
+    """pdfplumber 쪽 하나에서 필요한 만큼만 뽑습니다. 쪽 캐시는 다 읽은 뒤 비웁니다."""
+    try:
+        header_text = (page.extract_text(**TEXT_SETTINGS) or "") if page_no <= HEADER_PAGES else ""
+        rows = _table_rows(page.extract_tables() or [], page_no)
+        if not rows:
+            rows = _word_rows(float(page.width), page.extract_words(**WORD_SETTINGS) or [], page_no)
+    finally:
+        page.close()
+    return PageExtract(page_no=page_no, header_text=header_text, rows=tuple(rows))
+
+
+def _report_header(text: str) -> tuple[str, str]:
+    customer_match = re.search(r"([가-힣]{2,5})님을\s*위한", text)
+    report_match = re.search(r"작성일자\s*(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})", text)
+    customer = customer_match.group(1) if customer_match else "확인 필요"
+    report_date = (
+        f"{report_match.group(1)}.{int(report_match.group(2)):02d}.{int(report_match.group(3)):02d}"
+        if report_match else "확인 필요"
+    )
+    return customer, report_date
+
+
+def merge_pages(pages: Iterable[PageExtract]) -> dict:
+    """쪽별 결과를 쪽 번호 순으로 합치고 같은 담보(회사·상품·담보·금액·계약일·만기일)는 처음 것만 남깁니다."""
+    pages = sorted(pages, key=lambda item: item.page_no)
+    customer, report_date = _report_header("\n".join(page.header_text for page in pages[:HEADER_PAGES]))
+
+    deduped: list[CoverageRow] = []
+    seen: set[tuple] = set()
+    for page in pages:
+        for row in page.rows:
+            key = (row.company, row.product, row.coverage, row.amount, row.contract_date, row.expiry_date)
+            if key not in seen:
+                seen.add(key)
+                deduped.append(row)
+
+    return {
+        "customer": customer,
+        "report_date": report_date,
+        "coverages": [asdict(row) for row in deduped],
+        "page_count": len(pages),
+    }
+
+
+def page_ranges(page_count: int, parts: int) -> list[range]:
+    """1..page_count 쪽을 크기가 고른 연속 범위 `parts`개 이하로 나눕니다."""
+    parts = max(1, min(parts, page_count))
+    bounds = [1 + page_count * k // parts for k in range(parts + 1)]
+    return [range(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+
+
+def extract_page_range(pdf_bytes: bytes, pages: range) -> list[PageExtract]:
+    """PDF를 열어 `pages`(1부터 세는 쪽 번호) 쪽만 읽습니다. 작업 프로세스에서 실행됩니다."""
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        return [extract_page(pdf.pages[page_no - 1], page_no) for page_no in pages]
+
+
+def _pool_context():
+    """Streamlit 서버처럼 스레드가 도는 프로세스를 그대로 fork하지 않도록 forkserver(없으면 spawn)를 씁니다."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _extract_parallel(
+    pdf_bytes: bytes,
+    page_count: int,
+    workers: int,
+    progress: ProgressCallback | None,
+) -> list[PageExtract]:
+    ranges = page_ranges(page_count, workers * RANGES_PER_WORKER)
+    pages: list[PageExtract] = []
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=_pool_context()) as pool:
+        futures = [pool.submit(extract_page_range, pdf_bytes, pages_range) for pages_range in ranges]
+        for future in as_completed(futures):
+            pages.extend(future.result())
+            if progress:
+                progress(len(pages), page_count)
+
+    return pages
+
+
+def extract_pdf(pdf_bytes: bytes, progress: ProgressCallback | None = None, workers: int | None = None) -> dict:
+    """
+    보장분석 PDF를 읽어 {"customer", "report_date", "coverages", "page_count"}를 반환합니다.
+    `progress(읽은 쪽 수, 전체 쪽 수)`는 호출한 스레드에서 불립니다.
+    `workers`가 1이거나 쪽이 PARALLEL_MIN_PAGES 이하이면 지금 프로세스에서 차례로 읽습니다.
+    """
+    workers = PDF_WORKERS if workers is None else max(1, workers)
+
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        page_count = len(pdf.pages)
+        if workers == 1 or page_count <= PARALLEL_MIN_PAGES:
+            pages = []
+            for page_no, page in enumerate(pdf.pages, start=1):
+                pages.append(extract_page(page, page_no))
+                if progress:
+                    progress(page_no, page_count)
+            return merge_pages(pages)
+
+    try:
+        pages = _extract_parallel(pdf_bytes, page_count, workers, progress)
+    except (BrokenProcessPool, OSError):
+        # 작업 프로세스를 띄울 수 없는 환경(세마포어 제한 등)에서는 차례로 읽습니다.
+        pages = extract_page_range(pdf_bytes, range(1, page_count + 1))
+        if progress:
+            progress(page_count, page_count)
+    return merge_pages(pages)
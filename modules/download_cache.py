@@ -0,0 +1,52 @@
+"""엑셀 다운로드 파일을 실제로 내려받을 때만 만들고, 같은 입력이면 다시 쓰는 도우미.
+
+화면은 수금자 선택이나 표 편집 때마다 다시 그려지지만 엑셀 파일은 다운로드 버튼을
+누를 때만 필요합니다. `deferred_workbook`은 `st.download_button(data=...)`에 넘길
+함수를 돌려주고, 만든 결과는 입력 DataFrame 해시와 선택값을 키로 보관합니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from io import BytesIO
+from typing import Any, Callable
+
+import pandas as pd
+import streamlit as st
+from openpyxl import Workbook
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def frame_digest(*frames: pd.DataFrame | None) -> str:
+    """DataFrame 내용·열 구성으로 짧은 해시를 만듭니다."""
+    digest = hashlib.sha1()
+    for frame in frames:
+        if frame is None:
+            digest.update(b"<none>")
+            continue
+        digest.update(repr((frame.shape, list(frame.columns), [str(t) for t in frame.dtypes])).encode("utf-8"))
+        try:
+            values = pd.util.hash_pandas_object(frame, index=True)
+        except TypeError:
+            # 한 열에 숫자·문자·리스트가 섞여 해시할 수 없으면 문자열로 바꿔 계산합니다.
+            values = pd.util.hash_pandas_object(frame.astype(str), index=True)
+        digest.update(values.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _workbook_bytes(key: str, _build: Callable[[], Workbook]) -> bytes:
+    output = BytesIO()
+    _build().save(output)
+    return output.getvalue()
+
+
+def deferred_workbook(build: Callable[[], Workbook], *key_parts: Any) -> Callable[[], bytes]:
+    """다운로드 버튼을 눌렀을 때 `build()`로 엑셀을 만들어 bytes로 돌려주는 함수.
+
+    key_parts에는 엑셀 내용을 결정하는 값(입력 DataFrame 해시, 선택 수금자,
+    보너스율 등)을 넘깁니다. 같은 키로 다시 누르면 만들어 둔 파일을 그대로 씁니다.
+    """
+    key = "|".join(str(part) for part in key_parts)
+    return lambda: _workbook_bytes(key, build)
@@ -0,0 +1,298 @@
+"""컨벤션·썸머·매니저 업적 엑셀 다운로드가 함께 쓰는 쓰기 도우미.
+
+통합문서는 openpyxl 쓰기 전용(write_only) 모드로 만들어 행 단위로 흘려 씁니다.
+
+- 서식은 이름별로 한 번만 만들어 통합문서 안에서 함께 쓰고, 셀마다 새 서식 객체를 만들지 않습니다.
+- 열 너비는 시트에 쓸 DataFrame의 문자열 길이를 열 단위로 계산해 첫 행을 쓰기 전에 정합니다.
+  쓰기 전용 시트는 이미 쓴 셀을 다시 읽을 수 없으므로 셀을 훑어 너비를 맞출 수 없습니다.
+- 엑셀 표(Table) 이름 번호는 통합문서마다 따로 매깁니다.
+
+바뀌는 상태(서식 목록, 표 이름 번호)는 모두 `WorkbookWriter` 인스턴스에 있고 모듈 전역에는
+읽기 전용 상수만 둡니다. 그래서 여러 세션이나 작업 스레드가 각자 통합문서를 동시에 만들어도
+서로 영향을 주지 않고, 같은 입력이면 표 이름까지 같은 파일이 나옵니다.
+"""
+
+from __future__ import annotations
+
+import re
+import warnings
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.table import Table, TableStyleInfo
+
+TABLE_STYLE = "TableStyleMedium9"
+WIDTH_PADDING = 5
+MAX_COLUMN_WIDTH = 45
+
+CENTER = Alignment(horizontal="center", vertical="center")
+LEFT = Alignment(horizontal="left", vertical="center")
+THIN_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+LABEL_FILL = PatternFill("solid", fgColor="F2F2F2")
+
+# 이름 → 셀 서식 속성. 모듈별 강조색 등은 WorkbookWriter(styles=...)로 더합니다.
+BASE_STYLES = {
+    "center": {"alignment": CENTER},
+    "title": {"font": Font(bold=True, size=13), "alignment": LEFT},
+    "bold": {"font": Font(bold=True)},
+    "bold_left": {"font": Font(bold=True), "alignment": LEFT},
+    "label": {"font": Font(bold=True), "alignment": CENTER, "fill": LABEL_FILL, "border": THIN_BORDER},
+    "value": {"alignment": CENTER, "border": THIN_BORDER},
+}
+
+
+# ── 이름 ────────────────────────────────────────────────────
+def safe_table_name(base: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9_]", "_", str(base))
+
+    if not re.match(r"^[A-Za-z_]", name):
+        name = f"tbl_{name}"
+
+    return name[:254]
+
+
+def unique_sheet_name(wb, base, limit=31):
+    name = str(base)[:limit] if base else "Sheet"
+
+    if name not in wb.sheetnames:
+        return name
+
+    i = 2
+    while True:
+        suffix = f"_{i}"
+        trunc = limit - len(suffix)
+        cand = f"{name[:trunc]}{suffix}"
+
+        if cand not in wb.sheetnames:
+            return cand
+
+        i += 1
+
+
+# ── 열 너비 ──────────────────────────────────────────────────
+def cell_lengths(df: pd.DataFrame) -> pd.DataFrame:
+    """셀마다 엑셀에 보일 문자열 길이를 열 번호(1부터) 열로 담습니다. 빈 값은 0입니다."""
+    lengths = {}
+
+    for j in range(1, df.shape[1] + 1):
+        values = df.iloc[:, j - 1]
+        lengths[j] = values.astype(object).where(values.notna(), "").astype(str).str.len().to_numpy()
+
+    return pd.DataFrame(lengths, index=df.index)
+
+
+def column_widths(columns: Iterable, max_lengths=None, padding=WIDTH_PADDING, max_width=MAX_COLUMN_WIDTH) -> dict[int, float]:
+    """헤더와 열별 가장 긴 값(`max_lengths[열 번호]`)으로 열 번호별 너비를 정합니다."""
+    widths = {}
+
+    for j, col in enumerate(columns, 1):
+        longest = len(str(col))
+
+        if max_lengths is not None and j in max_lengths:
+            longest = max(longest, int(max_lengths[j]))
+
+        widths[j] = min(longest + padding, max_width)
+
+    return widths
+
+
+def table_widths(df: pd.DataFrame) -> dict[int, float]:
+    return column_widths(df.columns, None if df.empty else cell_lengths(df).max())
+
+
+def rows_widths(rows: Sequence[Sequence]) -> dict[int, float]:
+    """라벨·값 블록처럼 헤더 없는 짧은 행 목록의 열 너비."""
+    longest: dict[int, int] = {}
+
+    for row in rows:
+        for j, value in enumerate(row, 1):
+            longest[j] = max(longest.get(j, 0), len("" if value is None else str(value)))
+
+    return {j: min(length + WIDTH_PADDING, MAX_COLUMN_WIDTH) for j, length in longest.items()}
+
+
+def merge_widths(*width_maps: dict[int, float]) -> dict[int, float]:
+    """한 시트에 표가 여러 개면 열마다 가장 넓은 값을 씁니다."""
+    merged: dict[int, float] = {}
+
+    for widths in width_maps:
+        for j, width in widths.items():
+            merged[j] = max(merged.get(j, 0), width)
+
+    return merged
+
+
+# ── 행 준비 ──────────────────────────────────────────────────
+def table_rows(df: pd.DataFrame) -> list[list]:
+    """표 본문 행 목록. 빈 값(NaN/NaT/NA)은 빈 셀(None)로 씁니다."""
+    return df.astype(object).where(df.notna(), None).to_numpy().tolist()
+
+
+def split_rows(df: pd.DataFrame, keys) -> dict[str, tuple[list[list], pd.Series]]:
+    """
+    키(수금자명 등)별 (본문 행 목록, 열 번호별 최대 문자열 길이).
+    행 변환과 길이 계산은 전체 표에서 한 번만 하고 groupby 위치로 나눕니다.
+    """
+    frame = df.reset_index(drop=True)
+    keys = np.asarray(keys)
+
+    body = table_rows(frame)
+    lengths = cell_lengths(frame).groupby(keys).max()
+    positions = frame.groupby(keys).indices
+
+    return {
+        key: ([body[i] for i in idx], lengths.loc[key])
+        for key, idx in positions.items()
+    }
+
+
+# ── 쓰기 ────────────────────────────────────────────────────
+class WorkbookWriter:
+    """
+    쓰기 전용 통합문서 하나와 그 안에서 함께 쓰는 서식·표 이름 번호를 가집니다.
+    `sheet(title, widths)`로 시트를 열고, 다 쓰면 `wb`를 저장합니다.
+    """
+
+    def __init__(self, styles: dict[str, dict] | None = None):
+        self.wb = Workbook(write_only=True)
+        self._style_attrs = {**BASE_STYLES, **(styles or {})}
+        self._styles = {}
+        self._table_seq = 0
+
+    def sheet(self, title: str, widths: dict[int, float] | None = None) -> "SheetStream":
+        return SheetStream(self, unique_sheet_name(self.wb, title), widths or {})
+
+    def style(self, name: str, ws):
+        """이름별 서식 배열. 처음 쓸 때 한 번만 만들어 통합문서 서식 목록에 등록합니다."""
+        if name not in self._styles:
+            template = WriteOnlyCell(ws)
+
+            for attr, value in self._style_attrs[name].items():
+                setattr(template, attr, value)
+
+            self._styles[name] = template._style
+
+        return self._styles[name]
+
+    def table_name(self, sheet_title: str, name_suffix: str) -> str:
+        """통합문서 안에서 겹치지 않는 표 이름. 번호는 이 통합문서에서 만든 표 순서입니다."""
+        self._table_seq += 1
+        return safe_table_name(f"tbl_{sheet_title}_{name_suffix}_{self._table_seq}")
+
+
+class SheetStream:
+    """쓰기 전용 시트에 제목·표·라벨 블록을 차례로 붙이며 현재 행 번호를 기억합니다."""
+
+    def __init__(self, writer: WorkbookWriter, title: str, widths: dict[int, float]):
+        self.writer = writer
+        self.ws = writer.wb.create_sheet(title=title)
+        self.row = 0
+
+        for j, width in widths.items():
+            self.ws.column_dimensions[get_column_letter(j)].width = width
+
+    @property
+    def title(self) -> str:
+        return self.ws.title
+
+    def cell(self, value, style: str):
+        return self._styled(value, self.writer.style(style, self.ws))
+
+    def _styled(self, value, style_array):
+        cell = WriteOnlyCell(self.ws, value=value)
+        cell._style = style_array
+        return cell
+
+    def append(self, row) -> int:
+        self.ws.append(row)
+        self.row += 1
+        return self.row
+
+    def blank(self, count: int = 1) -> int:
+        for _ in range(count):
+            self.append([])
+        return self.row
+
+    def text(self, value, style: str = "title") -> int:
+        """A열에 글자 한 칸짜리 행을 씁니다."""
+        return self.append([self.cell(value, style)])
+
+    def block(self, rows: Sequence[Sequence], label_style: str = "label", value_style: str = "value") -> int:
+        """첫 열은 라벨, 나머지는 값인 테두리 블록을 씁니다. 마지막 행 번호를 반환합니다."""
+        for values in rows:
+            self.append([
+                self.cell(value, label_style if j == 0 else value_style)
+                for j, value in enumerate(values)
+            ])
+
+        return self.row
+
+    def table(
+        self,
+        columns: Iterable,
+        body: Sequence[Sequence],
+        name_suffix: str = "A",
+        row_styles: Sequence[str | None] | None = None,
+        styled_columns: Iterable = (),
+    ) -> int:
+        """
+        가운데 정렬한 표를 쓰고 엑셀 표(Table)로 등록합니다. 마지막 행 번호를 반환합니다.
+
+        row_styles를 주면 본문 i행의 styled_columns 칸에 row_styles[i] 서식을 씁니다(None이면 가운데 정렬만).
+        """
+        header = [str(col) for col in columns]
+        start_row = self.row + 1
+
+        self.append([self.cell(value, "center") for value in header])
+
+        # 행 서식 이름별로 열마다 쓸 서식 배열을 한 번만 정해 둡니다.
+        center = self.writer.style("center", self.ws)
+        styled_positions = {header.index(str(col)) for col in styled_columns if str(col) in header}
+        layouts = {None: [center] * len(header)}
+
+        for i, values in enumerate(body):
+            row_style = row_styles[i] if row_styles is not None else None
+            layout = layouts.get(row_style)
+
+            if layout is None:
+                style = self.writer.style(row_style, self.ws)
+                layout = layouts[row_style] = [
+                    style if j in styled_positions else center for j in range(len(header))
+                ]
+
+            self.append([
+                None if value is None else self._styled(value, style)
+                for value, style in zip(values, layout)
+            ])
+
+        table = Table(
+            displayName=self.writer.table_name(self.title, name_suffix),
+            ref=f"A{start_row}:{get_column_letter(max(len(header), 1))}{self.row}",
+        )
+        table.tableStyleInfo = TableStyleInfo(name=TABLE_STYLE, showRowStripes=True)
+
+        # 헤더 셀을 다시 읽을 수 없으므로 열 이름을 직접 채웁니다.
+        # openpyxl은 채웠는지와 상관없이 쓰기 전용 시트면 경고를 내므로 그 경고만 숨깁니다.
+        table._initialise_columns()
+        for column, name in zip(table.tableColumns, header):
+            column.name = name
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="In write-only mode", category=UserWarning)
+            self.ws.add_table(table)
+
+        return self.row
+
+    def frame(self, df: pd.DataFrame, name_suffix: str = "A", **kwargs) -> int:
+        """DataFrame 하나를 표로 씁니다."""
+        return self.table(df.columns, table_rows(df), name_suffix=name_suffix, **kwargs)
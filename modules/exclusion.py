@@ -0,0 +1,76 @@
+"""컨벤션·썸머·매니저 업적이 함께 쓰는 제외 계약 판정과 제외사유 표시.
+
+`split_excluded`는 제외 조건별 불리언 마스크를 한 번만 계산해 유효 계약·제외 계약과
+함께 돌려주고, `exclusion_reasons`는 그 마스크로 제외사유 열을 만듭니다.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from .issue_flags import IssueFlags
+
+EXCL_PAYMETHOD = "일시납"
+EXCL_GROUP_PATTERN = r"연금성|저축성"
+EXCL_STATUS_PATTERN = r"철회|해약|실효"
+
+EXCLUSION_COLUMNS = ("납입방법", "상품군2", "계약상태")
+
+# (제외사유 표시, 검사 열, 패턴) — 제외사유는 이 순서로 " / "로 이어 붙입니다.
+EXCLUSION_RULES = (
+    ("일시납", "납입방법", EXCL_PAYMETHOD),
+    ("연금/저축성", "상품군2", EXCL_GROUP_PATTERN),
+    ("철회", "계약상태", "철회"),
+    ("해약", "계약상태", "해약"),
+    ("실효", "계약상태", "실효"),
+)
+UNKNOWN_REASON = "제외 조건 미상"
+
+
+def exclusion_masks(df: pd.DataFrame) -> pd.DataFrame:
+    """제외사유별 불리언 열을 가진 DataFrame. 검사 열이 없으면 해당 사유는 모두 False입니다."""
+    texts = {
+        column: df[column].astype(str).str.strip()
+        for column in EXCLUSION_COLUMNS
+        if column in df.columns
+    }
+    masks = {}
+    for label, column, pattern in EXCLUSION_RULES:
+        if column in texts:
+            masks[label] = texts[column].str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+        else:
+            masks[label] = False
+    return pd.DataFrame(masks, index=df.index)
+
+
+def split_excluded(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """(유효 계약, 제외 계약, 제외 계약의 사유 마스크)를 반환합니다.
+
+    - 일시납
+    - 연금성 / 저축성
+    - 철회 / 해약 / 실효
+    """
+    if not set(EXCLUSION_COLUMNS).issubset(df.columns):
+        return df.copy(deep=False), pd.DataFrame(), exclusion_masks(df.iloc[:0])
+
+    # 검사 열만 새로 만들고 나머지 열은 복사하지 않습니다(copy-on-write).
+    tmp = df.copy(deep=False)
+    for column in EXCLUSION_COLUMNS:
+        text = tmp[column].astype(str).str.strip()
+        if isinstance(tmp[column].dtype, pd.CategoricalDtype):
+            text = text.astype("category")
+        tmp[column] = text
+
+    masks = exclusion_masks(tmp)
+    is_excluded = masks.any(axis=1)
+    return tmp[~is_excluded], tmp[is_excluded], masks[is_excluded]
+
+
+def exclusion_reasons(masks: pd.DataFrame) -> pd.Series:
+    """사유 마스크를 `"철회 / 해약"` 형태의 제외사유 열로 바꿉니다."""
+    flags = IssueFlags(masks.index)
+    for label, _, _ in EXCLUSION_RULES:
+        flags.add(masks[label], label)
+    reasons = flags.reasons()
+    reasons[reasons.eq("")] = UNKNOWN_REASON
+    return reasons.astype(str)
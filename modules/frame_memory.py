@@ -0,0 +1,146 @@
+"""썸머·컨벤션·매니저 업적 계산 DataFrame의 메모리를 줄이는 도우미.
+
+- 값 종류가 적은 글자 열(수금자명·보험사·상품명 등)은 범주형으로 바꿉니다.
+- 순번·납입기간·환산율처럼 작은 정수 열은 담을 수 있는 가장 작은 정수형으로 줄입니다.
+  금액 열은 합계 정밀도와 곱셈 넘침을 피하려고 64비트 그대로 둡니다.
+- pandas 2에서도 copy-on-write를 켜서, 열 몇 개만 바꾸는 함수가 전체를 미리 복사하지
+  않고 얕은 복사본에서 바뀐 열만 새로 만들게 합니다. pandas 3은 기본값입니다.
+
+`memory_report`는 세션이 들고 있는 표의 현재 크기와, 범주형·정수 축소 전 형식이었을 때의
+크기를 나란히 보여 줍니다.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+def enable_copy_on_write() -> None:
+    """pandas 2에서 copy-on-write를 켭니다. pandas 3은 항상 켜져 있어 아무것도 하지 않습니다."""
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    categories: Iterable[str] = (),
+    integers: Iterable[str] = (),
+) -> pd.DataFrame:
+    """지정한 글자 열은 범주형, 정수 열은 가장 작은 정수형으로 바꾼 얕은 복사본을 반환합니다."""
+    df = df.copy(deep=False)
+
+    for column in categories:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+
+    for column in integers:
+        if column in df.columns and pd.api.types.is_integer_dtype(df[column].dtype):
+            df[column] = pd.to_numeric(df[column], downcast="integer")
+
+    return df
+
+
+def assign_values(df: pd.DataFrame, rows, column: str, values) -> None:
+    """
+    `df.loc[rows, column] = values`. 범주형 열이면 처음 보는 값을 범주에 먼저 더합니다.
+    `compact_frame`으로 줄인 정수 열에 담을 수 없는 값이 오면 열을 먼저 넓힙니다.
+    (검토 표에서 이름을 고치거나, 일부 행만 다시 계산해 덮어쓸 때)
+    """
+    series = df[column]
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        incoming = pd.Index(np.atleast_1d(np.asarray(values, dtype=object))).dropna().unique()
+        new = incoming.difference(series.cat.categories)
+
+        if len(new):
+            # 범주 순서는 정렬 순서로 유지해 수금자별 묶음·정렬 순서가 바뀌지 않게 합니다.
+            df[column] = series.cat.set_categories(series.cat.categories.union(new))
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "iu":
+        target = _integer_target(series.dtype, values)
+
+        if target != series.dtype:
+            df[column] = series.astype(target)
+
+    df.loc[rows, column] = values
+
+
+def _integer_target(dtype: np.dtype, values) -> np.dtype:
+    """
+    정수 열 `dtype`에 `values`를 넣을 수 있는 형식. 그대로 담기면 `dtype`, 정수(소수점 아래가 0인
+    실수 포함)가 범위를 넘으면 최솟값·최댓값이 들어가는 정수형, 그 밖의 실수면 실수형입니다.
+    """
+    incoming = np.atleast_1d(np.asarray(values))
+
+    if incoming.size == 0 or incoming.dtype.kind not in "iuf":
+        return dtype
+
+    if incoming.dtype.kind == "f":
+        if not (np.isfinite(incoming).all() and np.equal(np.mod(incoming, 1), 0).all()):
+            return np.result_type(dtype, incoming.dtype)
+        incoming = incoming.astype(np.int64)
+
+    low, high = incoming.min(), incoming.max()
+    bounds = np.iinfo(dtype)
+    if bounds.min <= low and high <= bounds.max:
+        return dtype
+
+    return np.result_type(dtype, np.min_scalar_type(low), np.min_scalar_type(high))
+
+
+def _expanded_bytes(df: pd.DataFrame) -> int:
+    """범주형은 원래 글자 열, 작은 정수 열은 int64였을 때의 메모리(바이트)."""
+    total = int(df.index.memory_usage(deep=True))
+
+    for column in df.columns:
+        series = df[column]
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(series.cat.categories.dtype)
+        elif pd.api.types.is_integer_dtype(series.dtype) and series.dtype.itemsize < 8:
+            series = series.astype("int64")
+
+        total += int(series.memory_usage(index=False, deep=True))
+
+    return total
+
+
+def memory_report(frames: dict[str, pd.DataFrame | None]) -> pd.DataFrame:
+    """표 이름별 행 수와 현재·축소 전 메모리(KB), 절감률."""
+    rows = []
+
+    for name, frame in frames.items():
+        if frame is None:
+            continue
+
+        current = int(frame.memory_usage(deep=True).sum())
+        expanded = _expanded_bytes(frame)
+        rows.append({
+            "표": name,
+            "행 수": len(frame),
+            "현재(KB)": round(current / 1024),
+            "축소 전(KB)": round(expanded / 1024),
+            "절감률": f"{1 - current / expanded:.0%}" if expanded else "-",
+        })
+
+    return pd.DataFrame(rows, columns=["표", "행 수", "현재(KB)", "축소 전(KB)", "절감률"])
+
+
+def render_memory_report(frames: dict[str, pd.DataFrame | None]) -> None:
+    report = memory_report(frames)
+
+    if report.empty:
+        return
+
+    current = report["현재(KB)"].sum() / 1024
+    expanded = report["축소 전(KB)"].sum() / 1024
+
+    with st.expander("🧮 이 세션의 표 메모리 사용량"):
+        st.caption(
+            f"현재 {current:,.2f}MB · 범주형·정수 축소 전 형식이었다면 {expanded:,.2f}MB "
+            "(같은 업로드로 화면을 다시 그리는 동안 유지되는 표 기준)"
+        )
+        st.dataframe(report, use_container_width=True, hide_index=True)
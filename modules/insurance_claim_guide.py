@@ -10,7 +10,6 @@ from pathlib import Path
 from typing import Iterable
 
 import pandas as pd
-import pdfplumber
 import streamlit as st
 import streamlit.components.v1 as components
 from reportlab.lib import colors
@@ -32,8 +31,12 @@ from reportlab.platypus import (
 )
 
 try:
+    from .coverage_cache import cached_extract
+    from .text_normalize import normalize_claim_text
     from .ui_components import page_header, section_intro
 except ImportError:  # 단독 파일 점검용
+    from coverage_cache import cached_extract
+    from text_normalize import normalize_claim_text
     from ui_components import page_header, section_intro
 
 
@@ -51,19 +54,6 @@ class DocumentRule:
     default_selected: bool = True
 
 
-@dataclass(frozen=True)
-class CoverageRow:
-    company: str
-    product: str
-    category: str
-    coverage: str
-    amount: str
-    contract_date: str
-    expiry_date: str
-    source_page: int
-    extraction_status: str = "정상 추출"
-
-
 CLAIM_GROUPS = {
     "의료비·기본 치료": [
         "실손 통원", "실손 입원", "약제비", "입원일당", "수술",
@@ -296,216 +286,8 @@ LIMIT_TERMS = {
 }
 
 
-INSURER_ALIASES = {
-    "DB손보": "DB손해보험", "KB손보": "KB손해보험", "NH손보": "NH농협손해보험",
-    "농협손해보험": "NH농협손해보험", "하나손보": "하나손해보험",
-    "신한생명": "신한라이프", "우체국": "우체국보험",
-}
-
-
-INSURER_PATTERN = re.compile(
-    r"DB손해보험|DB손보|KB손해보험|KB손보|현대해상|메리츠화재|한화손해보험|흥국화재|"
-    r"삼성화재|롯데손해보험|MG손해보험|NH농협손해보험|농협손해보험|NH손보|캐롯손해보험|하나손해보험|하나손보|"
-    r"신한라이프|신한생명|한화생명|교보생명|삼성생명|라이나생명|ABL생명|AIA생명|동양생명|"
-    r"흥국생명|NH농협생명|미래에셋생명|KDB생명|하나생명|IBK연금보험|처브라이프|"
-    r"우체국보험|우체국|새마을금고|수협"
-)
-
-
 def normalize_text(value: str) -> str:
-    value = str(value or "").lower()
-    value = value.replace("ㆍ", "").replace("·", "").replace("–", "-")
-    return re.sub(r"[\s()\[\]{},._/\\:]+", "", value)
-
-
-def normalize_company(value: str) -> str:
-    value = str(value or "").strip()
-    return INSURER_ALIASES.get(value, value)
-
-
-def parse_amount(value: str) -> str:
-    raw = str(value or "").strip()
-    if raw in {"", "-", "-원"}:
-        return "확인 필요"
-    match = re.search(r"[\d,]+(?:\.\d+)?", raw)
-    return f"{match.group(0)}만원" if match else raw
-
-
-def infer_coverage_category(category: str, coverage: str) -> str:
-    """담보명에 원인이 명시된 경우 PDF의 병합셀 위치보다 담보명을 우선한다."""
-    category = str(category or "").strip()
-    text = normalize_text(coverage)
-    surgery_rules = [
-        (("교통", "수술"), "교통상해수술"), (("자동차", "수술"), "교통상해수술"),
-        (("질병", "수술"), "질병수술"), (("상해", "수술"), "상해수술"), (("재해", "수술"), "상해수술"),
-        (("장기이식", "수술"), "기타수술"),
-        (("각막이식", "수술"), "기타수술"), (("조혈모세포", "수술"), "기타수술"),
-    ]
-    for terms, inferred in surgery_rules:
-        if all(normalize_text(term) in text for term in terms):
-            return inferred
-    return category
-
-
-def extract_pdf(pdf_bytes: bytes) -> dict:
-    pages_text: list[str] = []
-    pages_words: list[tuple[float, list[dict]]] = []
-    pages_tables: list[list[list[list[str | None]]]] = []
-    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-        for page in pdf.pages:
-            pages_text.append(page.extract_text(x_tolerance=2, y_tolerance=3, layout=True) or "")
-            pages_words.append((float(page.width), page.extract_words(x_tolerance=1, y_tolerance=2) or []))
-            pages_tables.append(page.extract_tables() or [])
-
-    first_text = "\n".join(pages_text[:2])
-    customer_match = re.search(r"([가-힣]{2,5})님을\s*위한", first_text)
-    report_match = re.search(r"작성일자\s*(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})", first_text)
-    customer = customer_match.group(1) if customer_match else "확인 필요"
-    report_date = (
-        f"{report_match.group(1)}.{int(report_match.group(2)):02d}.{int(report_match.group(3)):02d}"
-        if report_match else "확인 필요"
-    )
-
-    rows: list[CoverageRow] = []
-    for page_no, ((page_width, words), page_tables) in enumerate(zip(pages_words, pages_tables), start=1):
-        table_row_count = 0
-        for table in page_tables:
-            if not table:
-                continue
-            header_index = next(
-                (
-                    idx for idx, row in enumerate(table)
-                    if len(row) >= 7
-                    and "구분" in normalize_text(row[0] or "")
-                    and "회사" in normalize_text(row[1] or "")
-                    and "담보" in normalize_text(row[3] or "")
-                ),
-                None,
-            )
-            if header_index is None:
-                continue
-            current_category = ""
-            for cells in table[header_index + 1:]:
-                if len(cells) < 7:
-                    continue
-                category_cell = str(cells[0] or "").replace("\n", " ").strip()
-                if category_cell:
-                    current_category = category_cell
-                company_cell = str(cells[1] or "").replace("\n", " ").strip()
-                insurer_match = INSURER_PATTERN.search(company_cell)
-                if not insurer_match:
-                    continue
-                product = str(cells[2] or "").replace("\n", " ").strip()
-                coverage = str(cells[3] or "").replace("\n", " ").strip()
-                if coverage.startswith(")") and product.count("(") > product.count(")"):
-                    product += ")"
-                    coverage = coverage[1:].lstrip()
-                amount_raw = str(cells[4] or "").replace("\n", " ").strip()
-                contract_date = str(cells[5] or "").replace("\n", " ").strip()
-                expiry_date = str(cells[6] or "").replace("\n", " ").strip()
-                if not product or not coverage or not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?", contract_date):
-                    continue
-                if not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?|종신", expiry_date):
-                    expiry_date = "확인 필요"
-                category = infer_coverage_category(current_category, coverage)
-                rows.append(CoverageRow(
-                    company=normalize_company(insurer_match.group(0)), product=product, category=category,
-                    coverage=coverage, amount=parse_amount(amount_raw), contract_date=contract_date,
-                    expiry_date=expiry_date, source_page=page_no,
-                    extraction_status="담보명 잘림 가능성" if coverage.endswith(("(", "제", "갱", "지", "수")) else "정상 추출",
-                ))
-                table_row_count += 1
-        if table_row_count:
-            continue
-        if not words:
-            continue
-        scale = 595.28 / page_width if page_width else 1.0
-        line_groups: list[list[dict]] = []
-        for word in sorted(words, key=lambda item: (float(item["top"]), float(item["x0"]))):
-            if not line_groups or abs(float(word["top"]) - float(line_groups[-1][0]["top"])) > 2.2:
-                line_groups.append([word])
-            else:
-                line_groups[-1].append(word)
-
-        # 보장분류 셀은 여러 담보 행의 세로 중앙에 놓이는 경우가 있어
-        # 단순히 '이전 분류'를 물려주면 질병/상해 분류가 뒤바뀔 수 있다.
-        category_markers: list[tuple[float, str]] = []
-        for marker_words in line_groups:
-            marker_text = " ".join(
-                str(word["text"]).strip()
-                for word in sorted(marker_words, key=lambda item: float(item["x0"]))
-                if float(word["x0"]) * scale < 95
-            ).strip()
-            if marker_text and len(marker_text) <= 35:
-                category_markers.append((float(marker_words[0]["top"]), marker_text))
-
-        for line_words in line_groups:
-            fields = {"category": [], "company": [], "product": [], "coverage": [], "amount": [], "contract": [], "expiry": []}
-            for word in sorted(line_words, key=lambda item: float(item["x0"])):
-                x = float(word["x0"]) * scale
-                text = str(word["text"]).strip()
-                if x < 95:
-                    fields["category"].append(text)
-                elif x < 150:
-                    fields["company"].append(text)
-                elif x < 303:
-                    fields["product"].append(text)
-                elif x < 428:
-                    fields["coverage"].append(text)
-                elif x < 473:
-                    fields["amount"].append(text)
-                elif x < 528:
-                    fields["contract"].append(text)
-                else:
-                    fields["expiry"].append(text)
-
-            category_text = " ".join(fields["category"]).strip()
-            company_text = " ".join(fields["company"]).strip()
-            insurer_match = INSURER_PATTERN.search(company_text)
-            if not insurer_match:
-                continue
-            product = " ".join(fields["product"]).strip()
-            coverage = " ".join(fields["coverage"]).strip()
-            amount_raw = " ".join(fields["amount"]).strip()
-            contract_date = " ".join(fields["contract"]).strip()
-            expiry_date = " ".join(fields["expiry"]).strip()
-            if not product or not coverage or not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?", contract_date):
-                continue
-            if not re.fullmatch(r"\d{4}[-.]\d{1,2}(?:[-.]\d{1,2})?|종신", expiry_date):
-                expiry_date = "확인 필요"
-            if not category_text and category_markers:
-                row_top = float(line_words[0]["top"])
-                category_text = min(category_markers, key=lambda item: abs(item[0] - row_top))[1]
-            category_text = infer_coverage_category(category_text, coverage)
-            status = "담보명 잘림 가능성" if coverage.endswith(("(", "제", "갱", "지", "수")) else "정상 추출"
-            rows.append(
-                CoverageRow(
-                    company=normalize_company(insurer_match.group(0)),
-                    product=product,
-                    category=category_text,
-                    coverage=coverage,
-                    amount=parse_amount(amount_raw),
-                    contract_date=contract_date,
-                    expiry_date=expiry_date,
-                    source_page=page_no,
-                    extraction_status=status,
-                )
-            )
-
-    deduped: list[CoverageRow] = []
-    seen: set[tuple] = set()
-    for row in rows:
-        key = (row.company, row.product, row.coverage, row.amount, row.contract_date, row.expiry_date)
-        if key not in seen:
-            seen.add(key)
-            deduped.append(row)
-
-    return {
-        "customer": customer,
-        "report_date": report_date,
-        "coverages": [asdict(row) for row in deduped],
-        "page_count": len(pages_text),
-    }
+    return normalize_claim_text(value)
 
 
 def match_coverages(coverages: list[dict], selected_claims: list[str]) -> pd.DataFrame:
@@ -1349,9 +1131,15 @@ def run() -> None:
         pdf_bytes = uploaded.getvalue()
         file_hash = hashlib.sha256(pdf_bytes).hexdigest()
         if st.session_state.get("cg_pdf_hash") != file_hash:
+            progress_bar = st.progress(0.0, text="보장분석 PDF에서 가입내용을 확인하고 있습니다...")
             try:
-                with st.spinner("보장분석 PDF에서 가입내용을 확인하고 있습니다..."):
-                    parsed = extract_pdf(pdf_bytes)
+                parsed = cached_extract(
+                    pdf_bytes,
+                    file_hash,
+                    progress=lambda done, total: progress_bar.progress(
+                        done / total, text=f"보장분석 PDF에서 가입내용을 확인하고 있습니다... ({done}/{total}쪽)"
+                    ),
+                )
                 st.session_state["cg_pdf_hash"] = file_hash
                 st.session_state["cg_parsed_pdf"] = parsed
                 st.session_state.pop("cg_coverage_direct_editor", None)
@@ -1361,6 +1149,8 @@ def run() -> None:
                 st.session_state.pop("cg_parsed_pdf", None)
                 parsed = None
                 st.warning(f"지원되는 형식으로 가입내용을 확인하지 못했습니다. 서류 가이드는 계속 이용할 수 있습니다. ({exc})")
+            finally:
+                progress_bar.empty()
     elif st.session_state.get("cg_pdf_hash"):
         st.session_state.pop("cg_pdf_hash", None)
         st.session_state.pop("cg_parsed_pdf", None)
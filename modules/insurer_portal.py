@@ -10,8 +10,10 @@ from urllib.parse import urlparse
 import streamlit as st
 
 try:
+    from modules.text_normalize import normalize_search_text
     from modules.ui_components import page_header
 except ImportError:  # 모듈 단독 미리보기용
+    from text_normalize import normalize_search_text
     from ui_components import page_header
 
 
@@ -175,7 +177,7 @@ def _main_portal_card() -> str:
 
 
 def _normalized_search_text(value: object) -> str:
-    return "".join(str(value).lower().split())
+    return normalize_search_text(value)
 
 
 def _home_search_result(insurer: dict[str, object]) -> str:
@@ -0,0 +1,52 @@
+"""행별 데이터 확인 사유를 비트마스크로 모으는 도우미.
+
+검사 하나마다 비트 하나를 배정해 정수 열에 OR로 누적하고, 사람이 읽는 사유 문자열은
+마지막에 표시된 행에 대해서만 만듭니다. 같은 비트 조합은 한 번만 문자열로 바꾸므로
+행 수가 많아도 검사 수 × 행 수만큼 파이썬 코드를 돌지 않습니다.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+REASON_SEPARATOR = " / "
+
+
+class IssueFlags:
+    """`add(mask, message)`로 검사 결과를 쌓고 `reasons()`로 사유 문자열을 얻습니다."""
+
+    def __init__(self, index: pd.Index):
+        self.index = index
+        self.messages: list[str] = []
+        self.bits = np.zeros(len(index), dtype=np.uint64)
+
+    def add(self, mask, message: str) -> None:
+        if message in self.messages:
+            bit = np.uint64(1 << self.messages.index(message))
+        else:
+            if len(self.messages) >= 64:
+                raise ValueError("확인 사유는 64개까지 등록할 수 있습니다.")
+            bit = np.uint64(1 << len(self.messages))
+            self.messages.append(message)
+        values = np.asarray(pd.Series(mask, index=self.index).fillna(False), dtype=bool)
+        self.bits[values] |= bit
+
+    def codes(self) -> pd.Series:
+        """행별 비트마스크 정수 열. 0이면 확인 사유가 없습니다."""
+        return pd.Series(self.bits, index=self.index, name="확인사유코드")
+
+    def reasons(self) -> pd.Series:
+        """행별 사유 문자열. 등록 순서대로 `" / "`로 잇고, 사유가 없으면 빈 문자열입니다."""
+        out = np.full(len(self.index), "", dtype=object)
+        flagged = self.bits != 0
+        if flagged.any():
+            uniques, inverse = np.unique(self.bits[flagged], return_inverse=True)
+            labels = np.array([self.describe(int(code)) for code in uniques], dtype=object)
+            out[flagged] = labels[inverse]
+        return pd.Series(out, index=self.index, dtype="object")
+
+    def describe(self, code: int) -> str:
+        return REASON_SEPARATOR.join(
+            message for position, message in enumerate(self.messages) if code >> position & 1
+        )
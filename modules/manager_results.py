@@ -1,68 +1,70 @@
 import streamlit as st
 import pandas as pd
 from io import BytesIO
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.styles import Alignment, Font
 import os
-import re
 import numpy as np
+import pyarrow as pa
 import hashlib
 from .ui_components import page_header, section_intro
+from .rate_engine import (
+    HANWHA_LIFE,
+    LIFE_CLASSES,
+    NONLIFE_CLASSES,
+    UNCLASSIFIED,
+    RateTable,
+    classify_insurers,
+)
+from .xlsx_reader import XlsxReadError, read_frame, read_header
+from .issue_flags import IssueFlags
+from .contract_loader import CATEGORY_COLUMNS, plain_columns
+from .frame_memory import assign_values, compact_frame, render_memory_report
+from .exclusion import exclusion_masks, exclusion_reasons, split_excluded
+from .download_cache import XLSX_MIME, deferred_workbook, frame_digest
+from .excel_writer import (
+    LABEL_FILL,
+    THIN_BORDER,
+    WorkbookWriter,
+    column_widths,
+    merge_widths,
+    split_rows,
+    table_widths,
+)
+from .table_format import SIGNED_WON, WON, YEARS, date_column, number_column
+from .contract_merge import SOURCE_COLUMN, merge_uploads, upload_scope
+from .score_history import (
+    load_rank_history,
+    month_over_month,
+    monthly_history,
+    moving_average,
+    previous_month,
+    rank_history,
+    save_snapshot,
+    scope_history,
+)
 
 
 # ── 전역 상수 ────────────────────────────────────────────────
-TABLE_SEQ = 0
-
-# 제외 조건 키워드
-EXCL_PAYMETHOD = "일시납"
-EXCL_GROUP_PATTERN = r"연금성|저축성"
-EXCL_STATUS_PATTERN = r"철회|해약|실효"
-
 # 환산 기준(%)
 RATE_LT10 = 50              # 10년납 미만
 RATE_LT10_HANWHA = 70       # 10년납 미만 한화생명
 RATE_LIFE_10P = 80          # 10년납 이상 생명보험
 RATE_NONLIFE_10P = 180      # 10년납 이상 손해보험
 
+# 위에서부터 처음 맞는 규칙을 적용합니다. 손해보험이 아닌 보험사는 생명보험으로 봅니다.
+MANAGER_RATE_TABLE = RateTable.from_records("매니저업적", [
+    {"insurers": [HANWHA_LIFE], "rate": RATE_LT10_HANWHA, "max_term": 10},
+    {"rate": RATE_LT10, "max_term": 10},
+    {"insurers": [*LIFE_CLASSES, UNCLASSIFIED], "rate": RATE_LIFE_10P, "min_term": 10},
+    {"insurers": list(NONLIFE_CLASSES), "rate": RATE_NONLIFE_10P, "min_term": 10},
+])
 
-# ── 유틸 ────────────────────────────────────────────────────
-def unique_sheet_name(wb, base, limit=31):
-    name = str(base)[:limit] if base else "Sheet"
-
-    if name not in wb.sheetnames:
-        return name
-
-    i = 2
-    while True:
-        suffix = f"_{i}"
-        trunc = limit - len(suffix)
-        cand = f"{name[:trunc]}{suffix}"
-
-        if cand not in wb.sheetnames:
-            return cand
-
-        i += 1
-
-
-def safe_table_name(base: str) -> str:
-    name = re.sub(r"[^A-Za-z0-9_]", "_", base)
-
-    if not re.match(r"^[A-Za-z_]", name):
-        name = f"tbl_{name}"
-
-    return name[:254]
 
-
-def header_idx(ws, name, default=None):
-    for i in range(1, ws.max_column + 1):
-        if ws.cell(row=1, column=i).value == name:
-            return i
-
-    return default
+# 여러 파일을 합칠 때 같은 계약을 찾는 열 (계약일과 함께 씁니다)
+POLICY_COLUMN = "증권번호"
 
 
+# ── 유틸 ────────────────────────────────────────────────────
 def format_money(x):
     try:
         return f"{float(x):,.0f} 원"
@@ -70,46 +72,12 @@ def format_money(x):
         return ""
 
 
-def autosize_columns_fast(ws, df: pd.DataFrame, padding=5, max_width=45):
-    """
-    전체 셀을 스캔하지 않고,
-    헤더 + 상위 30행 샘플 기준으로 열 너비를 조정합니다.
-    """
-    if df is None:
-        return
-
-    if df.empty:
-        for j, col in enumerate(df.columns, 1):
-            letter = ws.cell(row=1, column=j).column_letter
-            ws.column_dimensions[letter].width = min(
-                max(len(str(col)) + padding, 10),
-                max_width,
-            )
-        return
-
-    sample = df.head(30).fillna("").astype(str)
-
-    for j, col in enumerate(df.columns, 1):
-        header_len = len(str(col))
-
-        if col in sample.columns:
-            lengths = sample[col].fillna("").astype(str).str.len()
-            sample_max = int(lengths.max()) if not lengths.empty else 0
-        else:
-            sample_max = 0
-
-        width = min(
-            max(header_len, sample_max) + padding,
-            max_width,
-        )
-
-        letter = ws.cell(row=1, column=j).column_letter
-        ws.column_dimensions[letter].width = width
-
-
 # ── 데이터 로딩 ───────────────────────────────────────────────
 @st.cache_data(show_spinner=False)
 def load_df_from_bytes(file_bytes: bytes) -> pd.DataFrame:
+    """
+    계산에 쓰는 열만 읽습니다. 증권번호 열이 있으면 여러 파일을 합칠 때 같은 계약을 찾도록 함께 읽습니다.
+    """
     columns_needed = [
         "수금자명",
         "계약일",
@@ -123,10 +91,31 @@ def load_df_from_bytes(file_bytes: bytes) -> pd.DataFrame:
         "계약상태",
     ]
 
-    return pd.read_excel(
-        BytesIO(file_bytes),
-        usecols=columns_needed
+    try:
+        header = read_header(file_bytes)
+        fast = True
+    except XlsxReadError:
+        header = pd.read_excel(BytesIO(file_bytes), nrows=0).columns
+        fast = False
+
+    policy = next(
+        (str(value) for value in header if value is not None and str(value).strip() == POLICY_COLUMN),
+        None,
     )
+    usecols = columns_needed + ([policy] if policy else [])
+
+    if fast:
+        df = read_frame(file_bytes, usecols=usecols)
+    else:
+        df = pd.read_excel(
+            BytesIO(file_bytes),
+            usecols=usecols
+        )
+
+    if policy:
+        df = df.rename(columns={policy: POLICY_COLUMN})
+
+    return compact_frame(df, categories=CATEGORY_COLUMNS)
 
 
 def exclude_contracts(df: pd.DataFrame):
@@ -135,37 +124,18 @@ def exclude_contracts(df: pd.DataFrame):
     - 일시납
     - 연금성 / 저축성
     - 철회 / 해약 / 실효
-    """
-    needed = {"납입방법", "상품군2", "계약상태"}
-
-    if not needed.issubset(df.columns):
-        return df.copy(), pd.DataFrame()
-
-    tmp = df.copy()
-
-    tmp["납입방법"] = tmp["납입방법"].astype(str).str.strip()
-    tmp["상품군2"] = tmp["상품군2"].astype(str).str.strip()
-    tmp["계약상태"] = tmp["계약상태"].astype(str).str.strip()
-
-    is_lumpsum = tmp["납입방법"].str.contains(EXCL_PAYMETHOD, na=False)
-    is_savings = tmp["상품군2"].str.contains(EXCL_GROUP_PATTERN, regex=True, na=False)
-    is_bad_status = tmp["계약상태"].str.contains(EXCL_STATUS_PATTERN, regex=True, na=False)
-
-    is_excluded = is_lumpsum | is_savings | is_bad_status
 
-    return tmp[~is_excluded].copy(), tmp[is_excluded].copy()
+    (유효 계약, 제외 계약, 제외 계약의 사유별 마스크)를 반환합니다.
+    """
+    return split_excluded(df)
 
 
 def find_critical_issues(df: pd.DataFrame) -> pd.Series:
     """계산 또는 제외 판단에 필요한 값의 누락·형식 오류를 행별로 반환합니다."""
-    issues = pd.Series("", index=df.index, dtype="object")
+    issues = IssueFlags(df.index)
 
     def add_issue(mask, message):
-        nonlocal issues
-        mask = pd.Series(mask, index=df.index).fillna(False)
-        issues.loc[mask] = issues.loc[mask].apply(
-            lambda current: f"{current} / {message}" if current else message
-        )
+        issues.add(mask, message)
 
     def blank_mask(column):
         if column not in df.columns:
@@ -188,7 +158,7 @@ def find_critical_issues(df: pd.DataFrame) -> pd.Series:
     )
     add_issue(share.isna() | (share < 0), "쉐어율 확인 필요")
 
-    return issues
+    return issues.reasons()
 
 
 def build_review_display(review_df: pd.DataFrame) -> pd.DataFrame:
@@ -225,7 +195,9 @@ def build_review_display(review_df: pd.DataFrame) -> pd.DataFrame:
     return out[base_cols]
 
 
-def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
+def build_excluded_with_reason(
+    exdf: pd.DataFrame, reason_masks: pd.DataFrame | None = None
+) -> pd.DataFrame:
     base_cols = [
         "수금자명",
         "계약일자",
@@ -242,29 +214,9 @@ def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
 
     tmp = exdf.copy()
 
-    def reason_row(row):
-        reasons = []
-
-        if EXCL_PAYMETHOD in str(row.get("납입방법", "")):
-            reasons.append("일시납")
-
-        if re.search(EXCL_GROUP_PATTERN, str(row.get("상품군2", ""))):
-            reasons.append("연금/저축성")
-
-        status = str(row.get("계약상태", ""))
-
-        if "철회" in status:
-            reasons.append("철회")
-
-        if "해약" in status:
-            reasons.append("해약")
-
-        if "실효" in status:
-            reasons.append("실효")
-
-        return " / ".join(reasons) if reasons else "제외 조건 미상"
-
-    tmp["제외사유"] = tmp.apply(reason_row, axis=1)
+    if reason_masks is None:
+        reason_masks = exclusion_masks(tmp)
+    tmp["제외사유"] = exclusion_reasons(reason_masks.reindex(tmp.index, fill_value=False))
 
     out = tmp[
         [
@@ -306,30 +258,27 @@ def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
 def classify_insurance_type(ins_series: pd.Series) -> pd.Series:
     """
     보험사명 기준 구분:
-    - 손해 / 손보 / 화재 / 해상 포함: 손해보험
+    - 손해 / 손보 / 화재 / 해상 포함(우대 손해보험사 포함): 손해보험
     - 그 외: 생명보험
+
+    보험사명 종류별로 한 번만 판정하고 행에 되돌립니다. (rate_engine)
     """
-    s = ins_series.astype(str).str.strip()
+    classes = classify_insurers(ins_series)
+    return np.where(classes.isin(NONLIFE_CLASSES), "손해보험", "생명보험")
 
-    is_nonlife = s.str.contains(
-        r"손해|손보|화재|해상",
-        regex=True,
-        na=False
-    )
 
-    return np.where(is_nonlife, "손해보험", "생명보험")
+# 계산 결과를 범주형·작은 정수형으로 줄일 열 (frame_memory)
+COMPACT_CATEGORIES = ("수금자명", "보험사", "보험구분", "상품명", "납입방법", "상품군2", "계약상태")
+COMPACT_INTEGERS = ("_원본행번호", "납입기간_num", "환산율")
 
 
 @st.cache_data(show_spinner=False)
 def compute_manager_score(df_valid: pd.DataFrame) -> pd.DataFrame:
-    df = df_valid.copy()
-
-    df.rename(
+    df = df_valid.rename(
         columns={
             "계약일": "계약일자",
             "초회보험료": "보험료",
         },
-        inplace=True,
     )
 
     df["납입기간_num"] = pd.to_numeric(
@@ -339,27 +288,10 @@ def compute_manager_score(df_valid: pd.DataFrame) -> pd.DataFrame:
 
     df["보험구분"] = classify_insurance_type(df["보험사"])
 
-    is_hanwha_life = df["보험사"].astype(str).str.contains(
-        "한화생명",
-        na=False
+    df["환산율"] = MANAGER_RATE_TABLE.apply(
+        classify_insurers(df["보험사"]), df["납입기간_num"]
     )
 
-    df["환산율"] = np.select(
-        [
-            (df["납입기간_num"] < 10) & is_hanwha_life,
-            (df["납입기간_num"] < 10) & (~is_hanwha_life),
-            (df["납입기간_num"] >= 10) & (df["보험구분"] == "생명보험"),
-            (df["납입기간_num"] >= 10) & (df["보험구분"] == "손해보험"),
-        ],
-        [
-            RATE_LT10_HANWHA,
-            RATE_LT10,
-            RATE_LIFE_10P,
-            RATE_NONLIFE_10P,
-        ],
-        default=0,
-    ).astype(int)
-
     # 쉐어율은 이미 보험료에 반영되어 입력된 값이므로,
     # 여기서는 화면 표시용으로만 정리합니다.
     df["쉐어율"] = df["쉐어율"].apply(
@@ -379,12 +311,12 @@ def compute_manager_score(df_valid: pd.DataFrame) -> pd.DataFrame:
         errors="coerce"
     )
 
-    return df
+    return compact_frame(df, categories=COMPACT_CATEGORIES, integers=COMPACT_INTEGERS)
 
 
 # ── 요약 / 랭킹 ──────────────────────────────────────────────
 def make_group_with_ranks(df: pd.DataFrame) -> pd.DataFrame:
-    group = df.groupby("수금자명", dropna=False).agg(
+    group = df.groupby("수금자명", dropna=False, observed=True).agg(
         건수=("수금자명", "size"),
         실적보험료합계=("실적보험료", "sum"),
         환산금액합계=("환산금액", "sum"),
@@ -446,20 +378,66 @@ def top3_tables(group: pd.DataFrame):
 
 
 # ── 화면 표 가공 ─────────────────────────────────────────────
-def to_styled(df: pd.DataFrame) -> pd.DataFrame:
-    styled = df.copy()
-
-    styled["계약일자"] = pd.to_datetime(
-        styled["계약일자"],
+DETAIL_COLUMNS = [
+    "수금자명",
+    "계약일자",
+    "보험사",
+    "보험구분",
+    "상품명",
+    "납입기간",
+    "보험료",
+    "쉐어율",
+    "실적보험료",
+    "환산율",
+    "환산금액",
+]
+
+# 상세 표 숫자 열 서식. 화면은 숫자 그대로 두고 브라우저에서 단위를 붙입니다.
+DETAIL_COLUMN_CONFIG = {
+    "계약일자": date_column(),
+    "납입기간": number_column(YEARS),
+    "보험료": number_column(WON),
+    "쉐어율": number_column("%g %%"),
+    "실적보험료": number_column(WON),
+    "환산율": number_column("%g %%"),
+    "환산금액": number_column(WON),
+}
+
+# 수금자별 요약 화면 서식. 엑셀은 `format_money`로 바꾼 글자 표를 씁니다.
+GROUP_COLUMN_CONFIG = {
+    "실적보험료합계": number_column(WON),
+    "환산금액합계": number_column(WON),
+}
+
+
+def display_table(df: pd.DataFrame) -> pd.DataFrame:
+    """상세 표. 열 순서만 화면용으로 맞추고 값은 숫자·날짜 그대로 둡니다."""
+    table = df.copy(deep=False)
+
+    table["계약일자"] = pd.to_datetime(
+        table["계약일자"],
         errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
+    )
 
-    styled["납입기간"] = styled["납입기간_num"].astype(int).astype(str) + "년"
+    table["납입기간"] = table["납입기간_num"]
 
-    styled["보험료"] = pd.to_numeric(
-        styled["보험료"],
+    table["보험료"] = pd.to_numeric(
+        table["보험료"],
         errors="coerce"
-    ).fillna(0).map("{:,.0f} 원".format)
+    ).fillna(0)
+
+    return table[DETAIL_COLUMNS]
+
+
+def to_styled(df: pd.DataFrame) -> pd.DataFrame:
+    """엑셀 다운로드용 상세 표. `display_table` 값을 원·%·년 글자로 바꿉니다."""
+    styled = display_table(df)
+
+    styled["계약일자"] = styled["계약일자"].dt.strftime("%Y-%m-%d")
+
+    styled["납입기간"] = styled["납입기간"].astype(int).astype(str) + "년"
+
+    styled["보험료"] = styled["보험료"].map("{:,.0f} 원".format)
 
     styled["쉐어율"] = styled["쉐어율"].astype(str) + " %"
 
@@ -469,21 +447,7 @@ def to_styled(df: pd.DataFrame) -> pd.DataFrame:
 
     styled["환산금액"] = styled["환산금액"].map("{:,.0f} 원".format)
 
-    return styled[
-        [
-            "수금자명",
-            "계약일자",
-            "보험사",
-            "보험구분",
-            "상품명",
-            "납입기간",
-            "보험료",
-            "쉐어율",
-            "실적보험료",
-            "환산율",
-            "환산금액",
-        ]
-    ]
+    return styled
 
 
 def sums(df: pd.DataFrame):
@@ -491,249 +455,216 @@ def sums(df: pd.DataFrame):
 
 
 # ── 엑셀 출력 ────────────────────────────────────────────────
-def write_table(
-    ws,
-    df_for_sheet: pd.DataFrame,
-    start_row: int = 1,
-    name_suffix: str = "A",
-):
-    global TABLE_SEQ
-
-    r_idx = start_row - 1
-
-    for r_idx, row in enumerate(
-        dataframe_to_rows(df_for_sheet, index=False, header=True),
-        start_row,
-    ):
-        for c_idx, value in enumerate(row, 1):
-            cell = ws.cell(
-                row=r_idx,
-                column=c_idx,
-                value=value,
-            )
-            cell.alignment = Alignment(
-                horizontal="center",
-                vertical="center",
-            )
+MONEY_COLUMNS_MIN_WIDTH = 20
+
+# 수금자 시트 합계 행 서식 (공용 기본 서식에 더합니다)
+WORKBOOK_STYLES = {
+    "total_label": {"alignment": Alignment(horizontal="center"), "fill": LABEL_FILL, "border": THIN_BORDER},
+    "total_value": {
+        "font": Font(bold=True),
+        "alignment": Alignment(horizontal="center"),
+        "fill": LABEL_FILL,
+        "border": THIN_BORDER,
+    },
+}
+
+
+def totals_row(sheet, columns, perf, score) -> int:
+    """표 아래 한 줄을 띄우고 `총 합계 | 실적보험료 | 환산금액` 합계 행을 씁니다."""
+    sheet.blank()
+
+    columns = list(columns)
+    col_rate = columns.index("환산율") + 1 if "환산율" in columns else 1
+    col_perf = columns.index("실적보험료") + 1 if "실적보험료" in columns else 2
+    col_score = columns.index("환산금액") + 1 if "환산금액" in columns else 3
+
+    values = {
+        col_rate: sheet.cell("총 합계", "total_label"),
+        col_perf: sheet.cell(f"{perf:,.0f} 원", "total_value"),
+        col_score: sheet.cell(f"{score:,.0f} 원", "total_value"),
+    }
 
-    end_col_letter = ws.cell(
-        row=start_row,
-        column=df_for_sheet.shape[1],
-    ).column_letter
+    return sheet.append([values.get(j) for j in range(1, max(values) + 1)])
 
-    last_row = r_idx if df_for_sheet.shape[0] > 0 else start_row
 
-    TABLE_SEQ += 1
+def build_workbook(
+    df: pd.DataFrame,
+    group: pd.DataFrame,
+    excluded_disp_all: pd.DataFrame,
+    top_amt: pd.DataFrame,
+    top_cnt: pd.DataFrame,
+):
+    writer = WorkbookWriter(styles=WORKBOOK_STYLES)
 
-    display_name = safe_table_name(
-        f"tbl_{ws.title}_{name_suffix}_{TABLE_SEQ}"
-    )
+    top_amt_x = top_amt.copy()
+    top_amt_x["환산금액합계"] = top_amt_x["환산금액합계"].map(format_money)
 
-    table = Table(
-        displayName=display_name,
-        ref=f"A{start_row}:{end_col_letter}{last_row}",
+    summary_fmt = group.copy().drop(
+        columns=["환산금액순위", "건수순위"],
+        errors="ignore",
     )
 
-    table.tableStyleInfo = TableStyleInfo(
-        name="TableStyleMedium9",
-        showRowStripes=True,
+    summary_fmt = summary_fmt.sort_values(
+        ["환산금액합계", "건수", "수금자명"],
+        ascending=[False, False, True],
     )
 
-    ws.add_table(table)
-
-    autosize_columns_fast(ws, df_for_sheet, padding=5)
+    summary_fmt["실적보험료합계"] = summary_fmt["실적보험료합계"].map(format_money)
+    summary_fmt["환산금액합계"] = summary_fmt["환산금액합계"].map(format_money)
 
-    return last_row
+    summary_tables = [
+        ("환산금액합계 TOP3(동률 포함)", top_amt_x, "TOPAMT"),
+        ("건수 TOP3(동률 포함)", top_cnt, "TOPCNT"),
+        ("수금자별 요약(전체)", summary_fmt, "SUM"),
+    ]
 
+    if not excluded_disp_all.empty:
+        summary_tables.append(("제외 계약 목록", excluded_disp_all, "EXC"))
 
-def totals_block(ws, perf, score, start_row: int):
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
+    ws_summary = writer.sheet(
+        "요약",
+        merge_widths(*(table_widths(table) for _, table, _ in summary_tables)),
     )
 
-    fill = PatternFill("solid", fgColor="F2F2F2")
-
-    col_rate = header_idx(ws, "환산율", 1)
-    col_perf = header_idx(ws, "실적보험료", 2)
-    col_score = header_idx(ws, "환산금액", 3)
+    for i, (title, table, suffix) in enumerate(summary_tables):
+        if i:
+            ws_summary.blank()
 
-    row = start_row + 2
+        ws_summary.text(title, "bold")
+        ws_summary.frame(table, name_suffix=suffix)
 
-    ws.cell(
-        row=row,
-        column=col_rate,
-        value="총 합계",
-    ).alignment = Alignment(horizontal="center")
+    # 수금자별 시트: 서식 변환·합계·분할은 수금자마다 다시 거르지 않고 전체에서 한 번씩만 합니다.
+    keys = df["수금자명"].astype(str)
+    styled = to_styled(df)
+    contracts = split_rows(styled, keys)
+    totals = df.groupby(keys, sort=True)[["실적보험료", "환산금액"]].sum()
 
-    c1 = ws.cell(
-        row=row,
-        column=col_perf,
-        value=f"{perf:,.0f} 원",
-    )
-
-    c2 = ws.cell(
-        row=row,
-        column=col_score,
-        value=f"{score:,.0f} 원",
-    )
+    excluded = {}
+    if not excluded_disp_all.empty:
+        excluded = split_rows(excluded_disp_all, excluded_disp_all["수금자명"].astype(str))
 
-    for c in (c1, c2):
-        c.font = Font(bold=True)
-        c.alignment = Alignment(horizontal="center")
+    for collector, (perf, score) in totals.iterrows():
+        body, lengths = contracts[collector]
+        widths = column_widths(styled.columns, lengths)
 
-    for c in [col_rate, col_perf, col_score]:
-        cell = ws.cell(row=row, column=c)
-        cell.fill = fill
-        cell.border = thin_border
+        for header in ["실적보험료", "환산금액"]:
+            j = styled.columns.get_loc(header) + 1
+            widths[j] = max(widths[j], MONEY_COLUMNS_MIN_WIDTH)
 
-    return row
+        ex_body, ex_lengths = excluded.get(collector, (None, None))
+        if ex_body is not None:
+            widths = merge_widths(widths, column_widths(excluded_disp_all.columns, ex_lengths))
 
+        ws = writer.sheet(collector, widths)
 
-def build_workbook(
-    df: pd.DataFrame,
-    group: pd.DataFrame,
-    excluded_disp_all: pd.DataFrame,
-    top_amt: pd.DataFrame,
-    top_cnt: pd.DataFrame,
-):
-    wb = Workbook()
+        ws.table(styled.columns, body, name_suffix="NORM")
+        totals_row(ws, styled.columns, float(perf), float(score))
 
-    ws_summary = wb.active
-    ws_summary.title = "요약"
+        if ex_body is not None:
+            ws.blank()
+            ws.text("제외 계약", "bold")
+            ws.table(excluded_disp_all.columns, ex_body, name_suffix="EXC")
 
-    r = 1
+    return writer.wb
 
-    ws_summary.cell(
-        row=r,
-        column=1,
-        value="환산금액합계 TOP3(동률 포함)",
-    ).font = Font(bold=True)
 
-    top_amt_x = top_amt.copy()
-    top_amt_x["환산금액합계"] = top_amt_x["환산금액합계"].map(format_money)
+# ── 업로드 범위 ─────────────────────────────────────────────
+SCOPE_COLUMN_CONFIG = {
+    "계약 수": number_column("%d건", help="중복을 뺀 뒤 남은 계약 수"),
+    "중복 제외": number_column("%d건", help="뒤에 올린 파일에 증권번호·계약일·수금자명이 같은 행이 있어 뺀 행 수"),
+    "계약일 시작": date_column(),
+    "계약일 끝": date_column(),
+    "수금자 수": number_column("%d명"),
+}
 
-    r = write_table(
-        ws_summary,
-        top_amt_x,
-        start_row=r + 1,
-        name_suffix="TOPAMT",
-    ) + 2
-
-    ws_summary.cell(
-        row=r,
-        column=1,
-        value="건수 TOP3(동률 포함)",
-    ).font = Font(bold=True)
-
-    r = write_table(
-        ws_summary,
-        top_cnt.copy(),
-        start_row=r + 1,
-        name_suffix="TOPCNT",
-    ) + 2
-
-    ws_summary.cell(
-        row=r,
-        column=1,
-        value="수금자별 요약(전체)",
-    ).font = Font(bold=True)
 
-    summary_fmt = group.copy().drop(
-        columns=["환산금액순위", "건수순위"],
-        errors="ignore",
-    )
+def render_upload_scope(raw: pd.DataFrame, duplicates: pd.DataFrame, files_without_policy: list[str]) -> None:
+    """여러 파일을 합쳤거나 중복 계약을 뺐을 때, 계산 전에 합친 범위를 보여 줍니다."""
+    if raw[SOURCE_COLUMN].cat.categories.size < 2 and duplicates.empty:
+        return
 
-    summary_fmt = summary_fmt.sort_values(
-        ["환산금액합계", "건수", "수금자명"],
-        ascending=[False, False, True],
+    section_intro("합친 범위", "업로드 파일 합산 범위", "파일별 계약 수와 계약일 범위를 확인한 뒤 아래 결과를 보세요.")
+    st.dataframe(
+        upload_scope(raw, duplicates),
+        use_container_width=True,
+        hide_index=True,
+        column_config=SCOPE_COLUMN_CONFIG,
     )
 
-    summary_fmt["실적보험료합계"] = summary_fmt["실적보험료합계"].map(format_money)
-    summary_fmt["환산금액합계"] = summary_fmt["환산금액합계"].map(format_money)
-
-    r = write_table(
-        ws_summary,
-        summary_fmt,
-        start_row=r + 1,
-        name_suffix="SUM",
-    ) + 1
+    if not duplicates.empty:
+        st.caption(
+            f"증권번호·계약일·수금자명이 같은 행 {len(duplicates):,}건은 나중에 올린 파일의 행만 남겼습니다."
+        )
 
-    if not excluded_disp_all.empty:
-        ws_summary.cell(
-            row=r + 1,
-            column=1,
-            value="제외 계약 목록",
-        ).font = Font(bold=True)
-
-        write_table(
-            ws_summary,
-            excluded_disp_all,
-            start_row=r + 2,
-            name_suffix="EXC",
+    if files_without_policy:
+        st.warning(
+            "증권번호 열이 없어 중복 확인을 하지 못한 파일: " + ", ".join(files_without_policy)
         )
 
-    collectors = sorted(
-        df["수금자명"].astype(str).unique().tolist()
-    )
 
-    for collector in collectors:
-        sub = df[df["수금자명"].astype(str) == collector].copy()
+# ── 순위 추이 ───────────────────────────────────────────────
+MOM_COLUMN_CONFIG = {
+    "순위변동": number_column("%+d", help="전 달보다 올라간 순위 계단 수. 빈 칸은 전 달 스냅샷에 없던 수금자입니다."),
+    "환산금액합계": number_column(WON),
+    "전월환산금액합계": number_column(WON),
+    "환산금액증감": number_column(SIGNED_WON),
+    "건수증감": number_column("%+d건"),
+}
 
-        ws = wb.create_sheet(
-            title=unique_sheet_name(wb, collector)
-        )
 
-        styled_sub = to_styled(sub)
+def store_snapshot(df_all: pd.DataFrame) -> None:
+    """전체 수금자 환산 결과를 기준일 스냅샷으로 저장합니다. 저장하지 못해도 계산 화면은 그대로 씁니다."""
+    try:
+        day = save_snapshot(df_all, make_group_with_ranks(df_all), frame_digest(df_all))
+    except (OSError, pa.ArrowException) as e:
+        # 디스크 오류뿐 아니라 parquet으로 바꿀 수 없는 열(값 형식이 섞인 범주형 등)도 화면을 멈추지 않습니다.
+        st.caption(f"순위 추이용 스냅샷을 저장하지 못했습니다: {e}")
+        return
 
-        table_last_row = write_table(
-            ws,
-            styled_sub,
-            start_row=1,
-            name_suffix="NORM",
-        )
+    if day is None:
+        st.caption("계약일자를 날짜로 읽을 수 없어 순위 추이용 스냅샷을 저장하지 않았습니다.")
 
-        for header in ["실적보험료", "환산금액"]:
-            idx = header_idx(ws, header)
 
-            if idx:
-                col_letter = ws.cell(row=1, column=idx).column_letter
-                cur = ws.column_dimensions[col_letter].width
+def render_rank_trends(selected_collectors: list[str], collectors: list[str]) -> None:
+    """지금 올린 자료의 수금자(`collectors`)와 가장 많이 겹치는 범위의 스냅샷으로 추이를 보여 줍니다."""
+    history = scope_history(load_rank_history(), collectors)
 
-                ws.column_dimensions[col_letter].width = (
-                    20 if cur is None or cur < 20 else cur
-                )
+    if history.empty:
+        return
 
-        perf, score = sums(sub)
+    monthly = monthly_history(history)
+    months = sorted(monthly["기준월"].unique())
 
-        next_row = totals_block(
-            ws,
-            perf,
-            score,
-            start_row=table_last_row,
+    with st.expander("📈 수금자별 순위 추이 (저장된 스냅샷)"):
+        st.caption(
+            f"스냅샷 {history['기준일'].nunique()}개 · {months[0]} ~ {months[-1]}. "
+            "업로드할 때마다 가장 늦은 계약일자를 기준일로 저장하고, 달마다 지금 올린 자료와 수금자가 "
+            "가장 많이 겹치는 범위의 가장 늦은 스냅샷으로 비교합니다."
         )
 
-        ex_sub = excluded_disp_all[
-            excluded_disp_all["수금자명"].astype(str) == collector
-        ]
+        if len(months) < 2:
+            st.info("두 달 이상의 스냅샷이 쌓이면 전월 대비 변동과 추이를 보여 드립니다.")
+            return
 
-        if not ex_sub.empty:
-            ws.cell(
-                row=next_row + 2,
-                column=1,
-                value="제외 계약",
-            ).font = Font(bold=True)
-
-            write_table(
-                ws,
-                ex_sub,
-                start_row=next_row + 3,
-                name_suffix="EXC",
+        last_month = previous_month(months[-1])
+        st.markdown(f"#### 전월 대비 ({last_month} → {months[-1]})")
+        if last_month in months:
+            mom = month_over_month(history)
+            st.dataframe(
+                mom[mom["수금자명"].isin(selected_collectors)],
+                use_container_width=True,
+                hide_index=True,
+                column_config=MOM_COLUMN_CONFIG,
             )
+        else:
+            st.info(f"{last_month} 스냅샷이 없어 전월 대비 변동을 계산하지 않았습니다. 아래 추이에서 빈 달로 보입니다.")
+
+        st.markdown("#### 환산금액 순위 (숫자가 작을수록 높은 순위)")
+        st.line_chart(rank_history(history, selected_collectors))
 
-    return wb
+        st.markdown("#### 환산금액합계 3개월 이동평균")
+        averages = moving_average(history, window=3)
+        st.line_chart(averages[[c for c in averages.columns if c in selected_collectors]])
 
 
 # ── 메인 실행 함수 ───────────────────────────────────────────
@@ -773,35 +704,50 @@ def run():
         )
 
     section_intro("입력", "계약자료 불러오기", "매니저 업적으로 환산할 계약 목록 엑셀 파일을 등록해 주세요.")
-    uploaded_file = st.file_uploader(
-        "📂 계약 목록 Excel 파일 업로드 (.xlsx)",
+    uploaded_files = st.file_uploader(
+        "📂 계약 목록 Excel 파일 업로드 (.xlsx, 월별·팀별 파일 여러 개 가능)",
         type=["xlsx"],
+        accept_multiple_files=True,
     )
 
-    if not uploaded_file:
+    if not uploaded_files:
         st.info("📤 계약 목록 Excel 파일(.xlsx)을 업로드해주세요.")
         return
 
-    file_bytes = uploaded_file.getvalue()
+    file_names = [uploaded.name for uploaded in uploaded_files]
+    file_bytes = [uploaded.getvalue() for uploaded in uploaded_files]
+    upload_digest = hashlib.sha256(
+        b"".join(hashlib.sha256(data).digest() for data in file_bytes)
+    ).hexdigest()
 
-    base_filename = os.path.splitext(uploaded_file.name)[0]
+    base_filename = os.path.splitext(file_names[0])[0]
+    if len(file_names) > 1:
+        base_filename = f"{base_filename}_외{len(file_names) - 1}개"
     download_filename = f"{base_filename}_매니저업적_환산결과.xlsx"
 
-    try:
-        raw = load_df_from_bytes(file_bytes).copy()
-    except Exception as e:
-        st.error(f"엑셀 파일을 읽지 못했습니다. 파일 형식과 필수 항목을 확인해 주세요.\n\n{e}")
-        return
-
-    raw["_원본행번호"] = raw.index + 2
-
-    candidate_df, excluded_df = exclude_contracts(raw)
+    frames = []
+    for name, data in zip(file_names, file_bytes):
+        try:
+            frames.append(load_df_from_bytes(data))
+        except Exception as e:
+            st.error(f"{name} 파일을 읽지 못했습니다. 파일 형식과 필수 항목을 확인해 주세요.\n\n{e}")
+            return
+
+    raw, duplicates = merge_uploads(frames, file_names)
+    render_upload_scope(raw, duplicates, [
+        name for name, frame in zip(file_names, frames) if POLICY_COLUMN not in frame.columns
+    ])
+    # 증권번호는 중복 확인에만 쓰므로 세션에 들고 있지 않습니다.
+    raw = raw.drop(columns=[POLICY_COLUMN], errors="ignore")
+
+    candidate_df, excluded_df, excluded_reasons = exclude_contracts(raw)
     initial_issues = find_critical_issues(candidate_df)
-    initial_review = candidate_df[initial_issues.ne("")].copy()
+    initial_review = candidate_df[initial_issues.ne("")]
 
     if not initial_review.empty:
         initial_review["확인사항"] = initial_issues.loc[initial_review.index]
         editor_columns = [
+            *([SOURCE_COLUMN] if len(file_names) > 1 else []),
             "_원본행번호",
             "수금자명",
             "계약일",
@@ -824,11 +770,11 @@ def run():
         with st.expander("📝 확인 필요 계약 수정", expanded=True):
             with st.form("manager_review_editor_form"):
                 edited_review = st.data_editor(
-                    initial_review[editor_columns].reset_index(drop=True),
+                    plain_columns(initial_review[editor_columns]).reset_index(drop=True),
                     use_container_width=True,
                     hide_index=True,
-                    disabled=["_원본행번호", "계약일", "상품명", "확인사항"],
-                    key=f"manager_review_{hashlib.sha256(file_bytes).hexdigest()[:16]}",
+                    disabled=[SOURCE_COLUMN, "_원본행번호", "계약일", "상품명", "확인사항"],
+                    key=f"manager_review_{upload_digest[:16]}",
                 )
                 corrections_submitted = st.form_submit_button(
                     "수정값 적용",
@@ -848,23 +794,26 @@ def run():
         ]
         for _, edited_row in edited_review.iterrows():
             row_mask = candidate_df["_원본행번호"] == edited_row["_원본행번호"]
+            if SOURCE_COLUMN in edited_row:
+                row_mask &= candidate_df[SOURCE_COLUMN] == edited_row[SOURCE_COLUMN]
             for column in editable_columns:
-                candidate_df.loc[row_mask, column] = edited_row[column]
+                assign_values(candidate_df, row_mask, column, edited_row[column])
 
         if corrections_submitted:
             st.success("입력한 수정값을 다시 검증하여 계산에 반영했습니다.")
 
-    candidate_df, newly_excluded_df = exclude_contracts(candidate_df)
+    candidate_df, newly_excluded_df, newly_excluded_reasons = exclude_contracts(candidate_df)
     if not newly_excluded_df.empty:
         excluded_df = pd.concat([excluded_df, newly_excluded_df], axis=0).sort_index()
+        excluded_reasons = pd.concat([excluded_reasons, newly_excluded_reasons], axis=0).sort_index()
 
     remaining_issues = find_critical_issues(candidate_df)
-    review_df = candidate_df[remaining_issues.ne("")].copy()
+    review_df = candidate_df[remaining_issues.ne("")]
     if not review_df.empty:
         review_df["확인사항"] = remaining_issues.loc[review_df.index]
 
-    df_valid = candidate_df[remaining_issues.eq("")].copy()
-    excluded_disp_all = build_excluded_with_reason(excluded_df)
+    df_valid = candidate_df[remaining_issues.eq("")]
+    excluded_disp_all = build_excluded_with_reason(excluded_df, excluded_reasons)
     review_disp_all = build_review_display(review_df)
 
     df_valid.rename(
@@ -902,6 +851,7 @@ def run():
         return
 
     df_all = compute_manager_score(df_valid)
+    store_snapshot(df_all)
 
     invalid_dates = df_all[df_all["계약일자_raw"].isna()]
 
@@ -974,13 +924,14 @@ def run():
 
     show_df = df_all[
         df_all["수금자명"].astype(str).isin(selected_collectors)
-    ].copy()
+    ]
 
     section_intro("환산 결과", "선택된 수금자 합산 결과", "선택한 수금자의 계약을 합산해 환산한 결과입니다.")
 
     st.dataframe(
-        to_styled(show_df),
+        display_table(show_df),
         use_container_width=True,
+        column_config=DETAIL_COLUMN_CONFIG,
     )
 
     perf_sum, score_sum = sums(show_df)
@@ -1006,24 +957,22 @@ def run():
 
     st.markdown("#### 🏅 환산금액합계 TOP3(동률 포함)")
 
-    top_amt_disp = top_amt.copy()
-    top_amt_disp["환산금액합계"] = top_amt_disp["환산금액합계"].map(format_money)
-
     st.dataframe(
-        top_amt_disp,
+        top_amt,
         use_container_width=True,
+        column_config=GROUP_COLUMN_CONFIG,
     )
 
     st.markdown("#### 🏅 건수 TOP3(동률 포함)")
 
     st.dataframe(
-        top_cnt.copy(),
+        top_cnt,
         use_container_width=True,
     )
 
     st.markdown("#### 👥 전체 인원 현황")
 
-    disp_group = group.copy().drop(
+    disp_group = group.drop(
         columns=["환산금액순위", "건수순위"],
         errors="ignore",
     )
@@ -1033,12 +982,10 @@ def run():
         ascending=[False, False, True],
     )
 
-    disp_group["실적보험료합계"] = disp_group["실적보험료합계"].map(format_money)
-    disp_group["환산금액합계"] = disp_group["환산금액합계"].map(format_money)
-
     st.dataframe(
         disp_group,
         use_container_width=True,
+        column_config=GROUP_COLUMN_CONFIG,
     )
 
     selected_excluded = excluded_disp_all[
@@ -1057,25 +1004,36 @@ def run():
         ignore_index=True,
     )
 
-    wb = build_workbook(
-        show_df,
-        group,
-        workbook_exclusions,
-        top_amt,
-        top_cnt,
+    # 엑셀은 다운로드 버튼을 누를 때만 만들고, 같은 데이터·수금자 선택이면 다시 씁니다.
+    excel_data = deferred_workbook(
+        lambda: build_workbook(
+            show_df,
+            group,
+            workbook_exclusions,
+            top_amt,
+            top_cnt,
+        ),
+        "manager_results",
+        frame_digest(show_df, workbook_exclusions),
+        tuple(selected_collectors),
     )
 
-    excel_output = BytesIO()
-    wb.save(excel_output)
-    excel_output.seek(0)
-
     st.download_button(
         label="📥 환산 결과 엑셀 다운로드 (TOP3 + 요약 + 수금자별 시트 + 제외사유)",
-        data=excel_output,
+        data=excel_data,
         file_name=download_filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore",
+        mime=XLSX_MIME,
     )
 
+    render_rank_trends(selected_collectors, all_collectors)
+
+    render_memory_report({
+        "업로드 계약": raw,
+        "계산 결과": df_all,
+        "제외 계약": excluded_disp_all,
+    })
+
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,190 @@
+"""컨벤션·썸머·매니저 업적이 함께 쓰는 보험사 구분과 환산율 규칙 엔진.
+
+캠페인별 환산율은 `RateRule` 목록(보험사 구분 × 납입기간 구간 × 예외 열)으로
+선언하고, `RateTable.apply`가 DataFrame 한 번에 대해 조건 마스크를 만들어
+`np.select`로 계산합니다. 위에서부터 처음 맞는 규칙이 적용됩니다.
+
+새 캠페인은 규칙을 딕셔너리 목록으로 적어 `RateTable.from_records`에 넘기면 됩니다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+# ── 보험사 구분 ───────────────────────────────────────────────
+HANWHA_LIFE = "한화생명"
+SPECIAL_NONLIFE = "우대손보"  # 흥국화재, KB손해, 한화손해, DB손해
+OTHER_NONLIFE = "기타손보"
+OTHER_LIFE = "기타생명"
+UNCLASSIFIED = "미분류"
+
+INSURER_CLASSES = (HANWHA_LIFE, SPECIAL_NONLIFE, OTHER_NONLIFE, OTHER_LIFE, UNCLASSIFIED)
+NONLIFE_CLASSES = (SPECIAL_NONLIFE, OTHER_NONLIFE)
+LIFE_CLASSES = (HANWHA_LIFE, OTHER_LIFE)
+
+
+def _nonlife_hint(names: pd.Series) -> pd.Series:
+    return names.str.contains("손", na=False) | names.str.contains("화재", na=False)
+
+
+def _classify_names(names: pd.Series) -> np.ndarray:
+    """정리된 보험사명 목록을 `INSURER_CLASSES` 순번으로 구분합니다."""
+    nonlife_hint = _nonlife_hint(names)
+
+    hanwha_life = names.str.contains("한화", na=False) & names.str.contains("생명", na=False)
+    special_nonlife = (
+        (names.str.contains("DB", case=False, na=False) & nonlife_hint)
+        | (names.str.contains("KB", case=False, na=False) & nonlife_hint)
+        | (names.str.contains("한화", na=False) & nonlife_hint & ~hanwha_life)
+        | (names.str.contains("흥국", na=False) & nonlife_hint)
+    )
+    nonlife = names.str.contains("손해|손보|화재|해상", regex=True, na=False) | special_nonlife
+    life = names.str.contains("생명", na=False) | names.str.contains("라이프", na=False)
+
+    # 한 보험사명은 한 구분에만 속하도록 한화생명 → 우대손보 → 기타손보 → 기타생명 순으로 정합니다.
+    return np.select(
+        [hanwha_life, special_nonlife, nonlife, life],
+        [0, 1, 2, 3],
+        default=INSURER_CLASSES.index(UNCLASSIFIED),
+    ).astype(np.int8)
+
+
+def insurer_class_codes(ins: pd.Series) -> np.ndarray:
+    """행별 보험사 구분 순번(`INSURER_CLASSES` 기준) 배열을 반환합니다.
+
+    지점 파일의 보험사명은 수십 종류뿐이므로 고유값으로 바꿔 한 번씩만 판정하고
+    코드로 행에 되돌립니다. 처리 시간은 행 수가 아니라 보험사 종류 수에 비례합니다.
+    """
+    codes, uniques = pd.factorize(ins, use_na_sentinel=False)
+    names = pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip()
+    return _classify_names(names)[codes]
+
+
+def insurer_class_masks(ins: pd.Series) -> dict[str, pd.Series]:
+    """보험사명 Series를 구분별 불리언 마스크로 나눕니다. 각 행은 한 구분에만 속합니다."""
+    codes = insurer_class_codes(ins)
+    return {
+        name: pd.Series(codes == index, index=ins.index)
+        for index, name in enumerate(INSURER_CLASSES)
+    }
+
+
+def classify_insurers(ins: pd.Series) -> pd.Series:
+    """보험사명을 `INSURER_CLASSES` 중 하나로 구분한 범주형 Series를 반환합니다."""
+    return pd.Series(
+        pd.Categorical.from_codes(insurer_class_codes(ins), categories=list(INSURER_CLASSES)),
+        index=ins.index,
+        name="보험사구분",
+    )
+
+
+# ── 환산율 규칙 ───────────────────────────────────────────────
+@dataclass(frozen=True)
+class RateRule:
+    """보험사 구분과 납입기간 구간이 맞으면 `rate`%를 적용하는 규칙 하나.
+
+    - min_term: 납입기간 하한(이상), None이면 제한 없음
+    - max_term: 납입기간 상한(미만), None이면 제한 없음
+    - exception: 이 열이 True인 행은 납입기간 구간과 관계없이 규칙을 적용합니다.
+    """
+
+    rate: int
+    insurers: tuple[str, ...] = INSURER_CLASSES
+    min_term: int | None = None
+    max_term: int | None = None
+    exception: str | None = None
+
+    def __post_init__(self) -> None:
+        unknown = set(self.insurers) - set(INSURER_CLASSES)
+        if unknown:
+            raise ValueError(f"알 수 없는 보험사 구분: {', '.join(sorted(unknown))}")
+
+
+@dataclass(frozen=True)
+class RateTable:
+    name: str
+    rules: tuple[RateRule, ...]
+    default: int = 0
+    exceptions: tuple[str, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        names = tuple(dict.fromkeys(rule.exception for rule in self.rules if rule.exception))
+        object.__setattr__(self, "exceptions", names)
+
+    @classmethod
+    def from_records(cls, name: str, records: Iterable[Mapping[str, Any]], default: int = 0) -> "RateTable":
+        """`{"rate": 150, "insurers": ["한화생명"], "min_term": 10}` 형태의 목록으로 표를 만듭니다."""
+        rules = []
+        for record in records:
+            values = dict(record)
+            if "insurers" in values:
+                values["insurers"] = tuple(values["insurers"])
+            rules.append(RateRule(**values))
+        return cls(name=name, rules=tuple(rules), default=default)
+
+    def to_frame(self) -> pd.DataFrame:
+        """화면·검토용 규칙표."""
+        rows = []
+        for rule in self.rules:
+            band = []
+            if rule.min_term is not None:
+                band.append(f"{rule.min_term}년 이상")
+            if rule.max_term is not None:
+                band.append(f"{rule.max_term}년 미만")
+            rows.append({
+                "보험사 구분": ", ".join(rule.insurers) if rule.insurers != INSURER_CLASSES else "전체",
+                "납입기간": " · ".join(band) or "전체",
+                "예외": rule.exception or "",
+                "환산율": rule.rate,
+            })
+        return pd.DataFrame(rows)
+
+    def rate_for(self, insurer_class: str, term: int, flags: Mapping[str, bool] | None = None) -> int:
+        """보험사 구분·납입기간이 정해진 계약 한 건의 환산율(%)."""
+        frame_flags = {name: pd.Series([bool(value)]) for name, value in (flags or {}).items()}
+        return int(self.apply(pd.Series([insurer_class]), pd.Series([term]), frame_flags)[0])
+
+    def apply(
+        self,
+        insurer_class: pd.Series,
+        term: pd.Series,
+        flags: pd.DataFrame | Mapping[str, pd.Series] | None = None,
+    ) -> np.ndarray:
+        """행별 환산율(%) 정수 배열을 반환합니다.
+
+        insurer_class는 `classify_insurers` 결과, term은 정수 납입기간입니다.
+        규칙의 예외 열은 flags에서 찾고, 없으면 해당 예외는 적용하지 않습니다.
+        """
+        term_values = np.asarray(term, dtype=np.int64)
+        class_codes = np.asarray(pd.Categorical(insurer_class, categories=list(INSURER_CLASSES)).codes)
+        class_masks = {
+            name: class_codes == index
+            for index, name in enumerate(INSURER_CLASSES)
+        }
+        exception_masks = {}
+        for name in self.exceptions:
+            if flags is not None and name in flags:
+                exception_masks[name] = np.asarray(pd.Series(flags[name]).fillna(False), dtype=bool)
+            else:
+                exception_masks[name] = np.zeros(len(term_values), dtype=bool)
+
+        conditions = []
+        for rule in self.rules:
+            if rule.insurers == INSURER_CLASSES:
+                mask = np.ones(len(term_values), dtype=bool)
+            else:
+                mask = np.logical_or.reduce([class_masks[name] for name in rule.insurers])
+            band = np.ones(len(term_values), dtype=bool)
+            if rule.min_term is not None:
+                band &= term_values >= rule.min_term
+            if rule.max_term is not None:
+                band &= term_values < rule.max_term
+            if rule.exception:
+                band |= exception_masks[rule.exception]
+            conditions.append(mask & band)
+
+        return np.select(conditions, [rule.rate for rule in self.rules], default=self.default).astype(int)
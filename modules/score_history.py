@@ -0,0 +1,260 @@
+"""매니저 업적 환산 결과 스냅샷 저장소와 수금자별 추이 조회.
+
+`compute_manager_score` 결과를 기준일·범위별 parquet(zstd 압축) 파일로 남깁니다.
+
+    snapshots/manager_results/
+        ranks/2025-08-31_3f9c0a1b2d4e.parquet       수금자별 건수·합계·순위 (추이 조회용, 작음)
+        contracts/2025-08-31_3f9c0a1b2d4e.parquet   계약별 환산 결과 전체 (다시 계산하지 않고 꺼내 볼 때)
+
+기준일은 업로드 자료의 가장 늦은 계약일자입니다. 예전 내보내기 파일을 나중에 올려도 그 기간의
+날짜로 저장됩니다. 범위는 업로드 자료의 수금자 목록 해시라, 다른 팀 자료가 같은 기준일로 올라와도
+서로 덮어쓰지 않습니다. 같은 범위·기준일을 다시 올리면 최신 결과로 바꿔 씁니다. 내용 해시를 파일
+메타데이터에 두어 화면을 다시 그릴 때는 다시 쓰지 않습니다.
+
+추이 조회는 작은 순위 파일만 필요한 열만 읽어 합치고, 파일 목록·수정 시각이 같으면 캐시를 씁니다.
+순위는 범위 안에서 매긴 값이라 월 단위 지표(순위 이력, 이동평균, 전월 대비)는 달마다 범위 하나
+(`scope_history`)의 가장 늦은 스냅샷을 쓰고, 달은 스냅샷이 있는 달만이 아니라 달력 기준으로 셉니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SNAPSHOT_DIR = PROJECT_ROOT / "snapshots" / "manager_results"
+
+COMPRESSION = "zstd"
+DIGEST_KEY = b"source_digest"
+
+RANK_COLUMNS = ["기준일", "범위", "수금자명", "건수", "실적보험료합계", "환산금액합계", "환산금액순위", "건수순위"]
+CONTRACT_COLUMNS = [
+    "수금자명",
+    "계약일자_raw",
+    "보험사",
+    "보험구분",
+    "상품명",
+    "납입기간_num",
+    "실적보험료",
+    "환산율",
+    "환산금액",
+]
+
+
+# ── 저장 ────────────────────────────────────────────────────
+def snapshot_date(df: pd.DataFrame) -> str | None:
+    """업로드 자료의 기준일(가장 늦은 계약일자, YYYY-MM-DD). 날짜가 하나도 없으면 None."""
+    latest = pd.to_datetime(df["계약일자_raw"], errors="coerce").max()
+    return None if pd.isna(latest) else latest.strftime("%Y-%m-%d")
+
+
+def snapshot_scope(df: pd.DataFrame) -> str:
+    """업로드 자료의 범위: 수금자명 목록(정렬)의 sha256 앞 12자리."""
+    collectors = sorted(df["수금자명"].dropna().astype(str).unique())
+    return hashlib.sha256("\n".join(collectors).encode("utf-8")).hexdigest()[:12]
+
+
+def _snapshot_name(day: str, scope: str) -> str:
+    return f"{day}_{scope}.parquet"
+
+
+def _stored_digest(path: Path) -> str | None:
+    if not path.exists():
+        return None
+
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+
+    value = metadata.get(DIGEST_KEY)
+    return value.decode("utf-8") if value else None
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, digest: str) -> None:
+    """임시 파일에 쓴 뒤 바꿔 넣어, 다른 세션이 읽는 중에도 반쯤 쓴 파일이 보이지 않게 합니다."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), DIGEST_KEY: digest.encode("utf-8")})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 세션은 같은 프로세스의 스레드라 pid로는 임시 파일이 갈리지 않으므로 매번 새 이름을 받습니다.
+    handle, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(handle)
+    try:
+        pq.write_table(table, tmp, compression=COMPRESSION)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def save_snapshot(
+    df: pd.DataFrame,
+    group: pd.DataFrame,
+    digest: str,
+    store: Path = SNAPSHOT_DIR,
+) -> str | None:
+    """
+    환산 결과(`df`)와 수금자별 순위표(`group`, `make_group_with_ranks`)를 기준일·범위 스냅샷으로 저장합니다.
+    저장한(또는 이미 같은 내용이 있던) 기준일을 반환하고, 기준일을 정할 수 없으면 None입니다.
+    """
+    day = snapshot_date(df)
+
+    if day is None:
+        return None
+
+    scope = snapshot_scope(df)
+    name = _snapshot_name(day, scope)
+    rank_path = store / "ranks" / name
+
+    if _stored_digest(rank_path) == digest:
+        return day
+
+    ranks = group.assign(기준일=pd.Timestamp(day), 범위=scope, 수금자명=group["수금자명"].astype(str))
+    _write_parquet(df[CONTRACT_COLUMNS], store / "contracts" / name, digest)
+    # 순위 파일을 마지막에 써서, 순위 파일이 있으면 계약 파일도 있도록 합니다.
+    _write_parquet(ranks[RANK_COLUMNS], rank_path, digest)
+    return day
+
+
+# ── 조회 ────────────────────────────────────────────────────
+def _rank_files(store: Path) -> tuple[tuple[str, float], ...]:
+    folder = store / "ranks"
+
+    if not folder.is_dir():
+        return ()
+
+    return tuple(sorted((str(path), path.stat().st_mtime) for path in folder.glob("*.parquet")))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _read_ranks(files: tuple[tuple[str, float], ...]) -> pd.DataFrame:
+    frames = []
+    for path, _ in files:
+        try:
+            frames.append(pq.read_table(path, columns=RANK_COLUMNS).to_pandas())
+        except (OSError, pa.ArrowException):
+            # 깨졌거나 그 사이 지워진 스냅샷은 건너뛰고 나머지로 추이를 보여 줍니다.
+            continue
+
+    if not frames:
+        return pd.DataFrame(columns=RANK_COLUMNS)
+
+    history = pd.concat(frames, ignore_index=True)
+    return history.sort_values(["기준일", "환산금액순위", "수금자명"], kind="stable").reset_index(drop=True)
+
+
+def load_rank_history(store: Path = SNAPSHOT_DIR) -> pd.DataFrame:
+    """모든 스냅샷의 수금자별 순위표를 기준일 순으로 합친 표. 스냅샷이 없으면 빈 표입니다."""
+    return _read_ranks(_rank_files(store))
+
+
+def load_contracts_snapshot(day: str, scope: str, store: Path = SNAPSHOT_DIR) -> pd.DataFrame:
+    """기준일·범위 스냅샷의 계약별 환산 결과."""
+    return pd.read_parquet(store / "contracts" / _snapshot_name(day, scope))
+
+
+def scope_history(history: pd.DataFrame, collectors=None) -> pd.DataFrame:
+    """
+    달마다 범위 하나의 스냅샷만 남깁니다. `collectors`(지금 올린 자료의 수금자)와 가장 많이 겹치는
+    범위를 쓰고(겹치는 수금자가 없는 범위는 쓰지 않음), `collectors`가 없으면 수금자가 가장 많은 범위를
+    씁니다. 같으면 기준일이 늦은 범위입니다.
+    """
+    if history.empty:
+        return history
+
+    month = history["기준일"].dt.strftime("%Y-%m")
+    if collectors is None:
+        overlap = pd.Series(1, index=history.index)
+    else:
+        overlap = history["수금자명"].isin(list(collectors)).astype(int)
+
+    snapshots = (
+        pd.DataFrame({"기준월": month, "범위": history["범위"], "기준일": history["기준일"], "겹침": overlap})
+        .groupby(["기준월", "범위", "기준일"])["겹침"].sum()
+        .reset_index()
+        .sort_values(["기준월", "겹침", "기준일", "범위"], kind="stable")
+    )
+    chosen = snapshots[snapshots["겹침"].gt(0)].groupby("기준월").tail(1)
+    keep = pd.MultiIndex.from_frame(pd.DataFrame({"기준월": month, "범위": history["범위"]}))
+    return history[keep.isin(pd.MultiIndex.from_frame(chosen[["기준월", "범위"]]))]
+
+
+def monthly_history(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    달마다 범위 하나(`scope_history`)의 가장 늦은 기준일 스냅샷만 남기고 `기준월`(YYYY-MM) 열을 더합니다.
+    """
+    if history.empty:
+        return history.assign(기준월=pd.Series(dtype=object))
+
+    history = scope_history(history)
+    month = history["기준일"].dt.strftime("%Y-%m")
+    latest = history.groupby(month)["기준일"].transform("max")
+    return history[history["기준일"].eq(latest)].assign(기준월=month)
+
+
+def previous_month(month: str) -> str:
+    """기준월(YYYY-MM)의 달력상 전 달."""
+    return (pd.Period(month, freq="M") - 1).strftime("%Y-%m")
+
+
+def _calendar_months(table: pd.DataFrame) -> pd.DataFrame:
+    """기준월 색인을 첫 달부터 마지막 달까지 빠짐없이 채웁니다. 스냅샷이 없는 달은 빈 칸입니다."""
+    if table.empty:
+        return table
+
+    months = pd.period_range(table.index.min(), table.index.max(), freq="M").strftime("%Y-%m")
+    return table.reindex(pd.Index(months, name=table.index.name))
+
+
+def rank_history(history: pd.DataFrame, collectors=None) -> pd.DataFrame:
+    """기준월 × 수금자명 환산금액 순위표. 스냅샷이 없는 달이나 그 달 스냅샷에 없는 수금자는 빈 칸입니다."""
+    monthly = monthly_history(history)
+
+    if collectors is not None:
+        monthly = monthly[monthly["수금자명"].isin(list(collectors))]
+
+    return _calendar_months(monthly.pivot(index="기준월", columns="수금자명", values="환산금액순위"))
+
+
+def moving_average(history: pd.DataFrame, window: int = 3) -> pd.DataFrame:
+    """
+    기준월 × 수금자명 환산금액합계의 `window`개월(달력 기준) 이동평균.
+    스냅샷이 없는 달과 그 달 스냅샷에 없는 수금자는 0원으로 보고, 첫 달부터 있는 만큼만 평균합니다.
+    """
+    amounts = monthly_history(history).pivot(index="기준월", columns="수금자명", values="환산금액합계")
+    return _calendar_months(amounts).fillna(0.0).rolling(window, min_periods=1).mean()
+
+
+def month_over_month(history: pd.DataFrame) -> pd.DataFrame:
+    """
+    가장 최근 달 스냅샷을 달력상 전 달(`previous_month`) 스냅샷과 수금자별로 비교합니다.
+    순위변동은 올라간 계단 수(양수가 상승)이고, 전 달 스냅샷이 없거나 전 달에 없던 수금자는 빈 칸입니다.
+    """
+    columns = ["수금자명", "환산금액순위", "순위변동", "환산금액합계", "전월환산금액합계", "환산금액증감", "건수증감"]
+    monthly = monthly_history(history)
+
+    if monthly.empty:
+        return pd.DataFrame(columns=columns)
+
+    latest = monthly["기준월"].max()
+    current = monthly[monthly["기준월"].eq(latest)].set_index("수금자명")
+    previous = monthly[monthly["기준월"].eq(previous_month(latest))].set_index("수금자명").reindex(current.index)
+
+    table = pd.DataFrame({
+        "환산금액순위": current["환산금액순위"],
+        "순위변동": previous["환산금액순위"] - current["환산금액순위"],
+        "환산금액합계": current["환산금액합계"],
+        "전월환산금액합계": previous["환산금액합계"],
+        "환산금액증감": current["환산금액합계"] - previous["환산금액합계"],
+        "건수증감": current["건수"] - previous["건수"],
+    }).reset_index()
+
+    return table.sort_values(["환산금액순위", "수금자명"], kind="stable")[columns].reset_index(drop=True)
@@ -4,13 +4,35 @@ import numpy as np
 import os
 import re
 import hashlib
-from io import BytesIO
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, Border, Side, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.styles import PatternFill
 from .ui_components import page_header, section_intro
+from .rate_engine import (
+    HANWHA_LIFE,
+    OTHER_LIFE,
+    OTHER_NONLIFE,
+    SPECIAL_NONLIFE,
+    RateTable,
+    classify_insurers,
+    insurer_class_masks,
+)
+from .issue_flags import IssueFlags
+from .contract_loader import CONTRACT_COLUMNS, load_contracts, plain_columns, standardize_columns
+from .frame_memory import assign_values, compact_frame, render_memory_report
+from .campaign import CUBE_METRICS, Campaign, MonthlyRequirement
+from .exclusion import exclusion_masks, exclusion_reasons, split_excluded
+from .download_cache import XLSX_MIME, deferred_workbook, frame_digest
+from .excel_writer import CENTER, WorkbookWriter, merge_widths, rows_widths, table_widths
+from .table_format import (
+    COUNT,
+    PERCENT,
+    SIGNED_WON,
+    WON,
+    YEARS,
+    date_column,
+    number_column,
+    opportunity_column_config,
+)
 
 
 # ── 썸머 기준 ────────────────────────────────────────────────
@@ -27,7 +49,31 @@ SUMMER_GRADES = [
     ("일반", 3_000_000),
 ]
 
-TABLE_SEQ = 0
+SUMMER_CAMPAIGN = Campaign(
+    name="썸머",
+    months=(7, 8),
+    requirements=(
+        MonthlyRequirement("한화생명5만", "한화5만", "한화환산", MONTHLY_HANWHA_MIN_PREMIUM),
+        MonthlyRequirement("환산50만", "50만", "환산", MONTHLY_TARGET),
+    ),
+    grades=tuple(SUMMER_GRADES),
+    bonus_rates=tuple(READY_BONUS_RATES),
+    bonus_name="레디포썸머",
+    amount_column="썸머환산금액",
+)
+
+# 썸머 환산율(%) — 위에서부터 처음 맞는 규칙을 적용합니다.
+# 10년납 초과 기준은 치아보험 예외 적용 건에도 똑같이 적용합니다.
+SUMMER_RATE_TABLE = RateTable.from_records("썸머", [
+    {"insurers": [SPECIAL_NONLIFE], "rate": 250, "min_term": 11, "exception": "치아보험예외적용"},
+    {"insurers": [SPECIAL_NONLIFE], "rate": 100},
+    {"insurers": [OTHER_NONLIFE], "rate": 100, "min_term": 11, "exception": "치아보험예외적용"},
+    {"insurers": [OTHER_NONLIFE], "rate": 50},
+    {"insurers": [HANWHA_LIFE], "rate": 150, "min_term": 11, "exception": "치아보험예외적용"},
+    {"insurers": [HANWHA_LIFE], "rate": 100},
+    {"insurers": [OTHER_LIFE], "rate": 100, "min_term": 11, "exception": "치아보험예외적용"},
+    {"insurers": [OTHER_LIFE], "rate": 50},
+])
 
 
 # ── 기본 유틸 ────────────────────────────────────────────────
@@ -57,33 +103,6 @@ def pct(x) -> str:
         return ""
 
 
-def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = [str(c).strip() for c in df.columns]
-    return df
-
-
-def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-
-    if "계약일" in df.columns and "계약일자" not in df.columns:
-        df.rename(columns={"계약일": "계약일자"}, inplace=True)
-
-    if "초회보험료" in df.columns and "보험료" not in df.columns:
-        df.rename(columns={"초회보험료": "보험료"}, inplace=True)
-
-    return df
-
-
-def safe_table_name(base: str) -> str:
-    name = re.sub(r"[^A-Za-z0-9_]", "_", str(base))
-
-    if not re.match(r"^[A-Za-z_]", name):
-        name = f"tbl_{name}"
-
-    return name[:254]
-
-
 def safe_filename_part(text: str) -> str:
     """
     파일명에 사용할 수 없는 문자를 제거합니다.
@@ -94,182 +113,49 @@ def safe_filename_part(text: str) -> str:
     return text if text else "미지정"
 
 
-def unique_sheet_name(wb, base, limit=31):
-    name = str(base)[:limit] if base else "Sheet"
-
-    if name not in wb.sheetnames:
-        return name
-
-    i = 2
-    while True:
-        suffix = f"_{i}"
-        trunc = limit - len(suffix)
-        cand = f"{name[:trunc]}{suffix}"
-
-        if cand not in wb.sheetnames:
-            return cand
-
-        i += 1
-
-
-def autosize_columns_full(ws, padding=5):
-    for column_cells in ws.columns:
-        max_len = max(
-            len(str(cell.value)) if cell.value is not None else 0
-            for cell in column_cells
-        )
-
-        ws.column_dimensions[column_cells[0].column_letter].width = max_len + padding
-
-
 # ── 보험사 분류 ───────────────────────────────────────────────
+# 분류 기준은 rate_engine.insurer_class_masks 한 곳에서 관리합니다.
 def is_hanwha_life_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("한화", na=False)
-        & ins.str.contains("생명", na=False)
-    )
-
-
-def is_db_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("DB", case=False, na=False)
-        & (
-            ins.str.contains("손", na=False)
-            | ins.str.contains("화재", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-    )
-
-
-def is_kb_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("KB", case=False, na=False)
-        & (
-            ins.str.contains("손", na=False)
-            | ins.str.contains("화재", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-    )
-
-
-def is_hanwha_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("한화", na=False)
-        & (
-            ins.str.contains("손", na=False)
-            | ins.str.contains("화재", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-        & ~is_hanwha_life_series(ins)
-    )
-
-
-def is_heungkuk_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("흥국", na=False)
-        & (
-            ins.str.contains("화재", na=False)
-            | ins.str.contains("손", na=False)
-            | ins.str.contains("손해", na=False)
-        )
-    )
+    return insurer_class_masks(ins)[HANWHA_LIFE]
 
 
 def is_special_nonlife_series(ins: pd.Series) -> pd.Series:
     """
-    썸머 우대 손해보험사:
+    우대 손해보험사:
     흥국화재, KB손해, 한화손해, DB손해
     """
-    return (
-        is_db_nonlife_series(ins)
-        | is_kb_nonlife_series(ins)
-        | is_hanwha_nonlife_series(ins)
-        | is_heungkuk_nonlife_series(ins)
-    )
+    return insurer_class_masks(ins)[SPECIAL_NONLIFE]
 
 
 def is_nonlife_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("손해|손보|화재|해상", regex=True, na=False)
-        | is_special_nonlife_series(ins)
-    )
-
-
-def is_life_series(ins: pd.Series) -> pd.Series:
-    ins = ins.astype(str).str.strip()
-
-    return (
-        ins.str.contains("생명", na=False)
-        | ins.str.contains("라이프", na=False)
-    )
+    masks = insurer_class_masks(ins)
+    return masks[SPECIAL_NONLIFE] | masks[OTHER_NONLIFE]
 
 
 def is_other_life_series(ins: pd.Series) -> pd.Series:
-    return is_life_series(ins) & ~is_hanwha_life_series(ins)
+    return insurer_class_masks(ins)[OTHER_LIFE]
 
 
 # ── 데이터 준비 ──────────────────────────────────────────────
-def load_df(uploaded_file) -> pd.DataFrame:
-    df = pd.read_excel(uploaded_file)
-    df = normalize_columns(df)
-    df = standardize_columns(df)
-    return df
-
-
 def exclude_contracts(df: pd.DataFrame):
     """
     제외 조건:
     - 일시납
     - 연금성 / 저축성
     - 철회 / 해약 / 실효
-    """
-    excluded_df = pd.DataFrame()
-
-    needed = {"납입방법", "상품군2", "계약상태"}
-
-    if needed.issubset(df.columns):
-        tmp = df.copy()
-
-        tmp["납입방법"] = tmp["납입방법"].astype(str).str.strip()
-        tmp["상품군2"] = tmp["상품군2"].astype(str).str.strip()
-        tmp["계약상태"] = tmp["계약상태"].astype(str).str.strip()
 
-        is_lumpsum = tmp["납입방법"].str.contains("일시납", na=False)
-        is_savings = tmp["상품군2"].str.contains("연금성|저축성", regex=True, na=False)
-        is_cancelled = tmp["계약상태"].str.contains("철회|해약|실효", regex=True, na=False)
-
-        is_excluded = is_lumpsum | is_savings | is_cancelled
-
-        excluded_df = tmp[is_excluded].copy()
-        df_valid = tmp[~is_excluded].copy()
-
-        return df_valid, excluded_df
-
-    return df.copy(), excluded_df
+    (유효 계약, 제외 계약, 제외 계약의 사유별 마스크)를 반환합니다.
+    """
+    return split_excluded(df)
 
 
 def find_data_issues(df: pd.DataFrame, require_valid_date: bool = True):
     """환산 계산 보류 사유와 쉐어율 조건 확인 사유를 행별로 반환합니다."""
-    blocking = pd.Series("", index=df.index, dtype="object")
-    condition = pd.Series("", index=df.index, dtype="object")
+    blocking = IssueFlags(df.index)
+    condition = IssueFlags(df.index)
 
     def add_issue(target, mask, message):
-        mask = pd.Series(mask, index=df.index).fillna(False)
-        target.loc[mask] = target.loc[mask].apply(
-            lambda current: f"{current} / {message}" if current else message
-        )
+        target.add(mask, message)
 
     def blank_mask(column):
         text = df[column].astype("string").str.strip().str.lower()
@@ -299,7 +185,7 @@ def find_data_issues(df: pd.DataFrame, require_valid_date: bool = True):
         "쉐어율 확인 필요",
     )
 
-    return blocking, condition, share_numeric
+    return blocking.reasons(), condition.reasons(), share_numeric
 
 
 def build_review_display(review_df: pd.DataFrame) -> pd.DataFrame:
@@ -318,7 +204,9 @@ def build_review_display(review_df: pd.DataFrame) -> pd.DataFrame:
     return out[columns]
 
 
-def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
+def build_excluded_with_reason(
+    exdf: pd.DataFrame, reason_masks: pd.DataFrame | None = None
+) -> pd.DataFrame:
     base_cols = [
         "수금자명",
         "계약일자",
@@ -336,27 +224,9 @@ def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
 
     tmp = standardize_columns(exdf.copy())
 
-    def reason_row(row):
-        reasons = []
-
-        if "일시납" in str(row.get("납입방법", "")):
-            reasons.append("일시납")
-
-        product_group = str(row.get("상품군2", ""))
-        if "연금성" in product_group or "저축성" in product_group:
-            reasons.append("연금/저축성")
-
-        status = str(row.get("계약상태", ""))
-        if "철회" in status:
-            reasons.append("철회")
-        if "해약" in status:
-            reasons.append("해약")
-        if "실효" in status:
-            reasons.append("실효")
-
-        return " / ".join(reasons) if reasons else "제외 조건 미상"
-
-    tmp["제외사유"] = tmp.apply(reason_row, axis=1)
+    if reason_masks is None:
+        reason_masks = exclusion_masks(tmp)
+    tmp["제외사유"] = exclusion_reasons(reason_masks.reindex(tmp.index, fill_value=False))
 
     for col in base_cols:
         if col not in tmp.columns:
@@ -376,25 +246,17 @@ def build_excluded_with_reason(exdf: pd.DataFrame) -> pd.DataFrame:
 
 
 def check_required_columns(df: pd.DataFrame):
-    required_columns = {
-        "수금자명",
-        "계약일자",
-        "보험사",
-        "상품명",
-        "납입기간",
-        "보험료",
-        "쉐어율",
-        "납입방법",
-        "상품군2",
-        "계약상태",
-    }
-
-    return required_columns - set(df.columns)
+    return set(CONTRACT_COLUMNS) - set(df.columns)
 
 
 # ── 썸머 계산 ────────────────────────────────────────────────
+# 계산 결과를 세션에 보관하기 전에 범주형·작은 정수형으로 줄일 열 (frame_memory)
+COMPACT_CATEGORIES = ("수금자명", "보험사", "상품명", "납입방법", "상품군2", "계약상태", "적용 구분")
+COMPACT_INTEGERS = ("_원본행번호", "납입기간_num", "계약월", "썸머율")
+
+
 def compute_summer(df: pd.DataFrame) -> pd.DataFrame:
-    df = standardize_columns(df.copy())
+    df = standardize_columns(df)
 
     df["계약일자_raw"] = pd.to_datetime(df["계약일자"], errors="coerce")
     df["계약월"] = df["계약일자_raw"].dt.month
@@ -447,22 +309,12 @@ def compute_summer(df: pd.DataFrame) -> pd.DataFrame:
     df["실적보험료"] = np.floor(adjusted).astype(float)
     df["조정차액"] = df["실적보험료"] - df["원본보험료"]
 
-    ins = df["보험사"].astype(str).str.strip()
-    term = df["납입기간_num"]
-
-    is_hanwha_life = is_hanwha_life_series(ins)
-    is_special_nonlife = is_special_nonlife_series(ins)
-    is_nonlife = is_nonlife_series(ins)
-    is_other_nonlife = is_nonlife & ~is_special_nonlife
-    is_other_life = is_other_life_series(ins)
-
     product_name = df.get("상품명", pd.Series("", index=df.index)).fillna("").astype(str)
     product_group = df.get("상품군2", pd.Series("", index=df.index)).fillna("").astype(str)
     df["치아보험자동판정"] = product_name.str.contains("치아", na=False) | product_group.str.contains("치아", na=False)
     if "_치아보험예외적용" not in df.columns:
         df["_치아보험예외적용"] = df["치아보험자동판정"]
     df["치아보험예외적용"] = df["_치아보험예외적용"].fillna(False).astype(bool)
-    long_term_rule = (term > 10) | df["치아보험예외적용"]
 
     # ✅ 썸머 환산율
     # 손해보험
@@ -472,48 +324,57 @@ def compute_summer(df: pd.DataFrame) -> pd.DataFrame:
     # 생명보험
     # - 10년납 초과: 한화생명 150%, 이외 생명보험 100%
     # - 10년납 이하: 한화생명 100%, 이외 생명보험 50%
-    df["썸머율"] = np.select(
-        [
-            is_special_nonlife & long_term_rule,
-            is_special_nonlife & ~long_term_rule,
-            is_other_nonlife & long_term_rule,
-            is_other_nonlife & ~long_term_rule,
-            is_hanwha_life & long_term_rule,
-            is_hanwha_life & ~long_term_rule,
-            is_other_life & long_term_rule,
-            is_other_life & ~long_term_rule,
-        ],
-        [
-            250,
-            100,
-            100,
-            50,
-            150,
-            100,
-            100,
-            50,
-        ],
-        default=0,
-    ).astype(int)
+    # 치아보험 예외 적용 건은 10년납 초과 환산율을 적용합니다. (SUMMER_RATE_TABLE)
+    df["썸머율"] = SUMMER_RATE_TABLE.apply(
+        classify_insurers(df["보험사"]), df["납입기간_num"], df
+    )
 
     df["썸머환산금액"] = df["실적보험료"] * df["썸머율"] / 100
 
-    def application_label(row):
-        labels = []
-        if pd.isna(row["쉐어율"]):
-            labels.append(f"쉐어율 공란 → {row['적용쉐어율']:.0f}% {'기본' if row['적용쉐어율'] == 100 else '수동'} 적용")
-        elif row["쉐어율"] < 100:
-            if row["쉐어율"] == 50:
-                labels.append("쉐어 50% 적용")
-            else:
-                labels.append(f"쉐어 조정 적용 {row['쉐어율']:g}% → 50%")
-        if row["치아보험예외적용"]:
-            labels.append("치아보험 예외 적용")
-        return " · ".join(labels)
-
-    df["적용 구분"] = df.apply(application_label, axis=1)
+    df["적용 구분"] = application_labels(df)
 
-    return df
+    return compact_frame(df, categories=COMPACT_CATEGORIES, integers=COMPACT_INTEGERS)
+
+
+def _format_values(values: np.ndarray, fmt) -> np.ndarray:
+    """같은 값은 한 번만 문자열로 바꿉니다."""
+    if len(values) == 0:
+        return np.array([], dtype=object)
+    uniques, inverse = np.unique(values, return_inverse=True)
+    return np.array([fmt(value) for value in uniques], dtype=object)[inverse]
+
+
+def application_labels(df: pd.DataFrame) -> pd.Series:
+    """행별 `적용 구분` 문구. 쉐어율 구분 코드와 치아보험 예외 여부로 조립합니다.
+
+    - 쉐어율 공란: `쉐어율 공란 → 100% 기본 적용` / `→ 50% 수동 적용`
+    - 쉐어 50%: `쉐어 50% 적용`
+    - 그 외 100% 미만: `쉐어 조정 적용 30% → 50%`
+    - 치아보험 예외 적용 건은 뒤에 ` · 치아보험 예외 적용`
+    """
+    share = pd.to_numeric(df["쉐어율"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    applied = pd.to_numeric(df["적용쉐어율"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    dental = df["치아보험예외적용"].to_numpy(dtype=bool)
+
+    blank = np.isnan(share)
+    half = ~blank & (share == 50)
+    adjusted = ~blank & (share < 100) & ~half
+
+    labels = np.full(len(df), "", dtype=object)
+    labels[half] = "쉐어 50% 적용"
+    labels[blank] = _format_values(
+        applied[blank],
+        lambda value: f"쉐어율 공란 → {value:.0f}% {'기본' if value == 100 else '수동'} 적용",
+    )
+    labels[adjusted] = _format_values(
+        share[adjusted],
+        lambda value: f"쉐어 조정 적용 {value:g}% → 50%",
+    )
+
+    has_share_label = blank | half | adjusted
+    labels[dental & has_share_label] = labels[dental & has_share_label] + " · 치아보험 예외 적용"
+    labels[dental & ~has_share_label] = "치아보험 예외 적용"
+    return pd.Series(labels, index=df.index).astype(str)
 
 
 def check_monthly_requirements(dfin: pd.DataFrame):
@@ -523,32 +384,11 @@ def check_monthly_requirements(dfin: pd.DataFrame):
     2. 전체 월 환산업적 50만원 이상
     """
     if dfin.empty:
-        return {
-            "환산금액": 0,
-            "한화생명5만": False,
-            "환산50만": False,
-            "월달성": False,
-        }
-
-    summer_sum = dfin["썸머환산금액"].sum()
-    amount_ok = summer_sum >= MONTHLY_TARGET
-
-    # 한화생명 계약의 썸머 환산업적을 월 단위로 합산하여
-    # 합계가 5만원 이상인지 판정합니다.
-    hanwha_mask = is_hanwha_life_series(dfin["보험사"])
-    hanwha_summer_sum = pd.to_numeric(
-        dfin.loc[hanwha_mask, "썸머환산금액"], errors="coerce"
-    ).fillna(0).sum()
-    hanwha_ok = hanwha_summer_sum >= MONTHLY_HANWHA_MIN_PREMIUM
-
-    total_ok = amount_ok and hanwha_ok
-
-    return {
-        "환산금액": summer_sum,
-        "한화생명5만": hanwha_ok,
-        "환산50만": amount_ok,
-        "월달성": total_ok,
-    }
+        metrics = dict.fromkeys(CUBE_METRICS, 0)
+    else:
+        # 한화생명 계약의 썸머 환산업적은 월 단위로 합산해 판정합니다.
+        metrics = SUMMER_CAMPAIGN.row_metrics(dfin).sum()
+    return SUMMER_CAMPAIGN.monthly_result(metrics)
 
 
 def get_summer_grade(total_amount: float):
@@ -556,27 +396,11 @@ def get_summer_grade(total_amount: float):
     7월 + 8월 합산 환산업적 기준 등급 산정.
     가장 높은 등급부터 체크.
     """
-    for grade, target in SUMMER_GRADES:
-        if total_amount >= target:
-            return grade, target
-
-    return "미달성", 0
+    return SUMMER_CAMPAIGN.grade(total_amount)
 
 
 def get_next_grade_gap(total_amount: float):
-    ascending = [
-        ("일반", 3_000_000),
-        ("더블", 5_000_000),
-        ("트리플", 8_000_000),
-        ("크라운", 10_000_000),
-        ("HWARANG", 15_000_000),
-    ]
-
-    for grade, target in ascending:
-        if total_amount < target:
-            return grade, target, target - total_amount
-
-    return None, None, 0
+    return SUMMER_CAMPAIGN.next_grade_gap(total_amount)
 
 
 def check_final_summer_requirements(
@@ -588,118 +412,159 @@ def check_final_summer_requirements(
     1. 월별 필수조건은 보너스 전 금액 기준으로 판단
     2. 등급 판정은 레디포썸머 보너스 반영 후 금액 기준으로 판단
     """
-    july_req = check_monthly_requirements(july_df)
-    august_req = check_monthly_requirements(august_df)
+    monthly = {
+        "7월": check_monthly_requirements(july_df),
+        "8월": check_monthly_requirements(august_df),
+    }
+    return SUMMER_CAMPAIGN.apply_bonus(monthly, ready_bonus_rate)
+
+
+# ── 행별 수정값 증분 반영 ─────────────────────────────────────
+# 쉐어율 공란 적용값·치아보험 예외 체크는 행 단위 값이라 바뀐 행만 다시 계산하면 됩니다.
+OVERRIDE_COLUMNS = ["_공란적용쉐어율", "_치아보험예외적용"]
+
+
+def patch_summer_results(
+    df: pd.DataFrame,
+    totals: pd.DataFrame,
+    previous_overrides: pd.DataFrame,
+    df_valid: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """이전 계산 결과에서 수정값이 바뀐 행만 `compute_summer`로 다시 계산해 덮어씁니다.
+
+    `compute_summer`는 행마다 독립적으로 계산하므로 바뀐 행만 계산해도 전체 계산과
+    같습니다. 수금자 × 월 집계는 해당 행의 수금자만 다시 집계합니다.
+    """
+    current = df_valid[OVERRIDE_COLUMNS]
+    previous = previous_overrides.reindex(current.index)
+    changed = current.ne(previous).any(axis=1)
+    if not changed.any():
+        return df, totals
+
+    changed_index = current.index[changed]
+    patched = compute_summer(df_valid.loc[changed_index])
+    for column in patched.columns:
+        assign_values(df, changed_index, column, patched[column].to_numpy())
+    collectors = df.loc[changed_index, "수금자명"].unique()
+    return df, SUMMER_CAMPAIGN.patch_totals(totals, df, collectors)
 
-    base_total_amount = july_req["환산금액"] + august_req["환산금액"]
-    bonus_amount = base_total_amount * ready_bonus_rate / 100
-    final_total_amount = base_total_amount + bonus_amount
 
-    amount_grade, grade_target = get_summer_grade(final_total_amount)
-    next_grade, next_target, next_gap = get_next_grade_gap(final_total_amount)
+def summer_results_with_overrides(df_valid: pd.DataFrame, state_key: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(`compute_summer` 결과, 수금자 × 월 집계)를 반환합니다.
 
-    monthly_all_ok = july_req["월달성"] and august_req["월달성"]
+    업로드·확인 수정값이 같으면 session_state에 보관한 이전 결과에서 쉐어율·치아보험
+    수정으로 바뀐 행만 다시 계산합니다.
+    """
+    digest = frame_digest(df_valid.drop(columns=OVERRIDE_COLUMNS))
+    overrides = df_valid[OVERRIDE_COLUMNS].copy()
+    cached = st.session_state.get(state_key)
 
-    # 금액 기준 등급과 최종 인정 등급을 분리
-    if monthly_all_ok:
-        final_grade = amount_grade
+    if cached is None or cached["digest"] != digest:
+        df = compute_summer(df_valid)
+        totals = SUMMER_CAMPAIGN.month_totals(df)
     else:
-        final_grade = "필수조건 미충족"
+        df, totals = patch_summer_results(cached["df"], cached["totals"], cached["overrides"], df_valid)
 
-    return {
-        "7월": july_req,
-        "8월": august_req,
-        "기본합산환산금액": base_total_amount,
-        "레디포썸머보너스율": ready_bonus_rate,
-        "레디포썸머보너스금액": bonus_amount,
-        "합산환산금액": final_total_amount,
-        "월별필수조건": monthly_all_ok,
-        "금액기준등급": amount_grade,
-        "최종인정등급": final_grade,
-        "달성기준금액": grade_target,
-        "다음등급": next_grade,
-        "다음등급기준": next_target,
-        "다음등급부족금액": next_gap,
+    st.session_state[state_key] = {
+        "digest": digest,
+        "overrides": overrides,
+        "df": df,
+        "totals": totals,
     }
+    return df, totals
 
 
 # ── 화면 표시 ────────────────────────────────────────────────
-def to_styled(dfin: pd.DataFrame) -> pd.DataFrame:
-    df = dfin.copy()
-
-    if df.empty:
-        return pd.DataFrame(columns=[
-            "계약월",
-            "수금자명",
-            "계약일자",
-            "보험사",
-            "상품명",
-            "납입기간",
-            "원본 보험료",
-            "원본 쉐어율",
-            "적용 쉐어율",
-            "전체 보험료 역산",
-            "실적보험료",
-            "조정 차액",
-            "인정 건수",
-            "썸머율",
-            "썸머환산금액",
-            "적용 구분",
-        ])
+DETAIL_COLUMNS = [
+    "계약월",
+    "수금자명",
+    "계약일자",
+    "보험사",
+    "상품명",
+    "납입기간",
+    "원본 보험료",
+    "원본 쉐어율",
+    "적용 쉐어율",
+    "전체 보험료 역산",
+    "실적보험료",
+    "조정 차액",
+    "인정 건수",
+    "썸머율",
+    "썸머환산금액",
+    "적용 구분",
+]
 
-    df["계약일자"] = pd.to_datetime(df["계약일자"], errors="coerce").dt.strftime("%Y-%m-%d")
+# 상세 표 숫자 열 서식. 화면은 숫자 그대로 두고 브라우저에서 단위를 붙입니다.
+DETAIL_COLUMN_CONFIG = {
+    "계약일자": date_column(),
+    "납입기간": number_column(YEARS),
+    "원본 보험료": number_column(WON),
+    "원본 쉐어율": number_column(PERCENT, help="빈 칸은 공란(쉐어율 미입력) 계약입니다."),
+    "적용 쉐어율": number_column(PERCENT, help="빈 칸은 적용 쉐어율 확인이 필요한 계약입니다."),
+    "전체 보험료 역산": number_column(WON),
+    "실적보험료": number_column(WON),
+    "조정 차액": number_column(SIGNED_WON),
+    "인정 건수": number_column(COUNT),
+    "썸머율": number_column(PERCENT),
+    "썸머환산금액": number_column(WON),
+}
+
+
+def display_table(dfin: pd.DataFrame) -> pd.DataFrame:
+    """상세 표. 열 이름과 순서만 화면용으로 바꾸고 값은 숫자·날짜 그대로 둡니다."""
+    if dfin.empty:
+        return pd.DataFrame(columns=DETAIL_COLUMNS)
 
-    df["납입기간"] = pd.to_numeric(df["납입기간"], errors="coerce").apply(
-        lambda x: f"{int(x)}년" if pd.notnull(x) else ""
-    )
+    df = dfin.copy(deep=False)
 
-    df["원본보험료"] = df["원본보험료"].map(won)
-    df["쉐어율"] = df["쉐어율"].apply(lambda x: pct(x) if pd.notnull(x) else "공란")
-    df["적용쉐어율"] = df["적용쉐어율"].apply(lambda x: pct(x) if pd.notnull(x) else "확인 필요")
-    df["전체보험료역산"] = np.floor(pd.to_numeric(df["전체보험료역산"], errors="coerce")).map(won)
-    df["실적보험료"] = df["실적보험료"].map(won)
-    df["조정차액"] = df["조정차액"].map(signed_won)
-    df["쉐어건수"] = df["쉐어건수"].apply(lambda x: f"{x:g}건")
-    df["썸머율"] = df["썸머율"].map(pct)
-    df["썸머환산금액"] = df["썸머환산금액"].map(won)
+    df["계약일자"] = pd.to_datetime(df["계약일자"], errors="coerce")
+    df["납입기간"] = pd.to_numeric(df["납입기간"], errors="coerce")
+    df["전체보험료역산"] = np.floor(pd.to_numeric(df["전체보험료역산"], errors="coerce"))
 
-    df.rename(columns={
+    df = df.rename(columns={
         "원본보험료": "원본 보험료",
         "쉐어율": "원본 쉐어율",
         "적용쉐어율": "적용 쉐어율",
         "전체보험료역산": "전체 보험료 역산",
         "조정차액": "조정 차액",
         "쉐어건수": "인정 건수",
-    }, inplace=True)
+    })
 
-    cols = [
-        "계약월",
-        "수금자명",
-        "계약일자",
-        "보험사",
-        "상품명",
-        "납입기간",
-        "원본 보험료",
-        "원본 쉐어율",
-        "적용 쉐어율",
-        "전체 보험료 역산",
-        "실적보험료",
-        "조정 차액",
-        "인정 건수",
-        "썸머율",
-        "썸머환산금액",
-        "적용 구분",
-    ]
+    return df[[c for c in DETAIL_COLUMNS if c in df.columns]]
 
-    return df[[c for c in cols if c in df.columns]]
+
+def to_styled(dfin: pd.DataFrame) -> pd.DataFrame:
+    """엑셀 다운로드용 상세 표. `display_table` 값을 원·%·년·건 글자로 바꿉니다."""
+    df = display_table(dfin)
+
+    if df.empty:
+        return df
+
+    df["계약일자"] = df["계약일자"].dt.strftime("%Y-%m-%d")
+    df["납입기간"] = df["납입기간"].apply(lambda x: f"{int(x)}년" if pd.notnull(x) else "")
+    df["원본 보험료"] = df["원본 보험료"].map(won)
+    df["원본 쉐어율"] = df["원본 쉐어율"].apply(lambda x: pct(x) if pd.notnull(x) else "공란")
+    df["적용 쉐어율"] = df["적용 쉐어율"].apply(lambda x: pct(x) if pd.notnull(x) else "확인 필요")
+    df["전체 보험료 역산"] = df["전체 보험료 역산"].map(won)
+    df["실적보험료"] = df["실적보험료"].map(won)
+    df["조정 차액"] = df["조정 차액"].map(signed_won)
+    df["인정 건수"] = df["인정 건수"].apply(lambda x: f"{x:g}건")
+    df["썸머율"] = df["썸머율"].map(pct)
+    df["썸머환산금액"] = df["썸머환산금액"].map(won)
+
+    return df
+
+
+# 쉐어 조정·치아보험 예외가 적용된 계약에서 화면과 엑셀 모두 강조하는 열
+HIGHLIGHT_COLUMNS = [
+    "원본 쉐어율", "적용 쉐어율", "전체 보험료 역산", "실적보험료",
+    "조정 차액", "인정 건수", "썸머율", "적용 구분",
+]
 
 
 def style_detail_table(dfin: pd.DataFrame):
-    display = to_styled(dfin)
-    highlight_cols = {
-        "원본 쉐어율", "적용 쉐어율", "전체 보험료 역산", "실적보험료",
-        "조정 차액", "인정 건수", "썸머율", "적용 구분",
-    }
+    display = display_table(dfin)
+    highlight_cols = set(HIGHLIGHT_COLUMNS)
 
     def color_row(row):
         label = str(row.get("적용 구분", ""))
@@ -838,61 +703,35 @@ def make_collector_summary(july_df: pd.DataFrame, august_df: pd.DataFrame) -> pd
     수금자별 요약은 기본 환산업적 기준으로 표시.
     레디포썸머 보너스는 선택 수금자 화면에서 직접 선택 후 별도 반영.
     """
-    all_df = pd.concat([july_df, august_df], ignore_index=True)
-
-    rows = []
-
-    if all_df.empty:
-        return pd.DataFrame(columns=[
-            "수금자명",
-            "7월건수",
-            "7월쉐어미입력",
-            "7월환산",
-            "7월한화5만",
-            "7월50만",
-            "7월달성",
-            "8월건수",
-            "8월쉐어미입력",
-            "8월환산",
-            "8월한화5만",
-            "8월50만",
-            "8월달성",
-            "기본합산환산",
-            "월별필수조건",
-            "기본금액등급",
-        ])
+    totals = SUMMER_CAMPAIGN.month_totals(pd.concat([july_df, august_df]))
+    return SUMMER_CAMPAIGN.summary(totals)
 
-    for collector, sub in all_df.groupby("수금자명", dropna=False):
-        july_sub = sub[sub["계약월"] == 7].copy()
-        august_sub = sub[sub["계약월"] == 8].copy()
 
-        result = check_final_summer_requirements(
-            july_sub,
-            august_sub,
-            ready_bonus_rate=0,
-        )
+def format_bonus_matrix_for_display(matrix: pd.DataFrame) -> pd.DataFrame:
+    df = matrix.copy()
+    if "기본합산환산" in df.columns:
+        df["기본합산환산"] = df["기본합산환산"].map(won)
+    return df
+
+
+def month_summary_config(month: str) -> dict:
+    return {
+        f"{month}건수": number_column(COUNT),
+        f"{month}쉐어미입력": number_column(
+            "%d건", f"{month} 쉐어 공란", help="쉐어율이 공란이라 기본 100%를 적용한 계약 수"
+        ),
+        f"{month}환산": number_column(WON),
+    }
 
-        rows.append({
-            "수금자명": collector,
-            "7월건수": july_sub["쉐어건수"].sum(min_count=1),
-            "7월쉐어미입력": int(july_sub["쉐어율"].isna().sum()),
-            "7월환산": result["7월"]["환산금액"],
-            "7월한화5만": mark(result["7월"]["한화생명5만"]),
-            "7월50만": mark(result["7월"]["환산50만"]),
-            "7월달성": mark(result["7월"]["월달성"]),
-            "8월건수": august_sub["쉐어건수"].sum(min_count=1),
-            "8월쉐어미입력": int(august_sub["쉐어율"].isna().sum()),
-            "8월환산": result["8월"]["환산금액"],
-            "8월한화5만": mark(result["8월"]["한화생명5만"]),
-            "8월50만": mark(result["8월"]["환산50만"]),
-            "8월달성": mark(result["8월"]["월달성"]),
-            "기본합산환산": result["기본합산환산금액"],
-            "월별필수조건": mark(result["월별필수조건"]),
-            "기본금액등급": result["금액기준등급"],
-        })
-
-    summary = pd.DataFrame(rows)
-    return summary
+
+# 수금자별 요약 화면 서식. 엑셀은 `format_summary_for_display` 글자 표를 씁니다.
+SUMMARY_COLUMN_CONFIG = {
+    **month_summary_config("7월"),
+    **month_summary_config("8월"),
+    "기본합산환산": number_column(WON),
+}
+
+BONUS_MATRIX_COLUMN_CONFIG = {"기본합산환산": number_column(WON)}
 
 
 def format_summary_for_display(summary: pd.DataFrame) -> pd.DataFrame:
@@ -928,9 +767,9 @@ def format_summary_for_display(summary: pd.DataFrame) -> pd.DataFrame:
 # ── 선택 수금자 필터 ─────────────────────────────────────────
 def filter_by_collector(df: pd.DataFrame, selected_collector: str) -> pd.DataFrame:
     if selected_collector == "전체":
-        return df.copy()
+        return df.copy(deep=False)
 
-    return df[df["수금자명"].astype(str) == selected_collector].copy()
+    return df[df["수금자명"].astype(str) == selected_collector]
 
 
 def filter_excluded_by_collector(excluded_disp: pd.DataFrame, selected_collector: str) -> pd.DataFrame:
@@ -952,70 +791,40 @@ def filter_excluded_by_collector(excluded_disp: pd.DataFrame, selected_collector
 
 
 # ── 엑셀 출력 ────────────────────────────────────────────────
-def write_table(ws, df_for_sheet: pd.DataFrame, start_row: int = 1, name_suffix: str = "A"):
-    global TABLE_SEQ
-
-    r_idx = start_row
-
-    for r_idx, row in enumerate(dataframe_to_rows(df_for_sheet, index=False, header=True), start_row):
-        for c_idx, value in enumerate(row, 1):
-            cell = ws.cell(row=r_idx, column=c_idx, value=value)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    end_col_letter = ws.cell(row=start_row, column=max(df_for_sheet.shape[1], 1)).column_letter
-    last_row = r_idx if df_for_sheet.shape[0] > 0 else start_row
-
-    TABLE_SEQ += 1
-    display_name = safe_table_name(f"tbl_{ws.title}_{name_suffix}_{TABLE_SEQ}")
-
-    table = Table(displayName=display_name, ref=f"A{start_row}:{end_col_letter}{last_row}")
-    table.tableStyleInfo = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
-    ws.add_table(table)
-
-    # 화면과 동일하게 조정·예외 적용 셀을 강조합니다.
-    if "적용 구분" in df_for_sheet.columns:
-        headers = {cell.value: cell.column for cell in ws[start_row]}
-        target_headers = [
-            "원본 쉐어율", "적용 쉐어율", "전체 보험료 역산", "실적보험료",
-            "조정 차액", "인정 건수", "썸머율", "적용 구분",
-        ]
-        for row_num in range(start_row + 1, last_row + 1):
-            label = str(ws.cell(row=row_num, column=headers["적용 구분"]).value or "")
-            has_share = "쉐어" in label
-            has_dental = "치아보험" in label
-            fill_color = None
-            if has_share and has_dental:
-                fill_color = "EEE3FF"
-            elif has_dental:
-                fill_color = "E3F2FD"
-            elif has_share:
-                fill_color = "FFF4CC"
-            if fill_color:
-                for header in target_headers:
-                    if header in headers:
-                        ws.cell(row=row_num, column=headers[header]).fill = PatternFill("solid", fgColor=fill_color)
-
-    autosize_columns_full(ws, padding=5)
-
-    return last_row
-
-
-def write_title(ws, row, title):
-    cell = ws.cell(row=row, column=1, value=title)
-    cell.font = Font(bold=True, size=13)
-    cell.alignment = Alignment(horizontal="left", vertical="center")
-
-
-def write_final_result_block(ws, row, result):
-    thin_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
+# 화면(style_detail_table)과 같이 쉐어 조정·치아보험 예외가 적용된 계약의 칸을 강조합니다.
+WORKBOOK_STYLES = {
+    "share": {"alignment": CENTER, "fill": PatternFill("solid", fgColor="FFF4CC")},
+    "dental": {"alignment": CENTER, "fill": PatternFill("solid", fgColor="E3F2FD")},
+    "share_dental": {"alignment": CENTER, "fill": PatternFill("solid", fgColor="EEE3FF")},
+}
+
+
+def highlight_styles(styled: pd.DataFrame) -> list | None:
+    """`적용 구분` 문구로 정한 행별 강조 서식 이름. 강조하지 않는 행은 None입니다."""
+    if "적용 구분" not in styled.columns:
+        return None
+
+    label = styled["적용 구분"].fillna("").astype(str)
+    has_share = label.str.contains("쉐어", regex=False).to_numpy(dtype=bool)
+    has_dental = label.str.contains("치아보험", regex=False).to_numpy(dtype=bool)
+
+    out = np.full(len(styled), None, dtype=object)
+    out[has_share] = "share"
+    out[has_dental] = "dental"
+    out[has_share & has_dental] = "share_dental"
+    return out.tolist()
+
+
+def write_frame(sheet, df_for_sheet: pd.DataFrame, name_suffix: str) -> int:
+    return sheet.frame(
+        df_for_sheet,
+        name_suffix=name_suffix,
+        row_styles=highlight_styles(df_for_sheet),
+        styled_columns=HIGHLIGHT_COLUMNS,
     )
 
-    fill = PatternFill("solid", fgColor="F2F2F2")
 
+def final_result_rows(result) -> list[list]:
     rows = [
         ["7월 환산업적", won(result["7월"]["환산금액"])],
         ["7월 한화생명 환산업적 합계 5만원 이상", mark(result["7월"]["한화생명5만"])],
@@ -1042,19 +851,7 @@ def write_final_result_block(ws, row, result):
     else:
         rows.append(["최고 등급 달성", "HWARANG"])
 
-    for i, row_data in enumerate(rows, start=row):
-        for j, value in enumerate(row_data, start=1):
-            cell = ws.cell(row=i, column=j, value=value)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = thin_border
-
-            if j == 1:
-                cell.fill = fill
-                cell.font = Font(bold=True)
-
-    autosize_columns_full(ws, padding=5)
-
-    return row + len(rows)
+    return rows
 
 
 def build_workbook(
@@ -1067,81 +864,92 @@ def build_workbook(
     excluded_disp: pd.DataFrame,
     selected_collector: str = "전체",
     review_disp: pd.DataFrame | None = None,
+    bonus_matrix: pd.DataFrame | None = None,
 ):
-    wb = Workbook()
+    writer = WorkbookWriter(styles=WORKBOOK_STYLES)
 
-    ws_summary = wb.active
-    ws_summary.title = "요약"
-
-    write_title(ws_summary, 1, f"썸머 최종 결과 - {selected_collector}")
-    next_row = write_final_result_block(ws_summary, 2, result)
-
-    write_title(ws_summary, next_row + 2, "수금자별 요약")
-    next_row = write_table(
-        ws_summary,
-        format_summary_for_display(summary),
-        start_row=next_row + 3,
-        name_suffix="SUMMARY",
-    )
+    result_rows = final_result_rows(result)
+    summary_table = format_summary_for_display(summary)
+    detail_table = to_styled(df_all)
 
-    write_title(ws_summary, next_row + 2, "상세 내역")
-    next_row = write_table(
-        ws_summary,
-        to_styled(df_all),
-        start_row=next_row + 3,
-        name_suffix="DETAIL",
+    ws_summary = writer.sheet(
+        "요약",
+        merge_widths(rows_widths(result_rows), table_widths(summary_table), table_widths(detail_table)),
     )
-
-    ws_july = wb.create_sheet("7월")
-    write_title(ws_july, 1, f"7월 썸머 환산 결과 - {selected_collector}")
-    write_table(ws_july, to_styled(july_df), start_row=2, name_suffix="JULY_DETAIL")
-
-    ws_august = wb.create_sheet("8월")
-    write_title(ws_august, 1, f"8월 썸머 환산 결과 - {selected_collector}")
-    write_table(ws_august, to_styled(august_df), start_row=2, name_suffix="AUGUST_DETAIL")
+    ws_summary.text(f"썸머 최종 결과 - {selected_collector}")
+    ws_summary.block(result_rows)
+    ws_summary.blank(2)
+    ws_summary.text("수금자별 요약")
+    write_frame(ws_summary, summary_table, "SUMMARY")
+    ws_summary.blank()
+    ws_summary.text("상세 내역")
+    write_frame(ws_summary, detail_table, "DETAIL")
+
+    sheets = []
+
+    if bonus_matrix is not None and not bonus_matrix.empty:
+        sheets.append((
+            "보너스율별등급",
+            f"레디포썸머 보너스율별 최종 인정 등급 - {selected_collector}",
+            format_bonus_matrix_for_display(bonus_matrix),
+            "BONUS",
+        ))
+
+    sheets.append(("7월", f"7월 썸머 환산 결과 - {selected_collector}", to_styled(july_df), "JULY_DETAIL"))
+    sheets.append(("8월", f"8월 썸머 환산 결과 - {selected_collector}", to_styled(august_df), "AUGUST_DETAIL"))
 
     if not other_month_df.empty:
-        ws_other = wb.create_sheet("7월8월외")
-        write_title(ws_other, 1, f"7월/8월 외 계약 - {selected_collector}")
-        write_table(ws_other, to_styled(other_month_df), start_row=2, name_suffix="OTHER_MONTH")
+        sheets.append(("7월8월외", f"7월/8월 외 계약 - {selected_collector}", to_styled(other_month_df), "OTHER_MONTH"))
 
     if excluded_disp is not None and not excluded_disp.empty:
-        ws_ex = wb.create_sheet("제외계약")
-        write_title(ws_ex, 1, f"제외 계약 - {selected_collector}")
-        write_table(ws_ex, excluded_disp, start_row=2, name_suffix="EXCLUDED")
+        sheets.append(("제외계약", f"제외 계약 - {selected_collector}", excluded_disp, "EXCLUDED"))
 
     if review_disp is not None and not review_disp.empty:
-        ws_review = wb.create_sheet("확인필요계약")
-        write_title(ws_review, 1, f"입력값 확인이 필요한 계약 - {selected_collector}")
-        write_table(ws_review, review_disp, start_row=2, name_suffix="REVIEW")
+        sheets.append(("확인필요계약", f"입력값 확인이 필요한 계약 - {selected_collector}", review_disp, "REVIEW"))
+
+    for sheet_name, title, table, suffix in sheets:
+        ws = writer.sheet(sheet_name, table_widths(table))
+        ws.text(title)
+        write_frame(ws, table, suffix)
 
-    return wb
+    return writer.wb
 
 
-# ── 탭 렌더링 함수 ───────────────────────────────────────────
 def render_result_tabs(summary_df, july_df, august_df, other_month_df):
     tab1, tab2, tab3, tab4 = st.tabs(["🧮 수금자별 요약", "7월 상세", "8월 상세", "7월/8월 외"])
 
     with tab1:
-        st.dataframe(format_summary_for_display(summary_df), use_container_width=True)
+        st.dataframe(summary_df, use_container_width=True, column_config=SUMMARY_COLUMN_CONFIG)
 
     with tab2:
         if july_df.empty:
             st.info("7월 계약이 없습니다.")
         else:
-            st.dataframe(style_detail_table(july_df), use_container_width=True)
+            st.dataframe(
+                style_detail_table(july_df),
+                use_container_width=True,
+                column_config=DETAIL_COLUMN_CONFIG,
+            )
 
     with tab3:
         if august_df.empty:
             st.info("8월 계약이 없습니다.")
         else:
-            st.dataframe(style_detail_table(august_df), use_container_width=True)
+            st.dataframe(
+                style_detail_table(august_df),
+                use_container_width=True,
+                column_config=DETAIL_COLUMN_CONFIG,
+            )
 
     with tab4:
         if other_month_df.empty:
             st.info("7월/8월 외 계약이 없습니다.")
         else:
-            st.dataframe(style_detail_table(other_month_df), use_container_width=True)
+            st.dataframe(
+                style_detail_table(other_month_df),
+                use_container_width=True,
+                column_config=DETAIL_COLUMN_CONFIG,
+            )
 
 
 # ── 메인 실행 ────────────────────────────────────────────────
@@ -1240,7 +1048,7 @@ def run():
     file_bytes = uploaded_file.getvalue()
 
     try:
-        raw = load_df(BytesIO(file_bytes)).copy()
+        raw = load_contracts(file_bytes)
     except Exception as e:
         st.error(f"❌ 엑셀 파일을 읽는 중 오류가 발생했습니다: {e}")
         return
@@ -1255,7 +1063,7 @@ def run():
         return
 
     raw["_원본행번호"] = raw.index + 2
-    candidate_df, excluded_df = exclude_contracts(raw)
+    candidate_df, excluded_df, excluded_reasons = exclude_contracts(raw)
     blocking_issues, condition_issues, _ = find_data_issues(candidate_df)
     initial_review_mask = blocking_issues.ne("") | condition_issues.ne("")
     initial_review = candidate_df[initial_review_mask].copy()
@@ -1282,7 +1090,7 @@ def run():
         with st.expander("📝 확인 필요 계약 수정", expanded=True):
             with st.form("summer_review_editor_form"):
                 edited_review = st.data_editor(
-                    initial_review[editor_columns].reset_index(drop=True),
+                    plain_columns(initial_review[editor_columns]).reset_index(drop=True),
                     use_container_width=True,
                     hide_index=True,
                     disabled=["_원본행번호", "상품명", "확인사항"],
@@ -1299,14 +1107,15 @@ def run():
         for _, edited_row in edited_review.iterrows():
             row_mask = candidate_df["_원본행번호"] == edited_row["_원본행번호"]
             for column in editable_columns:
-                candidate_df.loc[row_mask, column] = edited_row[column]
+                assign_values(candidate_df, row_mask, column, edited_row[column])
 
         if corrections_submitted:
             st.success("입력한 수정값을 다시 검증하여 반영했습니다.")
 
-    candidate_df, newly_excluded_df = exclude_contracts(candidate_df)
+    candidate_df, newly_excluded_df, newly_excluded_reasons = exclude_contracts(candidate_df)
     if not newly_excluded_df.empty:
         excluded_df = pd.concat([excluded_df, newly_excluded_df]).sort_index()
+        excluded_reasons = pd.concat([excluded_reasons, newly_excluded_reasons]).sort_index()
 
     blocking_issues, condition_issues, share_numeric = find_data_issues(candidate_df)
     blocked_df = candidate_df[blocking_issues.ne("")].copy()
@@ -1324,7 +1133,7 @@ def run():
     review_disp_all = build_review_display(review_df)
     df_valid = candidate_df[blocking_issues.eq("")].copy()
     df_valid.loc[:, "쉐어율"] = share_numeric.loc[df_valid.index]
-    excluded_disp = build_excluded_with_reason(excluded_df)
+    excluded_disp = build_excluded_with_reason(excluded_df, excluded_reasons)
 
     upload_key = hashlib.sha256(file_bytes).hexdigest()[:16]
 
@@ -1403,11 +1212,12 @@ def run():
         st.warning("계산에 포함할 수 있는 정상 계약이 없습니다. 확인 필요 계약을 수정해 주세요.")
         return
 
-    df = compute_summer(df_valid)
+    df, total_totals = summer_results_with_overrides(df_valid, f"summer_results_{upload_key}")
 
-    july_df = df[df["계약월"] == 7].copy()
-    august_df = df[df["계약월"] == 8].copy()
-    other_month_df = df[~df["계약월"].isin([7, 8])].copy()
+    july_df, august_df = (
+        df[df["계약월"] == month] for month in SUMMER_CAMPAIGN.months
+    )
+    other_month_df = df[~df["계약월"].isin(SUMMER_CAMPAIGN.months)]
 
     if july_df.empty:
         st.warning("⚠️ 계약일 기준 7월 계약이 없습니다.")
@@ -1427,7 +1237,9 @@ def run():
         august_df,
         ready_bonus_rate=0,
     )
-    total_summary = make_collector_summary(july_df, august_df)
+    # 수금자 × 월 집계는 한 번만 만들고, 수금자·보너스율 선택은 이 표에서 찾아 씁니다.
+    total_summary = SUMMER_CAMPAIGN.summary(total_totals)
+    bonus_matrix = SUMMER_CAMPAIGN.bonus_matrix(total_totals)
 
     # 1. 제외 계약 보기 - 기본 펼침
     if excluded_disp is not None and not excluded_disp.empty:
@@ -1452,6 +1264,29 @@ def run():
         other_month_df=other_month_df,
     )
 
+    with st.expander("🎁 보너스율별 최종 인정 등급"):
+        st.caption("월별 필수조건은 보너스 전 기준, 등급은 보너스 반영 후 금액 기준입니다.")
+        st.dataframe(
+            bonus_matrix,
+            use_container_width=True,
+            hide_index=True,
+            column_config=BONUS_MATRIX_COLUMN_CONFIG,
+        )
+
+    with st.expander("📈 전체 수금자 다음 등급까지 필요한 추가 보험료"):
+        st.caption(
+            "20년납 신규 계약 기준 환산율로 계산했습니다. 한화생명 월 필수조건이 부족하면 "
+            "그 금액은 한화생명 보험료로 먼저 채우고, 추가 보험료가 적은 수금자부터 보여 줍니다. "
+            "월별 필수조건을 못 채운 수금자는 조건만 채우면 인정되는 등급을 목표로 보여 줍니다."
+        )
+        opportunities = SUMMER_CAMPAIGN.next_grade_opportunities(total_totals, SUMMER_RATE_TABLE)
+        st.dataframe(
+            opportunities,
+            use_container_width=True,
+            hide_index=True,
+            column_config=opportunity_column_config(opportunities),
+        )
+
     # 3. 수금자별 결과 확인
     section_intro("상세 결과", "수금자별 결과 확인", "수금자를 선택해 월별 실적과 보너스 적용 결과를 확인해 주세요.")
 
@@ -1477,13 +1312,18 @@ def run():
     selected_august_df = filter_by_collector(august_df, selected_collector)
     selected_other_month_df = filter_by_collector(other_month_df, selected_collector)
 
-    selected_summary = make_collector_summary(selected_july_df, selected_august_df)
-
-    selected_result = check_final_summer_requirements(
-        selected_july_df,
-        selected_august_df,
-        ready_bonus_rate=ready_bonus_rate,
-    )
+    if selected_collector == "전체":
+        selected_totals = total_totals
+        selected_result = SUMMER_CAMPAIGN.apply_bonus(total_result, ready_bonus_rate)
+    else:
+        selected_totals = total_totals[
+            total_totals["수금자명"].astype(str) == selected_collector
+        ].reset_index(drop=True)
+        selected_result = SUMMER_CAMPAIGN.result(selected_totals, ready_bonus_rate)
+    selected_summary = SUMMER_CAMPAIGN.summary(selected_totals)
+    selected_bonus_matrix = bonus_matrix[
+        bonus_matrix["수금자명"].astype(str).isin(selected_totals["수금자명"].astype(str))
+    ].reset_index(drop=True)
 
     selected_excluded_disp = filter_excluded_by_collector(excluded_disp, selected_collector)
     selected_review_disp = filter_excluded_by_collector(review_disp_all, selected_collector)
@@ -1609,25 +1449,36 @@ def run():
     file_collector_name = safe_filename_part(selected_collector)
     download_filename = f"{base_filename}_썸머환산결과_{file_collector_name}.xlsx"
 
-    wb = build_workbook(
-        df_all=selected_df,
-        july_df=selected_july_df,
-        august_df=selected_august_df,
-        other_month_df=selected_other_month_df,
-        summary=selected_summary,
-        result=selected_result,
-        excluded_disp=selected_excluded_disp,
-        review_disp=selected_review_disp,
-        selected_collector=selected_collector,
+    # 엑셀은 다운로드 버튼을 누를 때만 만들고, 같은 데이터·수금자·보너스율이면 다시 씁니다.
+    excel_data = deferred_workbook(
+        lambda: build_workbook(
+            df_all=selected_df,
+            july_df=selected_july_df,
+            august_df=selected_august_df,
+            other_month_df=selected_other_month_df,
+            summary=selected_summary,
+            result=selected_result,
+            excluded_disp=selected_excluded_disp,
+            review_disp=selected_review_disp,
+            selected_collector=selected_collector,
+            bonus_matrix=selected_bonus_matrix,
+        ),
+        "summer",
+        frame_digest(selected_df, selected_excluded_disp, selected_review_disp),
+        selected_collector,
+        ready_bonus_rate,
     )
 
-    excel_output = BytesIO()
-    wb.save(excel_output)
-    excel_output.seek(0)
-
     st.download_button(
         label=f"📥 {selected_collector} 썸머 환산 결과 엑셀 다운로드",
-        data=excel_output,
+        data=excel_data,
         file_name=download_filename,
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore",
+        mime=XLSX_MIME,
     )
+
+    render_memory_report({
+        "업로드 계약": raw,
+        "계산 결과": df,
+        "제외 계약": excluded_disp,
+    })
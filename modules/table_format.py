@@ -0,0 +1,45 @@
+"""썸머·컨벤션·매니저 업적 화면 표의 숫자 서식.
+
+화면 표는 금액·비율·기간·건수 열을 숫자 그대로 `st.dataframe`에 넘기고, "원"·"%"·"년"·"건"
+표시는 `st.column_config`로 브라우저에서 붙입니다. 다시 그릴 때마다 행별로 글자를 만들지 않고,
+보내는 데이터도 숫자 열이라 작습니다. 정렬도 글자 순서가 아니라 값 순서로 됩니다.
+
+행별 글자 서식(`won`, `pct` 등)은 엑셀 다운로드를 만들 때만 씁니다.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import streamlit as st
+
+# printf 형식(sprintf-js). `,`는 천 단위 구분, `%%`는 % 글자입니다.
+WON = "%,.0f 원"
+SIGNED_WON = "%+,.0f 원"
+PERCENT = "%.0f %%"
+YEARS = "%d년"
+COUNT = "%g건"
+PLAIN_COUNT = "%g"
+DATE = "YYYY-MM-DD"
+
+
+def number_column(fmt: str, label: str | None = None, help: str | None = None):
+    return st.column_config.NumberColumn(label, format=fmt, help=help)
+
+
+def date_column(label: str | None = None):
+    return st.column_config.DateColumn(label, format=DATE)
+
+
+def number_columns(columns: Iterable[str], fmt: str) -> dict:
+    """같은 서식을 쓰는 여러 열의 column_config."""
+    return {column: number_column(fmt) for column in columns}
+
+
+def opportunity_column_config(table) -> dict:
+    """썸머·컨벤션 '다음 단계까지 필요한 추가 보험료' 표의 금액 열 서식."""
+    money = [
+        column for column in table.columns
+        if column in ("현재환산", "다음등급기준", "부족환산") or column.endswith("보험료")
+    ]
+    return number_columns(money, WON)
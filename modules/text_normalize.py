@@ -0,0 +1,116 @@
+"""업무 프로그램이 함께 쓰는 문자열 정규화 함수와 캐시.
+
+상품명·열 제목·담보명처럼 같은 문자열이 한 번의 업로드에서 수천 번 반복되므로
+정규식은 미리 컴파일하고, 정규화 종류별로 크기가 제한된 LRU 캐시에 결과를 보관합니다.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache, wraps
+from typing import Any, Callable
+
+DEFAULT_CACHE_SIZE = 65_536
+
+_COMMISSION_STRIP = re.compile(r"[\s\n\r\t:()\[\]·ㆍ_-]+")
+_CLAIM_STRIP = re.compile(r"[\s()\[\]{},._/\\:]+")
+_WHITESPACE = re.compile(r"\s+")
+
+_REGISTRY: dict[str, Callable[[str], Any]] = {}
+
+
+def _as_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def memoized_text(name: str, maxsize: int = DEFAULT_CACHE_SIZE):
+    """문자열 하나를 받아 변하지 않는 값을 돌려주는 함수를 종류별 LRU 캐시로 감쌉니다.
+
+    입력은 None이면 빈 문자열, 그 외에는 str()로 바꾼 뒤 캐시 키로 사용합니다.
+    감싼 원래 함수는 `uncached`로 그대로 호출할 수 있습니다.
+    """
+
+    def decorator(func: Callable[[str], Any]) -> Callable[[Any], Any]:
+        cached = lru_cache(maxsize=maxsize)(func)
+        _REGISTRY[name] = cached
+
+        @wraps(func)
+        def wrapper(value: Any) -> Any:
+            return cached(_as_text(value))
+
+        def uncached(value: Any) -> Any:
+            return func(_as_text(value))
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        wrapper.uncached = uncached
+        return wrapper
+
+    return decorator
+
+
+@memoized_text("commission")
+def normalize_commission_text(text: str) -> str:
+    """수수료표 열 제목·조건 비교용: 공백과 괄호·구분기호를 없애고 소문자로 바꿉니다."""
+    return _COMMISSION_STRIP.sub("", text.replace("計", "계")).lower()
+
+
+@memoized_text("spaces")
+def collapse_spaces(text: str) -> str:
+    """연속 공백을 한 칸으로 줄이고 앞뒤 공백을 제거합니다."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@memoized_text("claim")
+def _claim_text(text: str) -> str:
+    text = text.lower().replace("ㆍ", "").replace("·", "").replace("–", "-")
+    return _CLAIM_STRIP.sub("", text)
+
+
+def normalize_claim_text(value: Any) -> str:
+    """보험금 청구 담보명 비교용: 소문자로 바꾸고 공백·괄호·구두점을 제거합니다."""
+    return _claim_text(value or "")
+
+
+@memoized_text("label")
+def _label_text(text: str) -> str:
+    return _WHITESPACE.sub("", text)
+
+
+def normalize_label(value: Any) -> str:
+    """보장분석 항목명 비교용: 모든 공백을 제거합니다."""
+    return _label_text(value or "")
+
+
+@memoized_text("search")
+def _search_text(text: str) -> str:
+    return "".join(text.lower().split())
+
+
+def normalize_search_text(value: Any) -> str:
+    """보험사 검색용: 소문자로 바꾸고 공백을 모두 제거합니다."""
+    return _search_text(str(value))
+
+
+def cache_stats() -> list[dict[str, Any]]:
+    """정규화 종류별 캐시 적중 현황을 반환합니다."""
+    rows = []
+    for name, cached in _REGISTRY.items():
+        info = cached.cache_info()
+        calls = info.hits + info.misses
+        rows.append({
+            "name": name,
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hit_rate": info.hits / calls if calls else 0.0,
+        })
+    return rows
+
+
+def clear_caches() -> None:
+    for cached in _REGISTRY.values():
+        cached.cache_clear()
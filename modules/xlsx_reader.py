@@ -0,0 +1,556 @@
+"""openpyxl 객체 모델을 거치지 않고 xlsx 시트 XML에서 값만 빠르게 읽습니다.
+
+서식이 XFD열·1,048,576행까지 늘어난 내보내기 파일도 값이 있는 셀만 따라가므로
+셀 객체를 만들지 않고 실제 데이터 범위에서 멈춥니다. 공유 문자열은 필요한
+순번까지만 읽고, 날짜 서식은 styles.xml의 표시 형식으로 판단합니다.
+
+읽을 수 없는 형식이면 `XlsxReadError`를 내므로 호출하는 쪽에서 openpyxl로
+다시 읽으면 됩니다.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Iterable, Iterator, NamedTuple
+from xml.etree import ElementTree as ET
+from xml.parsers.expat import ExpatError, ParserCreate
+
+import pandas as pd
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+from pandas.io.parsers import TextParser
+
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_STRICT_REL_NS = "http://purl.oclc.org/ooxml/officeDocument/relationships"
+
+
+class XlsxReadError(ValueError):
+    """빠른 경로로 읽을 수 없는 파일입니다. openpyxl로 다시 읽어야 합니다."""
+
+
+class ReadCell(NamedTuple):
+    row: int
+    column: int
+    value: Any
+
+
+class SheetGrid:
+    """openpyxl 워크시트처럼 `cell(row, col).value`로 읽을 수 있는 값 전용 표."""
+
+    def __init__(self, title: str, rows: list[tuple]):
+        self.title = title
+        self.rows = rows
+        self.max_row = max(len(rows), 1)
+        self.max_column = max((len(row) for row in rows), default=1) or 1
+
+    def value(self, row: int, column: int) -> Any:
+        if row < 1 or row > len(self.rows) or column < 1:
+            return None
+        values = self.rows[row - 1]
+        return values[column - 1] if column <= len(values) else None
+
+    def cell(self, row: int, column: int) -> ReadCell:
+        return ReadCell(row, column, self.value(row, column))
+
+    def iter_rows(
+        self,
+        min_row: int = 1,
+        max_row: int | None = None,
+        min_col: int = 1,
+        max_col: int | None = None,
+        values_only: bool = False,
+    ) -> Iterator[tuple]:
+        max_row = self.max_row if max_row is None else max_row
+        max_col = self.max_column if max_col is None else max_col
+        for row in range(min_row, max_row + 1):
+            if values_only:
+                yield tuple(self.value(row, col) for col in range(min_col, max_col + 1))
+            else:
+                yield tuple(self.cell(row, col) for col in range(min_col, max_col + 1))
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _column_index(reference: str) -> int:
+    column = 0
+    for char in reference:
+        if "A" <= char <= "Z":
+            column = column * 26 + ord(char) - 64
+        else:
+            break
+    return column
+
+
+def _text_of(element: ET.Element) -> str:
+    """공유 문자열·인라인 문자열의 글자만 이어 붙입니다. 후리가나(rPh)는 제외합니다."""
+    parts: list[str] = []
+    for child in element:
+        name = _local(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            for run_child in child:
+                if _local(run_child.tag) == "t":
+                    parts.append(run_child.text or "")
+    return "".join(parts)
+
+
+class _SharedStrings:
+    """요청된 순번까지만 sharedStrings.xml을 읽어 둡니다."""
+
+    def __init__(self, archive: zipfile.ZipFile, path: str | None):
+        self._items: list[str] = []
+        self._events = None
+        self._root = None
+        if path and path in archive.namelist():
+            self._events = ET.iterparse(archive.open(path), events=("start", "end"))
+
+    def __getitem__(self, index: int) -> str:
+        while index >= len(self._items) and self._events is not None:
+            try:
+                event, element = next(self._events)
+            except StopIteration:
+                self._events = None
+                break
+            if event == "start":
+                if self._root is None:
+                    self._root = element
+                continue
+            if _local(element.tag) == "si":
+                self._items.append(_text_of(element))
+                self._root.clear()
+        if index >= len(self._items):
+            raise XlsxReadError(f"공유 문자열 {index}번을 찾을 수 없습니다.")
+        return self._items[index]
+
+
+class _Styles:
+    """셀 서식 번호별로 날짜·기간 표시 형식인지 판단합니다."""
+
+    def __init__(self, archive: zipfile.ZipFile, path: str | None):
+        self._archive = archive
+        self._path = path
+        self._kinds: list[str] | None = None
+
+    def _load(self) -> list[str]:
+        kinds: list[str] = []
+        if not self._path or self._path not in self._archive.namelist():
+            return kinds
+        root = ET.fromstring(self._archive.read(self._path))
+        custom: dict[int, str] = {}
+        for element in root.iter():
+            name = _local(element.tag)
+            if name == "numFmt":
+                custom[int(element.get("numFmtId", "0"))] = element.get("formatCode", "")
+            elif name == "cellXfs":
+                for xf in element:
+                    format_id = int(xf.get("numFmtId", "0"))
+                    code = custom.get(format_id) or BUILTIN_FORMATS.get(format_id, "General")
+                    if is_timedelta_format(code):
+                        kinds.append("timedelta")
+                    elif is_date_format(code):
+                        kinds.append("date")
+                    else:
+                        kinds.append("")
+        return kinds
+
+    def kind(self, style_index: int) -> str:
+        if self._kinds is None:
+            self._kinds = self._load()
+        return self._kinds[style_index] if style_index < len(self._kinds) else ""
+
+
+def _as_archive_source(source: Any) -> Any:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BytesIO(bytes(source))
+    if hasattr(source, "getvalue"):
+        return BytesIO(source.getvalue())
+    return source
+
+
+class XlsxReader:
+    """xlsx 파일 하나를 열어 시트별 값을 순서대로 읽습니다."""
+
+    def __init__(self, source: Any):
+        try:
+            self._archive = zipfile.ZipFile(_as_archive_source(source))
+            self._sheets, self._epoch, shared_path, styles_path = self._read_workbook()
+        except XlsxReadError:
+            raise
+        except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError, ValueError) as exc:
+            raise XlsxReadError(f"xlsx 구조를 읽지 못했습니다: {exc}") from exc
+        self._shared = _SharedStrings(self._archive, shared_path)
+        self._styles = _Styles(self._archive, styles_path)
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._archive.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return [name for name, _ in self._sheets]
+
+    def _read_workbook(self) -> tuple[list[tuple[str, str]], datetime, str | None, str | None]:
+        workbook_path = "xl/workbook.xml"
+        for element in ET.fromstring(self._archive.read("_rels/.rels")):
+            if element.get("Type", "").endswith("/officeDocument"):
+                workbook_path = element.get("Target", workbook_path).lstrip("/")
+        base = posixpath.dirname(workbook_path)
+        rels_path = posixpath.join(base, "_rels", posixpath.basename(workbook_path) + ".rels")
+
+        targets: dict[str, str] = {}
+        shared_path = styles_path = None
+        for element in ET.fromstring(self._archive.read(rels_path)):
+            target = element.get("Target", "")
+            target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(base, target))
+            targets[element.get("Id", "")] = target
+            kind = element.get("Type", "")
+            if kind.endswith("/sharedStrings"):
+                shared_path = target
+            elif kind.endswith("/styles"):
+                styles_path = target
+
+        sheets: list[tuple[str, str]] = []
+        epoch = CALENDAR_WINDOWS_1900
+        for element in ET.fromstring(self._archive.read(workbook_path)).iter():
+            name = _local(element.tag)
+            if name == "workbookPr" and element.get("date1904") in ("1", "true"):
+                epoch = CALENDAR_MAC_1904
+            elif name == "sheet":
+                rel_id = element.get(f"{{{_REL_NS}}}id") or element.get(f"{{{_STRICT_REL_NS}}}id")
+                if rel_id not in targets:
+                    raise XlsxReadError(f"시트 경로를 찾을 수 없습니다: {element.get('name')}")
+                sheets.append((element.get("name", ""), targets[rel_id]))
+        return sheets, epoch, shared_path, styles_path
+
+    def _sheet_path(self, sheet: str | int) -> tuple[str, str]:
+        if isinstance(sheet, int):
+            if not 0 <= sheet < len(self._sheets):
+                raise XlsxReadError(f"{sheet}번째 시트가 없습니다.")
+            return self._sheets[sheet]
+        for name, path in self._sheets:
+            if name == sheet:
+                return name, path
+        raise XlsxReadError(f"시트를 찾을 수 없습니다: {sheet}")
+
+    def iter_rows(
+        self,
+        sheet: str | int = 0,
+        formulas: bool = False,
+        keep_errors: bool = True,
+        columns: Iterable[int] | None = None,
+    ) -> Iterator[tuple]:
+        """시트의 행을 값 튜플로 돌려줍니다.
+
+        튜플의 위치는 열 번호(1열 → 0번)와 같고, 중간의 빈 행은 빈 튜플로 채워
+        순번이 행 번호와 일치합니다. 마지막 값 이후의 빈 행·빈 열은 돌려주지 않습니다.
+        `formulas=True`이면 수식 셀은 저장된 결과 대신 `=수식` 문자열을 돌려주고,
+        `keep_errors=False`이면 #N/A 같은 오류값을 빈 셀로 봅니다.
+        `columns`(1부터 시작하는 열 번호)를 주면 나머지 열의 셀은 값으로 바꾸지 않고 빈 셀로 둡니다.
+        """
+        _, path = self._sheet_path(sheet)
+        parser = _SheetParser(self._shared, self._styles, self._epoch, formulas, keep_errors, columns)
+        emitted = 0
+        try:
+            with self._archive.open(path) as stream:
+                for row_number, values in parser.rows(stream):
+                    while emitted < row_number - 1:
+                        yield ()
+                        emitted += 1
+                    yield values
+                    emitted = row_number
+        except XlsxReadError:
+            raise
+        except (KeyError, ExpatError, ValueError, OverflowError) as exc:
+            raise XlsxReadError(f"시트 값을 읽지 못했습니다: {exc}") from exc
+
+    def read_sheet(self, sheet: str | int = 0, formulas: bool = False) -> SheetGrid:
+        title, _ = self._sheet_path(sheet)
+        return SheetGrid(title, list(self.iter_rows(sheet, formulas=formulas)))
+
+
+class _SheetParser:
+    """시트 XML을 expat 콜백으로 훑으며 값이 있는 셀만 모읍니다.
+
+    요소 트리를 만들지 않으므로 서식만 있는 셀이 아무리 많아도 메모리를 쓰지 않고,
+    sheetData가 끝나면 나머지 XML은 읽지 않습니다.
+    """
+
+    _CHUNK_SIZE = 1 << 16
+
+    def __init__(
+        self,
+        shared: _SharedStrings,
+        styles: _Styles,
+        epoch: datetime,
+        formulas: bool,
+        keep_errors: bool,
+        columns: Iterable[int] | None = None,
+    ):
+        self._shared = shared
+        self._styles = styles
+        self._epoch = epoch
+        self._formulas = formulas
+        self._keep_errors = keep_errors
+        # 공유 수식은 원본 셀을 읽어야 뒤 셀을 풀 수 있으므로 수식 모드에서는 열을 거르지 않습니다.
+        self._columns = None if columns is None or formulas else frozenset(columns)
+        self._skipped_value = False
+        self._style_kinds: dict[str, str] = {}
+        self._shared_formulas: dict[str, tuple[str, str]] = {}
+        self._names: dict[str, str] = {}
+        self._pending: list[tuple[int, tuple]] = []
+        self._done = False
+        self._text: list[str] | None = None
+        self._in_inline = False
+        self._in_phonetic = False
+        self._row_number = 0
+        self._next_col = 1
+        self._values: list[Any] = []
+        self._cell: dict[str, str] = {}
+        self._raw: str | None = None
+        self._formula: str | None = None
+        self._formula_attrs: dict[str, str] = {}
+        self._inline: list[str] = []
+
+    def rows(self, stream) -> Iterator[tuple[int, tuple]]:
+        parser = ParserCreate(namespace_separator="}")
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._characters
+        while not self._done:
+            chunk = stream.read(self._CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            yield from self._pending
+            self._pending.clear()
+            if not chunk:
+                break
+
+    def _local(self, name: str) -> str:
+        local = self._names.get(name)
+        if local is None:
+            local = self._names[name] = name.rpartition("}")[2]
+        return local
+
+    def _start(self, name: str, attrs: dict[str, str]) -> None:
+        if self._done:
+            return
+        local = self._local(name)
+        if local == "c":
+            self._cell = attrs
+            self._raw = None
+            self._formula = None
+            self._inline = []
+        elif local == "v":
+            self._text = []
+        elif local == "row":
+            self._row_number = int(attrs.get("r") or self._row_number + 1)
+            self._next_col = 1
+            self._values = []
+            self._skipped_value = False
+        elif local == "f":
+            self._formula_attrs = attrs
+            self._text = []
+        elif local == "is":
+            self._in_inline = True
+        elif local == "rPh":
+            self._in_phonetic = True
+        elif local == "t" and self._in_inline and not self._in_phonetic:
+            self._text = []
+
+    def _characters(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+    def _end(self, name: str) -> None:
+        if self._done:
+            return
+        local = self._local(name)
+        if local == "v":
+            # 결과가 저장되지 않은 수식 셀은 <v></v>로 남아 빈 셀로 봅니다.
+            self._raw = "".join(self._text or ()) or None
+            self._text = None
+        elif local == "c":
+            self._finish_cell()
+        elif local == "row":
+            # 거른 열에만 값이 있는 행도 빈 튜플로 남겨 전체를 읽을 때와 행 수를 맞춥니다.
+            if self._values or self._skipped_value:
+                self._pending.append((self._row_number, tuple(self._values)))
+        elif local == "f":
+            self._formula = "".join(self._text or ())
+            self._text = None
+        elif local == "t":
+            if self._text is not None and self._in_inline:
+                self._inline.append("".join(self._text))
+                self._text = None
+        elif local == "is":
+            self._in_inline = False
+        elif local == "rPh":
+            self._in_phonetic = False
+        elif local == "sheetData":
+            # 병합·조건부 서식 등 나머지 XML은 값 읽기에 필요 없습니다.
+            self._done = True
+
+    def _finish_cell(self) -> None:
+        reference = self._cell.get("r") or ""
+        column = _column_index(reference) or self._next_col
+        self._next_col = column + 1
+        if self._columns is not None and column not in self._columns:
+            if self._raw is not None or self._inline:
+                self._skipped_value = True
+            return
+        value = self._cell_value(reference, column)
+        if value is None or value == "":
+            return
+        values = self._values
+        if column > len(values):
+            values.extend([None] * (column - len(values)))
+        values[column - 1] = value
+
+    def _cell_value(self, reference: str, column: int) -> Any:
+        kind = self._cell.get("t", "n")
+        if self._formulas and self._formula is not None:
+            text = self._formula
+            group = self._formula_attrs.get("si")
+            if self._formula_attrs.get("t") == "shared" and group is not None:
+                reference = reference or f"{_column_letter(column)}{self._row_number}"
+                if text:
+                    self._shared_formulas[group] = (reference, text)
+                elif group in self._shared_formulas:
+                    origin, origin_text = self._shared_formulas[group]
+                    return Translator(f"={origin_text}", origin=origin).translate_formula(reference)
+            if text:
+                return f"={text}"
+
+        if kind == "inlineStr":
+            return "".join(self._inline)
+        raw = self._raw
+        if raw is None:
+            return None
+        if kind == "s":
+            return self._shared[int(raw)]
+        if kind == "n":
+            return self._number(raw, self._cell.get("s"))
+        if kind == "str":
+            return raw
+        if kind == "e":
+            return raw if self._keep_errors else None
+        if kind == "b":
+            return raw == "1"
+        if kind == "d":
+            return datetime.fromisoformat(raw.rstrip("Z"))
+        return raw
+
+    def _number(self, text: str, style: str | None) -> Any:
+        number: Any = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+        if not style:
+            return number
+        kind = self._style_kinds.get(style)
+        if kind is None:
+            kind = self._style_kinds[style] = self._styles.kind(int(style))
+        if kind == "date":
+            return from_excel(number, self._epoch)
+        if kind == "timedelta":
+            return from_excel(number, self._epoch, timedelta=True)
+        return number
+
+
+def _column_letter(column: int) -> str:
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def read_workbook(
+    source: Any,
+    sheets: Iterable[str] | None = None,
+    formulas: bool = False,
+) -> dict[str, SheetGrid]:
+    """시트 이름별 값 표를 반환합니다. `sheets`를 주면 있는 시트만 읽습니다."""
+    with XlsxReader(source) as reader:
+        names = reader.sheet_names
+        if sheets is not None:
+            wanted = set(sheets)
+            names = [name for name in names if name in wanted]
+        return {name: reader.read_sheet(name, formulas=formulas) for name in names}
+
+
+def read_rows(
+    source: Any,
+    sheet: str | int = 0,
+    keep_errors: bool = True,
+    columns: Iterable[int] | None = None,
+) -> list[tuple]:
+    """첫 시트(또는 지정 시트)의 값을 행 튜플 목록으로 반환합니다."""
+    with XlsxReader(source) as reader:
+        return list(reader.iter_rows(sheet, keep_errors=keep_errors, columns=columns))
+
+
+def read_header(source: Any, sheet: str | int = 0) -> tuple:
+    """첫 행(열 제목) 값만 읽습니다. 시트 XML은 첫 행을 넘어서 읽지 않습니다."""
+    with XlsxReader(source) as reader:
+        rows = reader.iter_rows(sheet, keep_errors=False)
+        try:
+            return next(rows, ())
+        finally:
+            rows.close()
+
+
+def _frame_value(value: Any) -> Any:
+    # pandas의 openpyxl 읽기와 같이 빈 셀은 "", 정수로 떨어지는 실수는 int로 넘깁니다.
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _usecols_positions(header: tuple, usecols: list[str]) -> list[int]:
+    """`usecols` 열 제목의 0부터 시작하는 위치(시트 순서). 없는 제목은 pandas와 같이 ValueError입니다."""
+    names = ["" if value is None else str(value) for value in header]
+    wanted = [str(name) for name in usecols]
+    missing = [name for name in wanted if name not in names]
+    if missing:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+    return sorted({names.index(name) for name in wanted})
+
+
+def read_frame(source: Any, sheet: str | int = 0, usecols: list[str] | None = None) -> pd.DataFrame:
+    """`pd.read_excel(source, usecols=...)`과 같은 DataFrame을 빠른 경로로 만듭니다.
+
+    셀 값만 이 모듈에서 읽고, 열 제목 처리와 형식 추론은 pandas가 엑셀을 읽을 때
+    쓰는 TextParser에 그대로 맡깁니다.
+    """
+    # 엑셀 오류값(#N/A 등)은 pandas와 같이 빈 값으로 봅니다.
+    if usecols is None:
+        rows = read_rows(source, sheet, keep_errors=False)
+        if not rows:
+            return pd.DataFrame()
+        width = max(len(row) for row in rows)
+        data = [[_frame_value(value) for value in row] + [""] * (width - len(row)) for row in rows]
+    else:
+        # 열 제목으로 위치를 먼저 찾고, 그 열의 셀만 값으로 바꿔 읽습니다.
+        positions = _usecols_positions(read_header(source, sheet), usecols)
+        rows = read_rows(source, sheet, keep_errors=False, columns=[p + 1 for p in positions])
+        data = [
+            [_frame_value(row[p] if p < len(row) else None) for p in positions]
+            for row in rows
+        ]
+    parser = TextParser(data, header=0)
+    try:
+        return parser.read()
+    finally:
+        parser.close()